@@ -0,0 +1,85 @@
+'''
+Calibration benchmark: calibrates the assumptions of a synthetic universe
+(copies of historical_data.csv with scaled and perturbed figures) with every
+method in one calibrate() call, against calling calibrate() company by company
+on a sample. The sample is checked against the one-call results; exits with
+status 1 on a mismatch.
+
+Run from the repository root:  python benchmarks/bench_calibration.py
+'''
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_portfolio import best_of, universe  # noqa: E402
+from financial_model.calibration import METHODS, calibrate  # noqa: E402
+from financial_model.portfolio import COMPANY_COLUMN  # noqa: E402
+
+COMPANIES = (1_000, 10_000, 100_000)
+# The company-by-company loop is only timed on this many companies
+LOOP_SAMPLE = 200
+RELATIVE_TOLERANCE = 1e-9
+
+
+def perturbed(history, rng):
+    # Independent noise per row and column, so every company has its own ratios
+    numeric = history.columns.drop([COMPANY_COLUMN, "Year"])
+    noise = rng.normal(1.0, 0.05, (len(history), len(numeric)))
+    history[numeric] = history[numeric].to_numpy() * noise
+    return history
+
+
+def main():
+    os.chdir(ROOT)
+    historical_data = pd.read_csv("historical_data.csv")
+    rng = np.random.default_rng(0)
+
+    ok = True
+    for n_companies in COMPANIES:
+        history, _ = universe(historical_data, n_companies, rng)
+        history = perturbed(history, rng)
+        sample = history[COMPANY_COLUMN].unique()[:LOOP_SAMPLE]
+        groups = {
+            company: rows.drop(columns=COMPANY_COLUMN)
+            for company, rows in history[history[COMPANY_COLUMN].isin(sample)].groupby(
+                COMPANY_COLUMN
+            )
+        }
+        for method in METHODS:
+            one_call = best_of(lambda: calibrate(history, method=method), repeat=1)
+            start = time.perf_counter()
+            singles = {
+                company: calibrate(rows, method=method) for company, rows in groups.items()
+            }
+            loop = (time.perf_counter() - start) / len(groups) * n_companies
+            print(
+                f"{n_companies:>7,} companies, {method:>5}: calibrate() {one_call:8.3f} s, "
+                f"per company {loop:8.2f} s (est.)"
+            )
+
+            calibration = calibrate(history, method=method)
+            for company, single in singles.items():
+                row = calibration.companies.get_loc(company)
+                for name in ("estimate", "lower", "upper"):
+                    if not np.allclose(
+                        getattr(calibration, name)[row],
+                        getattr(single, name)[0],
+                        rtol=RELATIVE_TOLERANCE,
+                        equal_nan=True,
+                    ):
+                        print(f"{method} {name} of {company} differs from its own call")
+                        ok = False
+                        break
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+'''
+Export benchmark: projects a synthetic universe in batches of companies and
+writes the three statements with export_parquet() / export_excel(), streaming
+batch by batch, against concatenating every batch's to_long_frame() and
+writing the DataFrames with pandas. Each run is in a fresh process so its peak
+resident memory is its own; the times leave out projecting the batches. The
+Parquet output is read back and checked against to_long_frame(); exits with
+status 1 on a mismatch.
+
+Needs pyarrow and openpyxl (pip install "financial-model[export]").
+Run from the repository root:  python benchmarks/bench_export.py
+'''
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_portfolio import universe  # noqa: E402
+from financial_model.export import (  # noqa: E402
+    SHEET_NAMES,
+    STATEMENTS,
+    _peak_memory,
+    export_excel,
+    export_parquet,
+)
+from financial_model.portfolio import COMPANY_COLUMN, project_portfolio  # noqa: E402
+
+# (format, companies); Excel is written cell by cell, so its universe is smaller
+RUNS = (("parquet", 100_000), ("excel", 5_000))
+BATCH_SIZE = 10_000
+
+
+def projections(n_companies, timing=None):
+    # PortfolioProjections of BATCH_SIZE companies, each built only when it
+    # is asked for; the time spent is added to timing["projecting"]
+    with open(os.path.join(ROOT, "Asumptions.json")) as file:
+        base_assumptions = json.load(file)
+    historical_data = pd.read_csv(os.path.join(ROOT, "historical_data.csv"))
+    for start in range(0, n_companies, BATCH_SIZE):
+        started = time.perf_counter()
+        history, assumptions = universe(
+            historical_data,
+            min(BATCH_SIZE, n_companies - start),
+            np.random.default_rng(start),
+        )
+        # Company names unique across batches
+        prefix = f"B{start // BATCH_SIZE:04d}"
+        history[COMPANY_COLUMN] = prefix + history[COMPANY_COLUMN]
+        assumptions[COMPANY_COLUMN] = prefix + assumptions[COMPANY_COLUMN]
+        projection = project_portfolio(history, assumptions, base_assumptions)
+        if timing is not None:
+            timing["projecting"] += time.perf_counter() - started
+        yield projection
+
+
+def run(kind, n_companies, streaming, path):
+    # Rows written, seconds spent exporting (projecting excluded) and the
+    # peak resident memory
+    timing = {"projecting": 0.0}
+    batches = projections(n_companies, timing)
+    started = time.perf_counter()
+    if streaming and kind == "parquet":
+        rows = export_parquet(batches, path).rows
+    elif streaming:
+        rows = export_excel(batches, path).rows
+    else:
+        frames = {statement: [] for statement in STATEMENTS}
+        for projection in batches:
+            for statement in STATEMENTS:
+                frames[statement].append(projection.to_long_frame(statement))
+        frames = {
+            statement: pd.concat(parts, ignore_index=True)
+            for statement, parts in frames.items()
+        }
+        rows = sum(len(frame) for frame in frames.values())
+        if kind == "parquet":
+            for statement, frame in frames.items():
+                os.makedirs(os.path.join(path, statement))
+                frame.to_parquet(os.path.join(path, statement, "part-00000.parquet"))
+        else:
+            with pd.ExcelWriter(path, engine="openpyxl") as writer:
+                for statement, frame in frames.items():
+                    frame.to_excel(writer, sheet_name=SHEET_NAMES[statement], index=False)
+    seconds = time.perf_counter() - started - timing["projecting"]
+    return rows, seconds, _peak_memory()
+
+
+def disk_size(path):
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(folder, name))
+        for folder, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def matches(path, n_companies):
+    for statement in STATEMENTS:
+        written = pd.read_parquet(os.path.join(path, statement))
+        expected = pd.concat(
+            [projection.to_long_frame(statement) for projection in projections(n_companies)],
+            ignore_index=True,
+        )
+        if not (
+            (written[COMPANY_COLUMN].to_numpy() == expected[COMPANY_COLUMN].to_numpy()).all()
+            and np.array_equal(
+                written.iloc[:, 1:].to_numpy(np.float64),
+                expected.iloc[:, 1:].to_numpy(np.float64),
+            )
+        ):
+            print(f"Parquet {statement} differs from to_long_frame()")
+            return False
+    return True
+
+
+def main():
+    try:
+        import openpyxl  # noqa: F401
+        import pyarrow  # noqa: F401
+    except ImportError as error:
+        print(f"Skipped: {error.name} is not installed")
+        return 0
+    ok = True
+    directory = tempfile.mkdtemp(prefix="bench_export_")
+    try:
+        for kind, n_companies in RUNS:
+            for streaming in (True, False):
+                path = os.path.join(
+                    directory,
+                    f"{kind}-{'streaming' if streaming else 'pandas'}"
+                    + (".xlsx" if kind == "excel" else ""),
+                )
+                # A fresh process per run, so the peak memory is the run's own
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    rows, seconds, peak = executor.submit(
+                        run, kind, n_companies, streaming, path
+                    ).result()
+                size = disk_size(path)
+                print(
+                    f"{kind:>7} {'streaming' if streaming else 'pandas':>9}, "
+                    f"{n_companies:>7,} companies: {rows / seconds:>10,.0f} rows/s, "
+                    f"{size / 2**20 / seconds:7.1f} MB/s, {seconds:6.2f} s, "
+                    f"peak RSS {peak / 2**20:6.0f} MB"
+                )
+            if kind == "parquet":
+                ok &= matches(os.path.join(directory, "parquet-streaming"), n_companies)
+    finally:
+        shutil.rmtree(directory)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
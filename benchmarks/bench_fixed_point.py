@@ -0,0 +1,343 @@
+'''
+Fixed-point benchmark: projects random assumption sets with
+project_scenarios(numeric="float") and numeric="fixed" and, for a sample of
+them, with a decimal.Decimal reference that follows the fixed-point rules one
+scenario at a time. Reports scenarios per second of the three, the largest
+difference between the fixed-point and float statements, and the largest
+residue of every integrity check. Exits with status 1 when a fixed-point
+scenario differs from the Decimal reference by a cent, or when a check that
+float64 passes within its tolerance is not exact in fixed point.
+
+Run from the repository root:  python benchmarks/bench_fixed_point.py
+'''
+
+import json
+import os
+import sys
+import time
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal, localcontext
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from financial_model.fixed_point import ROUNDING, SCALE, to_float  # noqa: E402
+from financial_model.scenario_engine import (  # noqa: E402
+    STATEMENT_ITEMS,
+    historical_inputs,
+    project_scenarios,
+)
+from financial_model.validation import validate  # noqa: E402
+
+N_SCENARIOS = 100_000
+SAMPLE = 200
+REPEATS = 3
+STATEMENTS = ("income_statement", "balance_sheet", "cash_flow", "debt_schedule")
+
+
+def assumption_sets(n_scenarios, rng):
+    # Rates with four decimals, as assumptions are written
+    def uniform(low, high):
+        return rng.uniform(low, high, n_scenarios).round(4)
+
+    return pd.DataFrame(
+        {
+            "Revenue Growth Rate": uniform(-0.05, 0.15),
+            "COGS as % of Revenue": uniform(0.3, 0.6),
+            "SG&A as % of Sales": uniform(0.15, 0.35),
+            "Tax Rate": uniform(0.15, 0.4),
+            "LIBOR": uniform(0.0, 0.05),
+            "Capex as % of Sales": uniform(0.02, 0.08),
+            "Interest earned on cash": uniform(0.0, 0.02),
+            "Days Inventory": rng.integers(20, 90, n_scenarios),
+        }
+    )
+
+
+def decimal_projection(a, h, horizon):
+    # One annual scenario with the fixed-point rules in decimal.Decimal,
+    # amounts in cents; {statement: [period rows]} like the projection
+    def rate(value):
+        # The decimal the float was written as
+        return Decimal(repr(float(value)))
+
+    def fixed(name, value):
+        rule = ROUND_HALF_UP if ROUNDING.get(name) == "half_up" else ROUND_HALF_EVEN
+        return value.quantize(Decimal(1), rounding=rule)
+
+    def amount(value, name=None):
+        return fixed(name, rate(value) * SCALE)
+
+    days = Decimal(365)
+    opening = {key: amount(value) for key, value in h["opening"].items()}
+    term_loan_amortization = amount(a["Term Loan Amortization"], "Term Loan Repayment")
+    unsecured_amortization = amount(
+        a["Unsecured Debt Amortization"], "Change in Unsecured Debt"
+    )
+    revolver_rate = rate(a["LIBOR"]) + rate(a["Revolver"])
+    term_loan_rate = rate(a["LIBOR"]) + rate(a["Term Loan"])
+    unsecured_rate = rate(a["Unsecured Debt"])
+    cash_rate = rate(a["Interest earned on cash"])
+    tax_rate = rate(a["Tax Rate"])
+    minimum_cash = amount(a["Minimum Cash"], "Minimum Cash")
+    other_income = amount(h["other_income_expense"], "Other Income / (Expense)")
+    depreciation_amortization = amount(
+        h["depreciation_amortization"], "Depreciation and Amortization"
+    )
+    asset_disposition = amount(a["Asset Disposition"], "Asset Disposition")
+    other_current_assets = amount(a["Other Current Assets"], "Other Current Assets")
+    other_assets = amount(a["Other Assets"], "Other Assets")
+    other_liabilities = amount(a["Other Liabilities"], "Other Liabilities")
+    common_stock = amount(a["Common Stock"], "Common Stock")
+    goodwill = amount(h["goodwill"])
+
+    revenue = amount(h["revenue"], "Revenue")
+    cash, revolver = opening["cash"], opening["revolver"]
+    term_loan, unsecured = opening["term_loan"], opening["unsecured_debt"]
+    gross_ppe = amount(h["gross_ppe"])
+    accumulated_depreciation = amount(h["accumulated_depreciation"])
+    retained_earnings = amount(h["retained_earnings"])
+    ending_cash_position = amount(h["beginning_cash"])
+    rows = {statement: [] for statement in STATEMENTS}
+    for t in range(1, horizon + 1):
+        revenue = fixed("Revenue", revenue * (1 + rate(a["Revenue Growth Rate"])))
+        cogs = fixed("Cost of Goods Sold (COGS)", revenue * rate(a["COGS as % of Revenue"]))
+        gross_profit = revenue - cogs
+        sga_expenses = fixed("SG&A Expenses", revenue * rate(a["SG&A as % of Sales"]))
+        operating_income = gross_profit - sga_expenses
+        capital_expenditures = fixed(
+            "Capital Expenditures", revenue * rate(a["Capex as % of Sales"])
+        )
+        cash_flow_from_investing = asset_disposition - capital_expenditures
+
+        term_loan_end = max(opening["term_loan"] - term_loan_amortization * t, 0)
+        unsecured_end = max(opening["unsecured_debt"] - unsecured_amortization * t, 0)
+        scheduled_interest = fixed(
+            "Interest Expense", term_loan_rate * (term_loan + term_loan_end) / 2
+        ) + fixed("Interest Expense", unsecured_rate * (unsecured + unsecured_end) / 2)
+        scheduled_repayment = (term_loan - term_loan_end) + (unsecured - unsecured_end)
+        expense = fixed("Interest Expense", revolver_rate * revolver) + scheduled_interest
+        income = fixed("Interest Income", cash_rate * cash)
+        while True:
+            pretax_income = operating_income - expense + income + other_income
+            net_income = pretax_income - fixed("Taxes", pretax_income * tax_rate)
+            available_cash = (
+                cash
+                + net_income
+                + depreciation_amortization
+                + cash_flow_from_investing
+                - scheduled_repayment
+            )
+            shortfall = available_cash - minimum_cash
+            drawdown = max(-shortfall, -revolver)
+            revolver_end = revolver + drawdown
+            cash_end = available_cash + drawdown
+            new_expense = (
+                fixed("Interest Expense", revolver_rate * (revolver + revolver_end) / 2)
+                + scheduled_interest
+            )
+            new_income = fixed("Interest Income", cash_rate * (cash + cash_end) / 2)
+            if new_expense == expense and new_income == income:
+                break
+            expense, income = new_expense, new_income
+
+        inventory = fixed("Inventory", cogs / days * rate(a["Days Inventory"]))
+        accounts_receivable = fixed(
+            "Accounts Receivable", revenue / days * rate(a["Days Accounts Receivable"])
+        )
+        total_current_assets = (
+            cash_end + inventory + accounts_receivable + other_current_assets
+        )
+        gross_ppe += capital_expenditures - asset_disposition
+        accumulated_depreciation += fixed(
+            "Depreciation", gross_ppe * rate(a["Depreciation as % of Gross PP&E"])
+        )
+        net_ppe = gross_ppe - accumulated_depreciation
+        total_assets = total_current_assets + net_ppe + goodwill + other_assets
+        accounts_payable = fixed("Accounts Payable", cogs / days * rate(a["Days Payable"]))
+        accrued_liabilities = fixed(
+            "Accrued Liabilities", cogs * rate(a["Accrued Liabilities as % of COGS"])
+        )
+        other_current_liabilities = fixed(
+            "Other Current Liabilities",
+            cogs * rate(a["Other Current Liabilities as % of COGS"]),
+        )
+        total_current_liabilities = (
+            accounts_payable + accrued_liabilities + other_current_liabilities
+        )
+        total_liabilities = (
+            total_current_liabilities
+            + revolver_end
+            + term_loan_end
+            + unsecured_end
+            + other_liabilities
+        )
+        retained_earnings += net_income
+        total_shareholders_equity = common_stock + retained_earnings
+
+        cash_flow_from_operations = net_income + depreciation_amortization
+        cash_flow_from_financing = (
+            (unsecured_end - unsecured) + (term_loan_end - term_loan) + drawdown
+        )
+        net_cash_flow = (
+            cash_flow_from_operations + cash_flow_from_investing + cash_flow_from_financing
+        )
+        ending_cash_position += net_cash_flow
+
+        rows["income_statement"].append(
+            (
+                revenue,
+                cogs,
+                gross_profit,
+                sga_expenses,
+                operating_income,
+                expense,
+                income,
+                net_income,
+            )
+        )
+        rows["balance_sheet"].append(
+            (
+                cash_end,
+                inventory,
+                accounts_receivable,
+                other_current_assets,
+                total_current_assets,
+                gross_ppe,
+                accumulated_depreciation,
+                net_ppe,
+                goodwill,
+                other_assets,
+                total_assets,
+                accounts_payable,
+                accrued_liabilities,
+                other_current_liabilities,
+                total_current_liabilities,
+                revolver_end,
+                term_loan_end,
+                unsecured_end,
+                total_liabilities,
+                retained_earnings,
+                common_stock,
+                total_shareholders_equity,
+                total_liabilities + total_shareholders_equity,
+            )
+        )
+        rows["cash_flow"].append(
+            (
+                cash_flow_from_operations,
+                -capital_expenditures,
+                asset_disposition,
+                cash_flow_from_investing,
+                unsecured_end - unsecured,
+                term_loan_end - term_loan,
+                drawdown,
+                cash_flow_from_financing,
+                net_cash_flow,
+                ending_cash_position,
+            )
+        )
+        rows["debt_schedule"].append(
+            (
+                shortfall,
+                revolver,
+                drawdown,
+                revolver_end,
+                term_loan,
+                term_loan_end,
+                unsecured,
+                unsecured_end,
+                expense,
+                income,
+                cash_end,
+            )
+        )
+        cash, revolver = cash_end, revolver_end
+        term_loan, unsecured = term_loan_end, unsecured_end
+    return rows
+
+
+def best_time(function):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    os.chdir(ROOT)
+    with open("Asumptions.json") as file:
+        base_assumptions = json.load(file)
+    historical_data = pd.read_csv("historical_data.csv")
+    h = historical_inputs(historical_data)
+    sets = assumption_sets(N_SCENARIOS, np.random.default_rng(0))
+
+    seconds = {}
+    projections = {}
+    for numeric in ("float", "fixed"):
+        seconds[numeric], projections[numeric] = best_time(
+            lambda: project_scenarios(
+                sets, historical_data, base_assumptions, numeric=numeric
+            )
+        )
+    fixed = projections["fixed"]
+    sample = np.random.default_rng(1).choice(N_SCENARIOS, SAMPLE, replace=False)
+    records = sets.iloc[sample].to_dict("records")
+    start = time.perf_counter()
+    with localcontext() as context:
+        # Enough digits that the products of cents and rates are exact
+        context.prec = 50
+        references = [
+            decimal_projection(
+                {"Minimum Cash": 0.0, **base_assumptions, **record},
+                h,
+                fixed.calendar.horizon,
+            )
+            for record in records
+        ]
+    seconds["decimal"] = (time.perf_counter() - start) * N_SCENARIOS / SAMPLE
+
+    for numeric in ("float", "fixed", "decimal"):
+        print(
+            f"{numeric:>8}: {N_SCENARIOS / seconds[numeric]:>12,.0f} scenarios/s, "
+            f"{seconds[numeric] / seconds['float']:8.1f} x float"
+        )
+
+    ok = True
+    mismatches = 0
+    for scenario, reference in zip(sample, references):
+        for statement in STATEMENTS:
+            expected = np.array(reference[statement], dtype=np.int64)
+            if not np.array_equal(getattr(fixed, statement)[scenario], expected):
+                mismatches += 1
+    print(f"Decimal reference: {mismatches} of {SAMPLE * len(STATEMENTS)} statements differ")
+    ok &= mismatches == 0
+
+    as_float = to_float(fixed)
+    for statement in STATEMENTS:
+        difference = np.abs(
+            getattr(as_float, statement) - getattr(projections["float"], statement)
+        )
+        print(f"{statement:>17}: fixed point within {difference.max():.4f} of float")
+
+    float_report = validate(projections["float"], h)
+    exact_float = validate(projections["float"], h, tolerance=0, relative_tolerance=0)
+    exact_fixed = validate(fixed, h, tolerance=0, relative_tolerance=0)
+    print(f"{'check':>28} {'float residue':>14} {'fixed (cents)':>14}")
+    for name in exact_fixed.failures:
+        print(
+            f"{name:>28} {exact_float.max_errors[name]:>14.3g} "
+            f"{exact_fixed.max_errors[name]:>14.0f}"
+        )
+        if not float_report.failures[name] and exact_fixed.failures[name]:
+            print(f"Check {name} passes in float but is not exact in fixed point")
+            ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+'''
+Parity and speed of financial_model.array_functions against the list-based
+financial_model.functions. Every helper is checked on 1-D inputs at each size
+and, where the result depends on the inputs, on a (scenarios x years) batch
+against the list version row by row; then both versions are timed, the
+array version on inputs that are already arrays, so the list-to-array
+conversion it would otherwise spend most of its time on is not counted. Exits
+with status 1 if any result differs by more than the tolerance; the edge cases
+are covered by tests/test_array_functions.py.
+
+Run from the repository root:  python benchmarks/bench_functions.py
+'''
+
+import inspect
+import os
+import sys
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_suite import HELPER_ARGUMENTS  # noqa: E402
+from financial_model import array_functions, functions  # noqa: E402
+
+SIZES = (10, 1_000, 100_000)
+BATCH_SCENARIOS = 50
+BATCH_YEARS = 200
+# Recurrences summed in a different order than the loops agree to rounding
+RELATIVE_TOLERANCE = 1e-12
+
+# Helpers whose result depends only on scalars and the number of years
+SCALAR_ONLY = {
+    "calculate_other_income_expenses",
+    "calculate_days_payable",
+    "calculate_other_current_assets",
+}
+
+
+def best_of(function, repeat=3):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def close(expected, actual):
+    expected = np.asarray(expected, dtype=np.float64)
+    return expected.shape == actual.shape and np.allclose(
+        actual, expected, rtol=RELATIVE_TOLERANCE, atol=0.0
+    )
+
+
+def batch_parity(name):
+    # Array version on a batch vs the list version on every row
+    rows = [
+        HELPER_ARGUMENTS[name](
+            BATCH_YEARS, [100.0 + i + 7 * row for i in range(BATCH_YEARS)]
+        )
+        for row in range(BATCH_SCENARIOS)
+    ]
+    batch = []
+    for values in zip(*rows):
+        if isinstance(values[0], list):
+            batch.append(np.array(values))
+        elif name == "calculate_revenue" and isinstance(values[0], float):
+            batch.append(np.array(values)[:, None])
+        else:
+            batch.append(values[0])
+    expected = [getattr(functions, name)(*arguments) for arguments in rows]
+    return close(expected, getattr(array_functions, name)(*batch))
+
+
+def main():
+    helpers = [name for name, _ in inspect.getmembers(functions, inspect.isfunction)]
+    failures = []
+    print(f"{'helper':<40} {'years':>8} {'list ms':>10} {'array ms':>10} {'speedup':>8}")
+    # Compounded revenue overflows to inf at the longest horizon, in both versions
+    np.seterr(over="ignore")
+    for n in SIZES:
+        values = [100.0 + i for i in range(n)]
+        for name in helpers:
+            arguments = HELPER_ARGUMENTS[name](n, values)
+            arrays = [
+                np.array(argument) if isinstance(argument, list) else argument
+                for argument in arguments
+            ]
+            listed = getattr(functions, name)
+            arrayed = getattr(array_functions, name)
+            if not close(listed(*arguments), arrayed(*arguments)):
+                failures.append(f"{name}[years={n}]")
+            list_time = best_of(lambda: listed(*arguments))
+            array_time = best_of(lambda: arrayed(*arrays))
+            print(
+                f"{name:<40} {n:>8} {list_time * 1e3:>10.4f} {array_time * 1e3:>10.4f}"
+                f" {list_time / array_time:>8.1f}"
+            )
+    for name in helpers:
+        if name not in SCALAR_ONLY and not batch_parity(name):
+            failures.append(f"{name}[batch]")
+
+    if failures:
+        print(f"\nParity FAILED: {', '.join(failures)}")
+        return 1
+    print(f"\nParity OK: {len(helpers)} helpers, 1-D and batched")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+'''
+Scaling benchmark for the projection horizon: times the three statement
+classes and the vectorized scenario engine from 5 to 10,000 periods and
+reports the cost per projected period, which should stay roughly flat.
+
+Run from the repository root:  python benchmarks/bench_horizon.py
+'''
+
+import json
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from financial_model.scenario_engine import project_scenarios  # noqa: E402
+from financial_model.statements import BalanceSheet, CashFlow, IncomeStatement  # noqa: E402
+
+HORIZONS = (5, 50, 600, 2_000, 10_000)
+
+
+def best_of(function, repeat=5):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    os.chdir(ROOT)
+    with open("Asumptions.json") as file:
+        assumptions = json.load(file)
+    historical_data = pd.read_csv("historical_data.csv")
+
+    def run_classes(horizon):
+        income_statement = IncomeStatement(
+            assumptions, historical_data, horizon=horizon, periodicity="monthly"
+        )
+        balance_sheet = BalanceSheet(
+            assumptions, historical_data, income_statement=income_statement
+        )
+        cash_flow = CashFlow(assumptions, historical_data, income_statement)
+        income_statement.calculate_all_line_items()
+        balance_sheet.calculate_all_line_items()
+        cash_flow.calculate_all_line_items()
+
+    def run_engine(horizon):
+        project_scenarios(
+            [assumptions], historical_data, horizon=horizon, periodicity="monthly"
+        )
+
+    print(f"{'periods':>8} {'classes ms':>11} {'us/period':>10} {'engine ms':>10} {'us/period':>10}")
+    for horizon in HORIZONS:
+        classes = best_of(lambda: run_classes(horizon))
+        engine = best_of(lambda: run_engine(horizon))
+        print(
+            f"{horizon:>8} {classes * 1e3:>11.2f} {classes / horizon * 1e6:>10.3f}"
+            f" {engine * 1e3:>10.3f} {engine / horizon * 1e6:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
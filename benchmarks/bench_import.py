@@ -0,0 +1,82 @@
+'''
+Cold-start benchmark: times fresh interpreters importing the package, running
+the CLI's --help and running a full CLI projection, each against a bare
+interpreter. Importing the package must not pull in NumPy or pandas and must
+stay within IMPORT_BUDGET_MS; the script exits with status 1 otherwise.
+
+Run from the repository root:  python benchmarks/bench_import.py
+'''
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Added cost of `import financial_model` over a bare interpreter
+IMPORT_BUDGET_MS = 25.0
+RUNS = 15
+
+COMMANDS = {
+    "bare interpreter": ["-c", "pass"],
+    "import financial_model": ["-c", "import financial_model"],
+    "financial-model --help": ["-m", "financial_model", "--help"],
+    "financial-model": ["-m", "financial_model"],
+}
+
+
+def median_ms(arguments, runs=RUNS):
+    # Median wall time of a fresh interpreter running arguments
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *arguments],
+            cwd=ROOT,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        times.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(times)
+
+
+def heavy_modules_on_import():
+    # Heavy modules loaded by importing the package alone
+    probe = (
+        "import sys, financial_model; "
+        "print(','.join(m for m in ('numpy', 'pandas') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def main():
+    timings = {name: median_ms(arguments) for name, arguments in COMMANDS.items()}
+    baseline = timings["bare interpreter"]
+    print(f"{'command':<24} {'median ms':>10} {'over bare ms':>13}")
+    for name, milliseconds in timings.items():
+        print(f"{name:<24} {milliseconds:>10.1f} {milliseconds - baseline:>13.1f}")
+
+    import_cost = timings["import financial_model"] - baseline
+    heavy = heavy_modules_on_import()
+    print(f"\nimport budget {IMPORT_BUDGET_MS:.0f} ms: {import_cost:.1f} ms used")
+    failed = False
+    if heavy:
+        print(f"FAIL: importing financial_model loads {heavy}")
+        failed = True
+    if import_cost > IMPORT_BUDGET_MS:
+        print("FAIL: import time over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
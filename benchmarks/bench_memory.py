@@ -0,0 +1,53 @@
+'''
+Memory benchmark of the statement classes: memory still held per
+FinancialModel once its statements are projected (traced by tracemalloc over
+many models), and the pandas DataFrames and Series allocated by one run.
+
+Run from the repository root:  python benchmarks/bench_memory.py
+'''
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from financial_model import FinancialModel, profile_model  # noqa: E402
+
+MODELS = 200
+HORIZONS = (5, 120)
+
+
+def main():
+    os.chdir(ROOT)
+    with open("Asumptions.json") as file:
+        assumptions = json.load(file)
+    historical_data = pd.read_csv("historical_data.csv")
+
+    print(f"{'horizon':>8} {'KB per model':>14} {'DataFrames':>11} {'Series':>8}")
+    for horizon in HORIZONS:
+        with profile_model() as report:
+            FinancialModel(assumptions, historical_data, horizon=horizon).statements()
+        gc.collect()
+        tracemalloc.start()
+        models = [
+            FinancialModel(assumptions, historical_data, horizon=horizon)
+            for _ in range(MODELS)
+        ]
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del models
+        print(
+            f"{horizon:>8} {held / MODELS / 1024:>14.1f} {report.dataframes:>11}"
+            f" {report.series:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
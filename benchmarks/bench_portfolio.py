@@ -0,0 +1,129 @@
+'''
+Portfolio benchmark: projects a synthetic coverage universe (copies of
+historical_data.csv with scaled figures) with one set of statement classes per
+company and with project_portfolio(), in-process and sharded, then rolls 1%
+of the companies forward by a year of new actuals.
+
+Run from the repository root:  python benchmarks/bench_portfolio.py
+'''
+
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from financial_model.portfolio import COMPANY_COLUMN, project_portfolio  # noqa: E402
+from financial_model.statements import BalanceSheet, CashFlow, IncomeStatement  # noqa: E402
+
+COMPANIES = (100, 1_000, 10_000, 100_000)
+# The classes are only timed on this many companies and scaled up
+CLASS_SAMPLE = 100
+
+
+def best_of(function, repeat=3):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def universe(historical_data, n_companies, rng):
+    # Long-format history and per-company assumptions for n_companies
+    companies = np.array([f"C{i:06d}" for i in range(n_companies)])
+    numeric = historical_data.columns.drop("Year")
+    scale = rng.uniform(0.5, 2.0, n_companies)
+    history = pd.DataFrame(
+        {
+            COMPANY_COLUMN: np.repeat(companies, len(historical_data)),
+            "Year": np.tile(historical_data["Year"].to_numpy(), n_companies),
+        }
+    )
+    values = np.kron(scale[:, None], historical_data[numeric].to_numpy(np.float64))
+    history = pd.concat([history, pd.DataFrame(values, columns=numeric)], axis=1)
+    assumptions = pd.DataFrame(
+        {
+            COMPANY_COLUMN: companies,
+            "Revenue Growth Rate": rng.uniform(0.0, 0.1, n_companies),
+            "Tax Rate": rng.uniform(0.2, 0.4, n_companies),
+        }
+    )
+    return history, assumptions
+
+
+def main():
+    os.chdir(ROOT)
+    with open("Asumptions.json") as file:
+        base_assumptions = json.load(file)
+    historical_data = pd.read_csv("historical_data.csv")
+    rng = np.random.default_rng(0)
+
+    def run_classes(history, assumptions):
+        for company, rows in history.groupby(COMPANY_COLUMN, sort=False):
+            company_assumptions = dict(
+                base_assumptions,
+                **assumptions.loc[company].to_dict(),
+            )
+            rows = rows.drop(columns=COMPANY_COLUMN).reset_index(drop=True)
+            income_statement = IncomeStatement(company_assumptions, rows)
+            balance_sheet = BalanceSheet(
+                company_assumptions, rows, income_statement=income_statement
+            )
+            cash_flow = CashFlow(company_assumptions, rows, income_statement)
+            income_statement.calculate_all_line_items()
+            balance_sheet.calculate_all_line_items()
+            cash_flow.calculate_all_line_items()
+
+    history, assumptions = universe(historical_data, CLASS_SAMPLE, rng)
+    per_company = best_of(
+        lambda: run_classes(history, assumptions.set_index(COMPANY_COLUMN)), repeat=1
+    ) / CLASS_SAMPLE
+
+    print(
+        f"{'companies':>10} {'classes s':>10} {'portfolio s':>12}"
+        f" {'sharded s':>10} {'us/company':>11}"
+    )
+    for n_companies in COMPANIES:
+        history, assumptions = universe(historical_data, n_companies, rng)
+        portfolio = best_of(
+            lambda: project_portfolio(history, assumptions, base_assumptions)
+        )
+        sharded = best_of(
+            lambda: project_portfolio(
+                history,
+                assumptions,
+                base_assumptions,
+                shard_size=max(1, n_companies // 4),
+            ),
+            repeat=1,
+        )
+        print(
+            f"{n_companies:>10} {per_company * n_companies:>10.2f} {portfolio:>12.3f}"
+            f" {sharded:>10.3f} {portfolio / n_companies * 1e6:>11.2f}"
+        )
+
+    print(f"\n{'companies':>10} {'reported':>9} {'rebuild s':>10} {'roll forward s':>15}")
+    for n_companies in COMPANIES:
+        history, assumptions = universe(historical_data, n_companies, rng)
+        projection = project_portfolio(history, assumptions, base_assumptions)
+        reported = max(1, n_companies // 100)
+        actuals = history.groupby(COMPANY_COLUMN).tail(1).sample(
+            reported, random_state=0
+        )
+        actuals = actuals.assign(Year=actuals["Year"] + 1, Revenue=actuals["Revenue"] * 1.1)
+        rebuild = best_of(
+            lambda: project_portfolio(
+                pd.concat([history, actuals]), assumptions, base_assumptions
+            ),
+            repeat=1,
+        )
+        roll_forward = best_of(lambda: projection.roll_forward(actuals))
+        print(f"{n_companies:>10} {reported:>9} {rebuild:>10.3f} {roll_forward:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+'''
+Projection service benchmark: starts financial_model.server on 127.0.0.1,
+sends batches of concurrent /project requests over keep-alive connections and
+reports requests per second, the server's batch-size and latency metrics, and
+the throughput of building the three statement classes per request. The first
+response is checked against the classes; exits with status 1 on a mismatch.
+
+Run from the repository root:  python benchmarks/bench_server.py
+'''
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from financial_model.server import ProjectionService, serve  # noqa: E402
+from financial_model.statements import FinancialModel  # noqa: E402
+
+REQUESTS = 4_000
+CONNECTIONS = (1, 16, 256)
+CLASS_SAMPLE = 100
+ABSOLUTE_TOLERANCE = 1e-6
+
+
+async def post(reader, writer, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        b"POST /project HTTP/1.1\r\nHost: localhost\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    response = json.loads(await reader.readexactly(length))
+    if b" 200 " not in status:
+        raise RuntimeError(response["error"])
+    return response
+
+
+async def client(port, payloads):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = [await post(reader, writer, payload) for payload in payloads]
+    writer.close()
+    return responses
+
+
+async def load(port, payloads, connections):
+    # Split payloads across connections, each sending one request at a time
+    results = await asyncio.gather(
+        *(client(port, payloads[i::connections]) for i in range(connections))
+    )
+    return [response for responses in results for response in responses]
+
+
+def matches(response, statements):
+    names = ("income_statement", "balance_sheet", "cash_flow")
+    for name, frame in zip(names, statements):
+        for column, values in response[name].items():
+            if not np.allclose(values, frame[column], rtol=0, atol=ABSOLUTE_TOLERANCE):
+                print(f"Mismatch in {column}")
+                return False
+    return True
+
+
+async def run(assumptions, historical_data):
+    rng = np.random.default_rng(0)
+    payloads = [
+        {
+            "assumptions": {
+                **assumptions,
+                "Revenue Growth Rate": float(rng.uniform(0.0, 0.1)),
+                "Tax Rate": float(rng.uniform(0.2, 0.4)),
+            },
+            "history": "default",
+        }
+        for _ in range(REQUESTS)
+    ]
+    ok = True
+    for connections in CONNECTIONS:
+        service = ProjectionService({"default": historical_data})
+        server = await serve(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            start = time.perf_counter()
+            responses = await load(port, payloads, connections)
+            elapsed = time.perf_counter() - start
+        metrics = service.metrics()
+        print(
+            f"server, {connections:>3} connections: {REQUESTS / elapsed:>9,.0f} requests/s, "
+            f"mean batch {metrics['batch_size']['mean']:>6.1f}, "
+            f"latency p50 {metrics['latency_ms']['p50']:.2f} ms "
+            f"p99 {metrics['latency_ms']['p99']:.2f} ms"
+        )
+        first = payloads[0::connections][0]
+        ok &= matches(
+            responses[0], FinancialModel(first["assumptions"], historical_data).statements()
+        )
+
+    start = time.perf_counter()
+    for payload in payloads[:CLASS_SAMPLE]:
+        FinancialModel(payload["assumptions"], historical_data).statements()
+    elapsed = time.perf_counter() - start
+    print(f"three classes per request:     {CLASS_SAMPLE / elapsed:>9,.0f} requests/s")
+    return ok
+
+
+def main():
+    os.chdir(ROOT)
+    with open("Asumptions.json") as file:
+        assumptions = json.load(file)
+    historical_data = pd.read_csv("historical_data.csv")
+    if not asyncio.run(run(assumptions, historical_data)):
+        print("Responses differ from the statement classes")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,281 @@
+'''
+Benchmark suite. Times every calculate_* method of IncomeStatement,
+BalanceSheet and CashFlow (on a cold cache, so a method's time includes the
+line items it depends on), every list-based helper in financial_model.functions
+and the end-to-end runs: calculate_all_line_items() of the three statements
+over several horizons, project_scenarios() over several scenario counts and
+project_portfolio() over several company counts.
+
+Results are written as JSON; --compare flags cases whose median time grew by
+more than --threshold against a stored baseline and exits with status 1:
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json
+'''
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_portfolio import universe  # noqa: E402
+from financial_model import functions  # noqa: E402
+from financial_model.portfolio import project_portfolio  # noqa: E402
+from financial_model.scenario_engine import project_scenarios  # noqa: E402
+from financial_model.statements import (  # noqa: E402
+    BalanceSheet,
+    CashFlow,
+    IncomeStatement,
+    ModelCache,
+)
+from financial_model.validation import validate  # noqa: E402
+
+SIZES = {
+    "quick": {
+        "horizon": (5, 50),
+        "scenarios": (1, 1_000),
+        "companies": (10, 1_000),
+    },
+    "full": {
+        "horizon": (5, 50, 500),
+        "scenarios": (1, 1_000, 100_000),
+        "companies": (10, 1_000, 10_000),
+    },
+}
+
+# Minimum measuring time and run limits per case
+MIN_TIME = 0.2
+MIN_RUNS = 3
+MAX_RUNS = 1_000
+
+# Arguments of every helper in financial_model.functions for n periods
+HELPER_ARGUMENTS = {
+    "calculate_revenue": lambda n, x: (100.0, 0.05, n),
+    "calculate_cogs": lambda n, x: (x, 0.4),
+    "calculate_depreciation": lambda n, x: (x, 0.02),
+    "calculate_gross_profit": lambda n, x: (x, x),
+    "calculate_sga": lambda n, x: (x, 0.3),
+    "calculate_other_income_expenses": lambda n, x: (n,),
+    "calculate_tax_expense": lambda n, x: (x, 0.4),
+    "calculate_net_income": lambda n, x: (x, x, x),
+    "calculate_ar_turnover_days": lambda n, x: (30, x),
+    "calculate_inventory_turnover_days": lambda n, x: (45, x),
+    "calculate_days_payable": lambda n, x: (50, n),
+    "calculate_other_current_assets": lambda n, x: (1.0, n),
+    "calculate_gross_ppe": lambda n, x: (x, x),
+    "calculate_accumulated_depreciation": lambda n, x: (x,),
+    "calculate_other_current_liabilities": lambda n, x: (x, 0.02),
+    "calculate_long_term_debt": lambda n, x: (x,),
+    "calculate_retained_earnings": lambda n, x: (x, x),
+    "calculate_cash_from_operations": lambda n, x: (x, x, x),
+    "calculate_capex": lambda n, x: (x, x),
+    "calculate_changes_in_working_capital": lambda n, x: (x, x, x, x, x, x, x),
+    "calculate_cash_from_investing": lambda n, x: (x, x),
+    "calculate_cash_from_financing": lambda n, x: (x, x),
+    "calculate_change_in_cash": lambda n, x: (x, x, x),
+    "calculate_beginning_cash": lambda n, x: (x,),
+    "calculate_ending_cash": lambda n, x: (x, x),
+}
+
+
+def measure(run, setup=None):
+    # Time run() until MIN_TIME has passed (MIN_RUNS to MAX_RUNS runs). setup,
+    # if given, runs untimed before every run and its result is passed in.
+    times = []
+    while len(times) < MIN_RUNS or (sum(times) < MIN_TIME and len(times) < MAX_RUNS):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(argument) if setup is not None else run()
+        times.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "runs": len(times),
+    }
+
+
+def line_item_methods(cls):
+    return [name for name in vars(cls) if name.startswith("calculate_")]
+
+
+def statement_cases(assumptions, historical_data, horizons):
+    # Every calculate_* method on a cold cache, and the full three-statement run
+    def build(horizon):
+        def setup():
+            cache = ModelCache()
+            income_statement = IncomeStatement(
+                assumptions, historical_data, cache, horizon=horizon
+            )
+            return {
+                IncomeStatement: income_statement,
+                BalanceSheet: BalanceSheet(
+                    assumptions, historical_data, cache, income_statement
+                ),
+                CashFlow: CashFlow(assumptions, historical_data, income_statement),
+            }
+
+        return setup
+
+    for horizon in horizons:
+        setup = build(horizon)
+        for cls in (IncomeStatement, BalanceSheet, CashFlow):
+            for name in line_item_methods(cls):
+                yield (
+                    f"{cls.__name__}.{name}[horizon={horizon}]",
+                    lambda statements, cls=cls, name=name: getattr(
+                        statements[cls], name
+                    )(),
+                    setup,
+                )
+
+        def run_all(statements):
+            for statement in statements.values():
+                statement.calculate_all_line_items()
+
+        yield f"end_to_end.statements[horizon={horizon}]", run_all, setup
+
+
+def helper_cases(horizons):
+    # Every list-based helper on n-period inputs
+    helpers = dict(inspect.getmembers(functions, inspect.isfunction))
+    missing = set(helpers) - set(HELPER_ARGUMENTS)
+    if missing:
+        raise KeyError(f"No benchmark arguments for {', '.join(sorted(missing))}")
+    for n in horizons:
+        values = [100.0 + i for i in range(n)]
+        for name, helper in helpers.items():
+            arguments = HELPER_ARGUMENTS[name](n, values)
+            yield (
+                f"functions.{name}[n={n}]",
+                lambda helper=helper, arguments=arguments: helper(*arguments),
+                None,
+            )
+
+
+def engine_cases(assumptions, historical_data, scenario_counts, company_counts):
+    rng = np.random.default_rng(0)
+    for n_scenarios in scenario_counts:
+        scenarios = pd.DataFrame(
+            {
+                "Revenue Growth Rate": rng.uniform(0.0, 0.1, n_scenarios),
+                "Tax Rate": rng.uniform(0.2, 0.4, n_scenarios),
+            }
+        )
+        yield (
+            f"end_to_end.project_scenarios[scenarios={n_scenarios}]",
+            lambda scenarios=scenarios: project_scenarios(
+                scenarios, historical_data, assumptions
+            ),
+            None,
+        )
+        projection = project_scenarios(scenarios, historical_data, assumptions)
+        yield (
+            f"end_to_end.validate[scenarios={n_scenarios}]",
+            lambda projection=projection: validate(projection),
+            None,
+        )
+    for n_companies in company_counts:
+        history, company_assumptions = universe(historical_data, n_companies, rng)
+        yield (
+            f"end_to_end.project_portfolio[companies={n_companies}]",
+            lambda history=history, company_assumptions=company_assumptions: (
+                project_portfolio(history, company_assumptions, assumptions)
+            ),
+            None,
+        )
+
+
+def run_suite(sizes, pattern=None):
+    with open(os.path.join(ROOT, "Asumptions.json")) as file:
+        assumptions = json.load(file)
+    historical_data = pd.read_csv(os.path.join(ROOT, "historical_data.csv"))
+    cases = [
+        *statement_cases(assumptions, historical_data, sizes["horizon"]),
+        *helper_cases(sizes["horizon"]),
+        *engine_cases(
+            assumptions, historical_data, sizes["scenarios"], sizes["companies"]
+        ),
+    ]
+    results = {}
+    for name, run, setup in cases:
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(run, setup)
+        print(f"{name:<72} {results[name]['median_s'] * 1e3:>10.3f} ms", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Print current vs baseline medians; return the regressed case names
+    regressions = []
+    print(f"\n{'case':<72} {'baseline ms':>12} {'current ms':>11} {'ratio':>6}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median_s"]
+        ratio = result["median_s"] / before
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<72} {before * 1e3:>12.3f} {result['median_s'] * 1e3:>11.3f}"
+            f" {ratio:>6.2f}{flag}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", choices=sorted(SIZES), default="quick")
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown flagged as a regression (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(SIZES[args.sizes], args.filter)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "environment": {
+                        "python": platform.python_version(),
+                        "numpy": np.__version__,
+                        "pandas": pd.__version__,
+                        "machine": platform.machine(),
+                        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    },
+                    "sizes": args.sizes,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+'''
+Grid sweep benchmark: sweeps a Cartesian grid of four assumptions into a
+temporary directory on all cores, interrupting the first run halfway and
+resuming it, and reports combinations per second, the chunks recomputed on
+resume and the peak memory of the parent and the workers for growing grids.
+Sampled rows are checked against project_scenarios(); exits with status 1 on a
+mismatch.
+
+Run from the repository root:  python benchmarks/bench_sweep.py [--large]
+'''
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from financial_model.grid_sweep import sweep  # noqa: E402
+from financial_model.scenario_engine import project_scenarios  # noqa: E402
+
+# Values per key; the grids have 10^4 times these combinations
+SIZES = (10, 20, 30)
+LARGE_SIZES = (*SIZES, 55)
+SAMPLE = 1_000
+RELATIVE_TOLERANCE = 1e-12
+
+
+def grid(size):
+    return {
+        "Revenue Growth Rate": np.linspace(0.0, 0.1, size),
+        "Tax Rate": np.linspace(0.2, 0.4, size),
+        "LIBOR": np.linspace(0.0, 0.05, size),
+        "Capex as % of Sales": np.linspace(0.02, 0.08, size),
+    }
+
+
+def peak_mb(who):
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+class Interrupt(Exception):
+    pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--large", action="store_true", help="add a ~9M combination grid")
+    args = parser.parse_args(argv)
+    os.chdir(ROOT)
+    with open("Asumptions.json") as file:
+        base_assumptions = json.load(file)
+    historical_data = pd.read_csv("historical_data.csv")
+    rng = np.random.default_rng(0)
+
+    ok = True
+    for size in LARGE_SIZES if args.large else SIZES:
+        directory = tempfile.mkdtemp(prefix="bench_sweep_")
+        try:
+            values = grid(size)
+
+            def stop_halfway(done, total):
+                if done >= total // 2:
+                    raise Interrupt
+
+            start = time.perf_counter()
+            try:
+                sweep(values, base_assumptions, historical_data, directory, progress=stop_halfway)
+            except Interrupt:
+                pass
+            resumed = []
+            result = sweep(
+                values,
+                base_assumptions,
+                historical_data,
+                directory,
+                progress=lambda done, total: resumed.append(done),
+            )
+            elapsed = time.perf_counter() - start
+            n_chunks = len(result.completed)
+            print(
+                f"{len(result):>10,} combinations: {len(result) / elapsed:>9,.0f} /s, "
+                f"{n_chunks - len(resumed)} of {n_chunks} chunks kept on resume, "
+                f"peak RSS parent {peak_mb(resource.RUSAGE_SELF):6.0f} MB, "
+                f"workers {peak_mb(resource.RUSAGE_CHILDREN):6.0f} MB"
+            )
+
+            rows = np.sort(rng.choice(len(result), min(SAMPLE, len(result)), replace=False))
+            expected = project_scenarios(
+                result.assumptions(rows), historical_data, base_assumptions
+            )
+            for statement, name in result.metrics:
+                if not np.allclose(
+                    result.line_item(statement, name)[rows],
+                    expected.line_item(statement, name),
+                    rtol=RELATIVE_TOLERANCE,
+                    atol=1e-9,
+                ):
+                    print(f"Sweep differs from project_scenarios() in {name}")
+                    ok = False
+            ok &= result.done
+        finally:
+            shutil.rmtree(directory)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+'''
+Valuation benchmark: projects a synthetic universe with project_portfolio()
+and times valuation() and a 50 x 50 discount rate x terminal growth
+valuation_grid() over every company, against a loop of valuation() calls per
+grid point on a sample. Grid cells are checked against valuation(); exits with
+status 1 on a mismatch.
+
+Run from the repository root:  python benchmarks/bench_valuation.py
+'''
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_portfolio import best_of, universe  # noqa: E402
+from financial_model.dcf import valuation, valuation_grid  # noqa: E402
+from financial_model.portfolio import project_portfolio  # noqa: E402
+
+COMPANIES = (1_000, 10_000)
+GRID = 50
+DISCOUNT_RATES = np.linspace(0.06, 0.12, GRID)
+GROWTH_RATES = np.linspace(0.0, 0.03, GRID)
+# The loop of valuation() calls is only timed on this many grid points
+LOOP_SAMPLE = 50
+RELATIVE_TOLERANCE = 1e-12
+
+
+def main():
+    os.chdir(ROOT)
+    with open("Asumptions.json") as file:
+        base_assumptions = json.load(file)
+    historical_data = pd.read_csv("historical_data.csv")
+    rng = np.random.default_rng(0)
+
+    ok = True
+    for n_companies in COMPANIES:
+        history, assumptions = universe(historical_data, n_companies, rng)
+        projection = project_portfolio(history, assumptions, base_assumptions)
+        per_company = best_of(lambda: valuation(projection, exit_multiple=8.0))
+        grid_time = best_of(
+            lambda: valuation_grid(projection, DISCOUNT_RATES, GROWTH_RATES), repeat=1
+        )
+
+        points = [(rate, growth) for rate in DISCOUNT_RATES for growth in GROWTH_RATES]
+        start = time.perf_counter()
+        for rate, growth in points[:LOOP_SAMPLE]:
+            valuation(projection, discount_rate=rate, terminal_growth=growth)
+        loop_time = (time.perf_counter() - start) / LOOP_SAMPLE * len(points)
+        print(
+            f"{n_companies:>7,} companies: valuation() {per_company * 1e3:8.2f} ms, "
+            f"{GRID}x{GRID} grid {grid_time:7.3f} s, "
+            f"valuation() per grid point {loop_time:7.2f} s (est.)"
+        )
+
+        grid = valuation_grid(projection, DISCOUNT_RATES, GROWTH_RATES)
+        for r, g in ((0, 0), (GRID // 2, GRID - 1), (GRID - 1, GRID // 3)):
+            expected = valuation(
+                projection,
+                discount_rate=DISCOUNT_RATES[r],
+                terminal_growth=GROWTH_RATES[g],
+            )["Enterprise Value (Gordon)"].to_numpy()
+            if not np.allclose(
+                grid.enterprise_value[:, r, g], expected, rtol=RELATIVE_TOLERANCE, atol=0
+            ):
+                print(f"Grid differs from valuation() at ({r}, {g})")
+                ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
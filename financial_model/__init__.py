@@ -0,0 +1,86 @@
+'''
+Three-statement financial model: statement classes, the vectorized scenario
+engine, Monte Carlo simulation and portfolio projections.
+
+Importing the package is cheap: submodules, and the NumPy / pandas stack they
+need, load on first access of one of the names below.
+'''
+
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "ModelCache": "statements",
+    "Statement": "statements",
+    "IncomeStatement": "statements",
+    "DebtSchedule": "statements",
+    "BalanceSheet": "statements",
+    "CashFlow": "statements",
+    "FinancialModel": "statements",
+    "goal_seek": "seek",
+    "ProjectionCalendar": "periods",
+    "profile_model": "profiling",
+    "solve_debt_schedule": "debt_schedule",
+    "ScenarioProjection": "scenario_engine",
+    "project_scenarios": "scenario_engine",
+    "simulate": "monte_carlo",
+    "sensitivities": "sensitivity",
+    "load_history": "column_cache",
+    "PortfolioProjection": "portfolio",
+    "project_portfolio": "portfolio",
+    "ResultCache": "result_cache",
+    "ProjectionService": "server",
+    "validate": "validation",
+    "valuation": "dcf",
+    "valuation_grid": "dcf",
+    "stream_portfolio": "streaming",
+    "export_parquet": "export",
+    "export_excel": "export",
+    "sweep": "grid_sweep",
+    "calibrate": "calibration",
+    "open_sweep": "grid_sweep",
+}
+
+_SUBMODULES = (
+    "array_functions",
+    "calibration",
+    "cli",
+    "column_cache",
+    "dcf",
+    "debt_schedule",
+    "export",
+    "fixed_point",
+    "functions",
+    "grid_sweep",
+    "monte_carlo",
+    "periods",
+    "portfolio",
+    "profiling",
+    "result_cache",
+    "scenario_engine",
+    "seek",
+    "sensitivity",
+    "server",
+    "statements",
+    "streaming",
+    "validation",
+)
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    # Import the defining submodule on first use and cache the attribute
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
@@ -0,0 +1,173 @@
+'''
+NumPy versions of the helpers in functions.py, with the same names and
+arguments. Inputs may be lists, 1-D arrays (one value per year) or 2-D
+(scenarios x years) batches, with rates and percentages as scalars or
+(scenarios x 1) columns; the last axis is always the year. Recurrences become
+cumulative sums and products written into one output array, element-wise
+formulas work on whole arrays, and every function returns a float64 array.
+
+Results match functions.py to rounding, edge cases included (no years,
+num_years < 1); tests/test_array_functions.py checks the parity and
+benchmarks/bench_functions.py times both versions.
+'''
+
+import numpy as np
+
+
+def _array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _no_years(values):
+    # The list versions of the running sums and shifts return [0] when given
+    # no years
+    return np.zeros(np.shape(values)[:-1] + (1,))
+
+
+def _shifted(values):
+    # 0 for the first year, then the previous year's value
+    values = _array(values)
+    if values.shape[-1] == 0:
+        return _no_years(values)
+    shifted = np.empty_like(values)
+    shifted[..., 0] = 0
+    shifted[..., 1:] = values[..., :-1]
+    return shifted
+
+
+#======================= Income Statement functions:===========================================
+
+def calculate_revenue(initial_revenue, growth_rate, num_years):
+    # Projected revenues: initial_revenue compounded at growth_rate, as a
+    # running product [initial, 1 + g, 1 + g, ...] (same order as the loop).
+    # initial_revenue and growth_rate are scalars or (scenarios x 1) columns.
+    # Like the loop, the initial year is always there, even for num_years < 1.
+    num_years = max(num_years, 1)
+    initial_revenue = _array(initial_revenue)
+    growth_factor = 1 + _array(growth_rate)
+    shape = np.broadcast_shapes(np.shape(initial_revenue), np.shape(growth_factor))
+    revenue = np.empty(shape[:-1] + (num_years,))
+    revenue[..., :1] = initial_revenue
+    revenue[..., 1:] = growth_factor
+    return np.cumprod(revenue, axis=-1, out=revenue)
+
+
+def calculate_cogs(revenue, cogs_percentage):
+    return _array(revenue) * cogs_percentage
+
+
+def calculate_depreciation(gross_ppe, depreciation_rate):
+    return _array(gross_ppe) * depreciation_rate
+
+
+def calculate_gross_profit(revenue, cogs):
+    return np.subtract(revenue, cogs, dtype=np.float64)
+
+
+def calculate_sga(revenue, sga_percentage):
+    return _array(revenue) * sga_percentage
+
+
+def calculate_other_income_expenses(num_years):
+    return np.zeros(max(num_years, 0))
+
+
+def calculate_tax_expense(profit_before_tax, tax_rate):
+    return _array(profit_before_tax) * tax_rate
+
+
+def calculate_net_income(gross_profit, other_income_expenses, tax_expense):
+    net_income = np.add(gross_profit, other_income_expenses, dtype=np.float64)
+    return np.subtract(net_income, tax_expense, out=net_income)
+
+#========= Balance Sheet functions:======================================================
+
+def calculate_ar_turnover_days(ar_days, revenue):
+    return (_array(ar_days) * 360) / revenue
+
+
+def calculate_inventory_turnover_days(inventory_days, revenue):
+    return (_array(inventory_days) * 360) / revenue
+
+
+def calculate_days_payable(payable_days, num_years):
+    return np.full(max(num_years, 0), payable_days, dtype=np.float64)
+
+
+def calculate_other_current_assets(other_current_assets, num_years):
+    return np.full(max(num_years, 0), other_current_assets, dtype=np.float64)
+
+
+def calculate_gross_ppe(capex, asset_disposition):
+    # 0 in the first year, then a running sum of capex - asset disposition
+    gross_ppe = np.subtract(capex, asset_disposition, dtype=np.float64)
+    if gross_ppe.shape[-1] == 0:
+        return _no_years(gross_ppe)
+    gross_ppe[..., 0] = 0
+    return np.cumsum(gross_ppe, axis=-1, out=gross_ppe)
+
+
+def calculate_accumulated_depreciation(depreciation):
+    # 0 in the first year, then a running sum of depreciation
+    accumulated_depreciation = np.array(depreciation, dtype=np.float64)
+    if accumulated_depreciation.shape[-1] == 0:
+        return _no_years(accumulated_depreciation)
+    accumulated_depreciation[..., 0] = 0
+    return np.cumsum(accumulated_depreciation, axis=-1, out=accumulated_depreciation)
+
+
+def calculate_other_current_liabilities(cogs, other_current_liabilities_percentage):
+    return _array(cogs) * other_current_liabilities_percentage
+
+
+def calculate_long_term_debt(ending_long_term_debt):
+    return _shifted(ending_long_term_debt)
+
+
+def calculate_retained_earnings(net_income, prior_year_retained_earnings):
+    # Running sum of net income on top of the prior year's retained earnings
+    retained_earnings = np.array(net_income, dtype=np.float64)
+    retained_earnings[..., 0] += _array(prior_year_retained_earnings)[..., 0]
+    return np.cumsum(retained_earnings, axis=-1, out=retained_earnings)
+
+#.=================Cash Flow functions:.======================================
+def calculate_cash_from_operations(net_income, depreciation, changes_in_working_capital):
+    cash_from_operations = np.add(net_income, depreciation, dtype=np.float64)
+    return np.add(cash_from_operations, changes_in_working_capital, out=cash_from_operations)
+
+
+def calculate_capex(capex_percentage, revenue):
+    return np.multiply(capex_percentage, revenue, dtype=np.float64)
+
+
+def calculate_changes_in_working_capital(ar_turnover_days, inventory_turnover_days, days_payable,
+                                        revenue, cogs, other_current_assets, other_current_liabilities):
+    # Same terms, summed in the same order, as the list version (other
+    # current assets do not change, so their zero term is left out)
+    revenue = _array(revenue)
+    working_capital_changes = -(_array(ar_turnover_days) / 360) * revenue
+    working_capital_changes += -(_array(inventory_turnover_days) / 360) * revenue
+    working_capital_changes += (_array(days_payable) / 360) * cogs
+    working_capital_changes += _array(other_current_liabilities) * cogs
+    return working_capital_changes
+
+
+def calculate_cash_from_investing(capex, asset_disposition):
+    return np.add(np.negative(capex, dtype=np.float64), asset_disposition)
+
+
+def calculate_cash_from_financing(change_in_long_term_debt, dividend_payments):
+    return np.add(change_in_long_term_debt, dividend_payments, dtype=np.float64)
+
+
+def calculate_change_in_cash(cash_from_operations, cash_from_investing, cash_from_financing):
+    change_in_cash = np.add(cash_from_operations, cash_from_investing, dtype=np.float64)
+    return np.add(change_in_cash, cash_from_financing, out=change_in_cash)
+
+
+def calculate_beginning_cash(ending_cash):
+    return _shifted(ending_cash)
+
+
+def calculate_ending_cash(beginning_cash, change_in_cash):
+    return np.add(beginning_cash, change_in_cash, dtype=np.float64)
@@ -0,0 +1,420 @@
+'''
+Calibration of the assumptions from historical data. Every assumption the
+history describes is observed year by year with the same formula the
+projection uses (COGS / Revenue, Capex / Revenue, year-on-year revenue growth,
+...) and estimated for every company of a long-format history at once:
+
+    calibration = calibrate(historical_data, method="trend")
+    calibration.assumptions(base_assumptions=assumptions)   # a full Asumptions.json
+    calibration.to_frame()            # estimate, interval and observations per key
+
+    calibration = calibrate(universe, "ewma", base_assumptions=base_assumptions)
+    project_portfolio(universe, calibration.table(), base_assumptions)
+    project_portfolio(universe, calibration.table("lower"), base_assumptions)
+
+    spread = calibrate(historical_data, interval="prediction")
+    simulate(spread.distributions(), base_assumptions, historical_data, 10_000)
+
+Methods, over the last window years (all by default):
+    "mean"   trailing average
+    "trend"  least-squares line through the years, read off at the next year
+    "ewma"   exponentially weighted average, weights halving every halflife years
+method also takes {key: method} with "mean" for the keys it leaves out.
+
+Intervals are Student-t intervals at the given confidence: for the estimate
+itself (interval="confidence") or for next year's value (interval="prediction",
+the wider one to draw scenarios from). Years where a ratio is undefined (a zero
+denominator, or no prior year for growth) are skipped. A key without enough
+observations for an interval has NaN bounds; a key without any takes its
+base_assumptions value when one is given, with no interval.
+
+An estimate outside the range LIMITS gives its key (a negative COGS ratio, a
+tax rate above 1, ...) is rejected like a key without observations, and the
+interval bounds are clipped to the range.
+
+The rates of the debt (LIBOR, Revolver, Term Loan, Unsecured Debt) and Minimum
+Cash are market or policy inputs the history does not identify; they are not
+calibrated and come from base_assumptions. Neither are the working-capital
+assumptions (Days Inventory, Days Accounts Receivable, Days Payable, Accrued
+Liabilities and Other Current Liabilities as % of COGS): the history's
+Inventory, Accounts Receivable, Accounts Payable, Accrued Liabilities and Other
+Current Liabilities columns hold each year's change, not the balance, and
+there is no opening balance to rebuild the balances from.
+'''
+
+import json
+import statistics
+
+import numpy as np
+import pandas as pd
+
+from .portfolio import COMPANY_COLUMN
+
+METHODS = ("mean", "trend", "ewma")
+INTERVALS = ("confidence", "prediction")
+CONFIDENCE = 0.95
+HALFLIFE = 2.0
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = numerator / denominator
+    return np.where(np.isfinite(ratio), ratio, np.nan)
+
+
+def _previous(values):
+    # Value of the year before (NaN for the first year)
+    previous = np.full_like(values, np.nan)
+    previous[:, 1:] = values[:, :-1]
+    return previous
+
+
+# Calibrated key -> function(column, day_count) returning its (companies x
+# years) observations; column(name) is a (companies x years) history column
+DERIVATIONS = {
+    "Revenue Growth Rate": lambda column, day_count: (
+        _ratio(column("Revenue"), _previous(column("Revenue"))) - 1
+    ),
+    "COGS as % of Revenue": lambda column, day_count: _ratio(
+        column("Cost of Goods Sold (COGS)"), column("Revenue")
+    ),
+    "SG&A as % of Sales": lambda column, day_count: _ratio(
+        column("SG&A Expenses"), column("Revenue")
+    ),
+    "Tax Rate": lambda column, day_count: _ratio(
+        column("Taxes"), column("Pretax Income")
+    ),
+    "Depreciation as % of Gross PP&E": lambda column, day_count: _ratio(
+        column("Depreciation"), column("Gross PP&E")
+    ),
+    # Capital Expenditures is reported as a negative cash flow
+    "Capex as % of Sales": lambda column, day_count: _ratio(
+        -column("Capital Expenditures"), column("Revenue")
+    ),
+    "Other Current Assets": lambda column, day_count: column("Other Current Assets"),
+    "Other Assets": lambda column, day_count: column("Other Assets"),
+    "Other Liabilities": lambda column, day_count: column("Other Liabilities"),
+    "Common Stock": lambda column, day_count: column("Common Stock"),
+    "Asset Disposition": lambda column, day_count: column("Asset Dispositions"),
+    "Term Loan Amortization": lambda column, day_count: (
+        _previous(column("Term Loan")) - column("Term Loan")
+    ),
+    "Unsecured Debt Amortization": lambda column, day_count: (
+        _previous(column("Unsecured Debt")) - column("Unsecured Debt")
+    ),
+    "Interest earned on cash": lambda column, day_count: _ratio(
+        column("Interest Income"), _previous(column("Cash"))
+    ),
+}
+
+# Calibrated key -> (lowest, highest) physically meaningful value; keys not
+# listed are unbounded
+LIMITS = {
+    "Revenue Growth Rate": (-1.0, np.inf),
+    "COGS as % of Revenue": (0.0, np.inf),
+    "SG&A as % of Sales": (0.0, np.inf),
+    "Tax Rate": (0.0, 1.0),
+    "Depreciation as % of Gross PP&E": (0.0, 1.0),
+    "Capex as % of Sales": (0.0, np.inf),
+    "Other Current Assets": (0.0, np.inf),
+    "Other Assets": (0.0, np.inf),
+    "Other Liabilities": (0.0, np.inf),
+    "Common Stock": (0.0, np.inf),
+    "Interest earned on cash": (0.0, 1.0),
+}
+
+
+class Calibration:
+    # Calibrated assumptions of every company. estimate, lower, upper,
+    # std_error (of the estimate or of the prediction, following interval)
+    # and observations are (companies x keys) arrays; keys follow DERIVATIONS.
+    def __init__(
+        self,
+        companies,
+        keys,
+        methods,
+        estimate,
+        lower,
+        upper,
+        std_error,
+        observations,
+        confidence,
+        interval,
+    ):
+        self.companies = companies
+        self.keys = keys
+        self.methods = methods
+        self.estimate = estimate
+        self.lower = lower
+        self.upper = upper
+        self.std_error = std_error
+        self.observations = observations
+        self.confidence = confidence
+        self.interval = interval
+
+    def __len__(self):
+        return len(self.companies)
+
+    def table(self, bound="estimate", company_column=COMPANY_COLUMN):
+        # One row per company (company_column plus one column per key) of
+        # the estimates or the lower / upper bounds, shaped like the
+        # assumptions table of project_portfolio(). Keys without a bound keep
+        # their estimate.
+        values = getattr(self, _bound(bound))
+        if bound != "estimate":
+            values = np.where(np.isnan(values), self.estimate, values)
+        frame = pd.DataFrame(values, columns=self.keys)
+        frame.insert(0, company_column, self.companies)
+        return frame
+
+    def assumptions(self, company=None, bound="estimate", base_assumptions=None):
+        # Assumptions dict of one company (the only one by default):
+        # base_assumptions updated with the calibrated keys
+        row = self._row(company)
+        values = getattr(self, _bound(bound))[row]
+        if bound != "estimate":
+            values = np.where(np.isnan(values), self.estimate[row], values)
+        calibrated = {
+            key: float(value) for key, value in zip(self.keys, values) if not np.isnan(value)
+        }
+        return {**(base_assumptions or {}), **calibrated}
+
+    def to_json(self, path, company=None, bound="estimate", base_assumptions=None):
+        # Write assumptions() in the layout of Asumptions.json
+        with open(path, "w") as file:
+            json.dump(self.assumptions(company, bound, base_assumptions), file)
+
+    def distributions(self, company=None):
+        # {key: ("normal", estimate, std_error)} of one company, as taken by
+        # monte_carlo.simulate(); keys without a standard error are left out
+        row = self._row(company)
+        return {
+            key: ("normal", float(estimate), float(std_error))
+            for key, estimate, std_error in zip(
+                self.keys, self.estimate[row], self.std_error[row]
+            )
+            if not np.isnan(std_error)
+        }
+
+    def to_frame(self):
+        # One row per (company, key)
+        n_keys = len(self.keys)
+        return pd.DataFrame(
+            {
+                COMPANY_COLUMN: np.repeat(self.companies.to_numpy(), n_keys),
+                "Assumption": np.tile(self.keys, len(self)),
+                "Method": np.tile([self.methods[key] for key in self.keys], len(self)),
+                "Estimate": self.estimate.ravel(),
+                "Lower": self.lower.ravel(),
+                "Upper": self.upper.ravel(),
+                "Std Error": self.std_error.ravel(),
+                "Observations": self.observations.ravel(),
+            }
+        )
+
+    def _row(self, company):
+        if company is None:
+            if len(self) != 1:
+                raise ValueError("Name the company of a multi-company calibration")
+            return 0
+        return self.companies.get_loc(company)
+
+
+def calibrate(
+    history,
+    method="mean",
+    window=None,
+    halflife=HALFLIFE,
+    confidence=CONFIDENCE,
+    interval="confidence",
+    base_assumptions=None,
+    company_column=COMPANY_COLUMN,
+    day_count=365,
+):
+    # Calibrate DERIVATIONS from history: one company's historical data, or
+    # a long-format table of many with company_column. See the module
+    # docstring for method, window, halflife, confidence and interval.
+    methods = method if isinstance(method, dict) else dict.fromkeys(DERIVATIONS, method)
+    unknown = [key for key in methods if key not in DERIVATIONS]
+    if unknown:
+        raise KeyError(f"Assumptions not calibrated from history: {', '.join(unknown)}")
+    methods = {key: methods.get(key, "mean") for key in DERIVATIONS}
+    for name in set(methods.values()):
+        if name not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}, not {name!r}")
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join(INTERVALS)}, not {interval!r}")
+
+    companies, column = _panel(history, company_column)
+    keys = list(DERIVATIONS)
+    # (keys x companies x years), each company's last year in the last column
+    observed = np.stack([DERIVATIONS[key](column, day_count) for key in keys])
+    if window is not None:
+        observed = observed[:, :, -window:]
+
+    n_keys, n_companies, _ = observed.shape
+    estimate = np.full((n_keys, n_companies), np.nan)
+    spread = np.full((n_keys, n_companies), np.nan)
+    degrees = np.full((n_keys, n_companies), np.nan)
+    observations = (~np.isnan(observed)).sum(axis=2)
+    estimators = {"mean": _mean, "trend": _trend, "ewma": _ewma}
+    for name in METHODS:
+        rows = [k for k, key in enumerate(keys) if methods[key] == name]
+        if rows:
+            estimate[rows], spread[rows], degrees[rows] = estimators[name](
+                observed[rows], interval == "prediction", halflife
+            )
+
+    # No spread without degrees of freedom
+    std_error = np.where(np.isnan(degrees), np.nan, spread)
+    half_width = _t_quantile((1 + confidence) / 2, degrees) * std_error
+    lower = estimate - half_width
+    upper = estimate + half_width
+
+    # Non-physical estimates are rejected, with their intervals
+    for k, key in enumerate(keys):
+        if key in LIMITS:
+            low, high = LIMITS[key]
+            rejected = (estimate[k] < low) | (estimate[k] > high)
+            for values in (estimate, std_error, lower, upper):
+                values[k, rejected] = np.nan
+            lower[k] = np.clip(lower[k], low, high)
+            upper[k] = np.clip(upper[k], low, high)
+
+    # Keys without a single usable year, or with a rejected estimate, take
+    # the base value, with no interval
+    if base_assumptions:
+        for k, key in enumerate(keys):
+            if key in base_assumptions:
+                missing = np.isnan(estimate[k])
+                estimate[k, missing] = base_assumptions[key]
+    return Calibration(
+        companies,
+        keys,
+        methods,
+        estimate.T.copy(),
+        lower.T.copy(),
+        upper.T.copy(),
+        std_error.T.copy(),
+        observations.T.copy(),
+        confidence,
+        interval,
+    )
+
+
+def _panel(history, company_column):
+    # Company index and column(name) -> (companies x years) array, indexed by
+    # Year and right aligned so the last column holds every company's last
+    # year; shorter histories are NaN-padded on the left, a missing year is a
+    # NaN column and missing columns are all NaN
+    if company_column in history.columns:
+        codes, companies = pd.factorize(history[company_column], sort=False)
+        companies = pd.Index(companies, name=company_column)
+        keys = [company_column, "Year"]
+    else:
+        codes = np.zeros(len(history), dtype=np.int64)
+        companies = pd.Index([0], name=company_column)
+        keys = ["Year"]
+    duplicated = history.duplicated(keys)
+    if duplicated.any():
+        first = history.loc[duplicated, keys].iloc[0].tolist()
+        raise ValueError(f"History has more than one row for {first}")
+    years = history["Year"].to_numpy(dtype=np.int64)
+    first_year = np.full(len(companies), np.iinfo(np.int64).max)
+    last_year = np.full(len(companies), np.iinfo(np.int64).min)
+    np.minimum.at(first_year, codes, years)
+    np.maximum.at(last_year, codes, years)
+    n_years = int((last_year - first_year).max()) + 1
+    year = n_years - 1 - (last_year[codes] - years)
+
+    def column(name):
+        values = np.full((len(companies), n_years), np.nan)
+        if name in history.columns:
+            values[codes, year] = history[name].to_numpy(dtype=np.float64)
+        return values
+
+    return companies, column
+
+
+def _mean(observed, prediction, halflife):
+    # Average, standard error of the average (or of next year's value) and
+    # degrees of freedom, along the last axis ignoring NaN
+    present = ~np.isnan(observed)
+    n = present.sum(axis=-1)
+    values = np.where(present, observed, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = values.sum(axis=-1) / n
+        squares = np.where(present, (observed - mean[..., None]) ** 2, 0.0).sum(axis=-1)
+        variance = squares / (n - 1)
+        scale = 1 / n + (1 if prediction else 0)
+        return mean, np.sqrt(variance * scale), np.where(n > 1, n - 1, np.nan)
+
+
+def _trend(observed, prediction, halflife):
+    # Least-squares line through the years, its value at the next year, the
+    # standard error of that value and n - 2 degrees of freedom
+    present = ~np.isnan(observed)
+    n = present.sum(axis=-1)
+    x = np.broadcast_to(np.arange(observed.shape[-1], dtype=np.float64), observed.shape)
+    x = np.where(present, x, 0.0)
+    y = np.where(present, observed, 0.0)
+    next_year = observed.shape[-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = x.sum(axis=-1) / n
+        y_mean = y.sum(axis=-1) / n
+        dx = np.where(present, x - x_mean[..., None], 0.0)
+        sxx = (dx**2).sum(axis=-1)
+        slope = (dx * (y - y_mean[..., None])).sum(axis=-1) / sxx
+        # One year has no slope: the value itself
+        slope = np.where(n == 1, 0.0, slope)
+        estimate = y_mean + slope * (next_year - x_mean)
+        fitted = y_mean[..., None] + slope[..., None] * dx
+        residuals = np.where(present, y - fitted, 0.0)
+        variance = (residuals**2).sum(axis=-1) / (n - 2)
+        scale = 1 / n + (next_year - x_mean) ** 2 / sxx + (1 if prediction else 0)
+        return estimate, np.sqrt(variance * scale), np.where(n > 2, n - 2, np.nan)
+
+
+def _ewma(observed, prediction, halflife):
+    # Exponentially weighted average (the last year weighted 1, weights
+    # halving every halflife years), its standard error from the weighted
+    # variance and the effective number of observations, less one, as the
+    # degrees of freedom
+    present = ~np.isnan(observed)
+    age = observed.shape[-1] - 1 - np.arange(observed.shape[-1])
+    weights = np.where(present, 0.5 ** (age / halflife), 0.0)
+    values = np.where(present, observed, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total = weights.sum(axis=-1)
+        squared = (weights**2).sum(axis=-1)
+        estimate = (weights * values).sum(axis=-1) / total
+        deviations = np.where(present, (observed - estimate[..., None]) ** 2, 0.0)
+        # Unbiased for reliability weights
+        variance = (weights * deviations).sum(axis=-1) / (total - squared / total)
+        effective = total**2 / squared
+        scale = 1 / effective + (1 if prediction else 0)
+        degrees = np.where(effective > 1 + 1e-9, effective - 1, np.nan)
+        return estimate, np.sqrt(variance * scale), degrees
+
+
+def _t_quantile(p, degrees):
+    # Student-t quantile at p for arrays of degrees of freedom, rounded down
+    # to whole degrees (wider intervals). Exact for 1 and 2 degrees, the
+    # Cornish-Fisher expansion (Abramowitz & Stegun 26.7.5) from 3 on.
+    z = statistics.NormalDist().inv_cdf(p)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        v = np.floor(degrees)
+        g1 = (z**3 + z) / 4
+        g2 = (5 * z**5 + 16 * z**3 + 3 * z) / 96
+        g3 = (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384
+        g4 = (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160
+        expansion = z + g1 / v + g2 / v**2 + g3 / v**3 + g4 / v**4
+        one = np.tan(np.pi * (p - 0.5))
+        two = (2 * p - 1) / np.sqrt(2 * p * (1 - p))
+        return np.where(v == 1, one, np.where(v == 2, two, np.where(v >= 3, expansion, np.nan)))
+
+
+def _bound(bound):
+    if bound not in ("estimate", "lower", "upper"):
+        raise ValueError(f"bound must be estimate, lower or upper, not {bound!r}")
+    return bound
@@ -0,0 +1,203 @@
+'''
+Command-line entry point. Loads the assumptions JSON and the historical CSV,
+projects the three statements and prints them:
+
+    financial-model --assumptions Asumptions.json --historical historical_data.csv
+    python -m financial_model --horizon 20 --periodicity quarterly
+
+pandas and the model are only imported once the arguments have been parsed,
+so --help and argument errors return immediately.
+'''
+
+import argparse
+import contextlib
+import json
+
+
+def positive_int(text):
+    # argparse type of a count of at least 1, e.g. --horizon
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="financial-model",
+        description="Project the income statement, balance sheet and cash flow.",
+    )
+    parser.add_argument(
+        "--assumptions",
+        default="Asumptions.json",
+        help="assumptions JSON file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--historical",
+        default="historical_data.csv",
+        help="historical data CSV file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--horizon",
+        type=positive_int,
+        default=5,
+        help="projected periods (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--periodicity",
+        choices=("annual", "quarterly", "monthly"),
+        default="annual",
+        help="length of a projected period (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--day-count",
+        type=int,
+        choices=(365, 360),
+        default=365,
+        help="day-count basis of the days assumptions (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--calibrate",
+        choices=("mean", "trend", "ewma"),
+        help="derive the assumptions from the historical data by this method; "
+        "the assumptions file only supplies the debt rates and minimum cash",
+    )
+    parser.add_argument(
+        "--column-cache",
+        action="store_true",
+        help="read the historical columns from the columnar cache next to the CSV",
+    )
+    parser.add_argument(
+        "--result-cache",
+        metavar="DIRECTORY",
+        help="reuse projections stored in DIRECTORY and store new ones there",
+    )
+    parser.add_argument(
+        "--export-parquet",
+        metavar="DIRECTORY",
+        help="also write the projected statements to Parquet datasets in DIRECTORY",
+    )
+    parser.add_argument(
+        "--export-excel",
+        metavar="PATH",
+        help="also write the projected statements to an Excel workbook at PATH",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help=(
+            "run the integrity checks; exit status 1 if any fails other than "
+            "the known failures (balance, depreciation)"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print call counts, timings and allocations per line item",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    import pandas as pd
+
+    from .profiling import profile_model
+    from .statements import FinancialModel
+
+    with open(args.assumptions, "r") as file:
+        assumptions = json.load(file)
+    if args.column_cache:
+        from .column_cache import load_history
+
+        historical_data = load_history(args.historical)
+    else:
+        historical_data = pd.read_csv(args.historical)
+
+    if args.calibrate:
+        from .calibration import calibrate
+
+        calibration = calibrate(
+            historical_data,
+            method=args.calibrate,
+            base_assumptions=assumptions,
+            day_count=args.day_count,
+        )
+        assumptions = calibration.assumptions(base_assumptions=assumptions)
+        print("Calibrated assumptions:")
+        print(calibration.to_frame().drop(columns="Company").to_string(index=False))
+        print()
+
+    with profile_model() if args.profile else contextlib.nullcontext() as report:
+        if args.result_cache:
+            from .result_cache import ResultCache
+
+            statements = ResultCache(args.result_cache).project(
+                assumptions,
+                historical_data,
+                horizon=args.horizon,
+                periodicity=args.periodicity,
+                day_count=args.day_count,
+            )
+        else:
+            statements = FinancialModel(
+                assumptions,
+                historical_data,
+                horizon=args.horizon,
+                periodicity=args.periodicity,
+                day_count=args.day_count,
+            ).statements()
+        income_statement, balance_sheet, cash_flow = statements
+
+    print("Projected Income Statement:")
+    print(income_statement)
+    print("\nProjected Balance Sheet:")
+    print(balance_sheet)
+    print("\nProjected Cash Flow:")
+    print(cash_flow)
+    if report is not None:
+        print("\nLine-item profile:")
+        print(report.to_frame().to_string(index=False))
+    if args.export_parquet or args.export_excel:
+        from .export import export_excel, export_parquet
+        from .scenario_engine import project_scenarios
+
+        projection = project_scenarios(
+            [assumptions],
+            historical_data,
+            horizon=args.horizon,
+            periodicity=args.periodicity,
+            day_count=args.day_count,
+        )
+        for path, export in (
+            (args.export_parquet, export_parquet),
+            (args.export_excel, export_excel),
+        ):
+            if path:
+                print(f"\nExported to {path}:")
+                print(export(projection, path).to_frame().to_string(index=False))
+    if args.validate:
+        from .validation import KNOWN_FAILURES, validate
+
+        model = FinancialModel(
+            assumptions,
+            historical_data,
+            horizon=args.horizon,
+            periodicity=args.periodicity,
+            day_count=args.day_count,
+        )
+        validation = validate(model)
+        print("\nIntegrity checks:")
+        print(validation.to_frame().to_string(index=False))
+        known = [name for name in validation.failed() if name in KNOWN_FAILURES]
+        if known:
+            print(
+                f"\nKnown failures of the model: {', '.join(known)} (cash flow from "
+                "operations adds back historical D&A and leaves out working capital)"
+            )
+        return 1 if validation.unexpected() else 0
+    return 0
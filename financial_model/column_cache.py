@@ -0,0 +1,161 @@
+'''
+Columnar on-disk cache of historical CSVs. The first load of a CSV parses it
+once and stores every column as its own .npy file; later loads memory-map only
+the requested columns, so no CSV text is parsed and unread columns cost
+nothing. Cache entries are keyed by the absolute path of the CSV, the
+read_csv options it was parsed with and the SHA-256 of its contents, so an
+edited CSV is converted again automatically and differently parsed frames of
+one file never stand in for each other. The CSV is only hashed again when its
+size or modification time has changed since the last load, so a load of an
+unchanged file costs a stat() rather than a read of the whole file.
+
+    history = load_history("historical_data.csv")          # projection columns
+    history = load_history("universe.csv", columns=None)   # every column
+'''
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .scenario_engine import HISTORICAL_COLUMNS
+
+CACHE_DIRECTORY = ".column_cache"
+MANIFEST = "manifest.json"
+_HASH_CHUNK = 1 << 20
+# A CSV modified this recently is hashed on every load: a same-size edit
+# within the file system's timestamp resolution would keep its mtime
+RACY_NS = 2_000_000_000
+
+
+def file_hash(path):
+    # SHA-256 of the file contents, read in 1 MiB chunks
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_key(path, **read_csv_options):
+    # Hash of the CSV's absolute path and the read_csv options, shared by
+    # every version of its contents
+    source = json.dumps(
+        [os.path.abspath(path), sorted(read_csv_options.items())], default=repr
+    )
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def _cache_dir(path, cache_dir):
+    if cache_dir is None:
+        return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRECTORY)
+    return cache_dir
+
+
+def cache_path(path, cache_dir=None, **read_csv_options):
+    # Cache entry of the CSV at path:
+    # <cache_dir>/<file name>-<source key>-<content hash prefix>.
+    # cache_dir defaults to .column_cache next to the CSV.
+    cache_dir = _cache_dir(path, cache_dir)
+    name = os.path.basename(path)
+    source = source_key(path, **read_csv_options)
+    return os.path.join(cache_dir, f"{name}-{source}-{file_hash(path)[:16]}")
+
+
+def build_cache(path, entry, **read_csv_options):
+    # Parse the CSV and write one .npy per column plus a manifest. Written to
+    # a temporary directory first and renamed, so readers never see a
+    # half-written entry. Entries of earlier versions of the CSV, read with the
+    # same options, are removed.
+    frame = pd.read_csv(path, **read_csv_options)
+    parent = os.path.dirname(entry)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".building-")
+    try:
+        files = {}
+        for index, column in enumerate(frame.columns):
+            values = frame[column].to_numpy()
+            if values.dtype == object:
+                # Fixed-width strings can be memory-mapped, objects cannot
+                values = values.astype(str)
+            files[column] = f"c{index:04d}.npy"
+            np.save(os.path.join(staging, files[column]), values)
+        with open(os.path.join(staging, MANIFEST), "w") as file:
+            json.dump(
+                {"source": os.path.basename(path), "rows": len(frame), "files": files},
+                file,
+                indent=2,
+            )
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            # Another process built the same entry first
+            if not os.path.exists(os.path.join(entry, MANIFEST)):
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    prefix = f"{os.path.basename(path)}-{source_key(path, **read_csv_options)}-"
+    for stale in os.listdir(parent):
+        if stale.startswith(prefix) and stale != os.path.basename(entry):
+            shutil.rmtree(os.path.join(parent, stale), ignore_errors=True)
+    return entry
+
+
+def current_entry(path, cache_dir=None, **read_csv_options):
+    # Up-to-date cache entry of the CSV at path, built if needed. The CSV's
+    # size and mtime are stamped next to the entry (<file name>-<source
+    # key>.stamp); while they match, the entry is reused without hashing.
+    cache_dir = _cache_dir(path, cache_dir)
+    source = source_key(path, **read_csv_options)
+    stamp_path = os.path.join(cache_dir, f"{os.path.basename(path)}-{source}.stamp")
+    status = os.stat(path)
+    stamp = [status.st_size, status.st_mtime_ns]
+    try:
+        with open(stamp_path) as file:
+            recorded = json.load(file)
+    except (FileNotFoundError, ValueError):
+        recorded = None
+    if recorded and recorded["stat"] == stamp:
+        entry = os.path.join(cache_dir, recorded["entry"])
+        if os.path.exists(os.path.join(entry, MANIFEST)):
+            return entry
+
+    entry = cache_path(path, cache_dir, **read_csv_options)
+    if not os.path.exists(os.path.join(entry, MANIFEST)):
+        build_cache(path, entry, **read_csv_options)
+    if time.time_ns() - status.st_mtime_ns > RACY_NS:
+        # The stat was taken before hashing: a CSV edited since then fails
+        # the comparison next time and is hashed again
+        handle, staging = tempfile.mkstemp(dir=cache_dir, prefix=".stamp-")
+        with os.fdopen(handle, "w") as file:
+            json.dump({"stat": stamp, "entry": os.path.basename(entry)}, file)
+        os.replace(staging, stamp_path)
+    return entry
+
+
+def load_history(path, columns=HISTORICAL_COLUMNS, cache_dir=None, **read_csv_options):
+    # DataFrame of the given columns of the CSV at path (None: all columns),
+    # backed by read-only memory maps of the cached column files. Builds the
+    # cache entry on first use or when the CSV has changed.
+    entry = current_entry(path, cache_dir, **read_csv_options)
+    with open(os.path.join(entry, MANIFEST)) as file:
+        files = json.load(file)["files"]
+    if columns is None:
+        columns = list(files)
+    missing = [column for column in columns if column not in files]
+    if missing:
+        raise KeyError(f"{path} has no columns {', '.join(missing)}")
+    return pd.DataFrame(
+        {
+            column: np.load(os.path.join(entry, files[column]), mmap_mode="r")
+            for column in columns
+        },
+        copy=False,
+    )
@@ -0,0 +1,368 @@
+'''
+DCF valuation of projected statements, for every scenario or company at once.
+Free cash flow comes from the projected cash flow and income statement, is
+discounted at a rate anchored on the LIBOR and debt rates of the assumptions
+(or at given rates), and a terminal value by Gordon growth and/or an exit
+multiple is added:
+
+    projection = project_scenarios(assumption_sets, historical_data)
+    result = valuation(projection, assumption_sets, terminal_growth=0.02)
+    grid = valuation_grid(
+        projection, np.linspace(0.06, 0.12, 50), np.linspace(0.0, 0.03, 50),
+        assumption_sets,
+    )
+    grid.to_frame(0)   # discount rate x terminal growth table of scenario 0
+
+Free cash flow, per period:
+    "cash_flow"  Cash Flow from Operations - capex
+    "ebit"       Operating Income x (1 - Tax Rate) + D&A - capex
+where D&A is the non-cash add-back in cash flow from operations.
+
+The default discount rate is a book-value WACC at the start of the projection:
+cost of debt is the average of the revolver (LIBOR + Revolver), term loan
+(LIBOR + Term Loan) and unsecured debt (Unsecured Debt) rates weighted by the
+opening balances (LIBOR + Term Loan without debt), after tax; cost of equity
+is LIBOR + equity_risk_premium. Rates are annual; cash flows are discounted
+from the end of each period, and terminal values use the annualized last
+period.
+'''
+
+import numpy as np
+import pandas as pd
+
+from .scenario_engine import STATEMENT_ITEMS
+
+EQUITY_RISK_PREMIUM = 0.06
+METHODS = ("cash_flow", "ebit")
+IRR_BOUNDS = (-0.99, 10.0)
+IRR_TOLERANCE = 1e-10
+
+
+def _item(projection, statement, name):
+    # In currency units, fixed-point projections included
+    values = getattr(projection, statement)[:, :, STATEMENT_ITEMS[statement].index(name)]
+    scale = getattr(projection, "scale", None)
+    return values / scale if scale else values
+
+
+def _column(assumptions, key, n_scenarios, base_assumptions=None):
+    # One value per scenario from a scalar, per-scenario values or a column;
+    # keys missing from assumptions are taken from base_assumptions and
+    # shared by every scenario, as in scenario_engine.assumption_table()
+    if key not in assumptions and key in (base_assumptions or {}):
+        values = np.asarray(base_assumptions[key], dtype=np.float64)
+    elif key not in assumptions:
+        raise KeyError(f"Missing assumptions: {key}")
+    elif isinstance(assumptions, pd.DataFrame):
+        values = assumptions[key].to_numpy(dtype=np.float64)
+    else:
+        values = np.asarray(assumptions[key], dtype=np.float64)
+    return np.broadcast_to(values.reshape(-1), (n_scenarios,))
+
+
+def _assumptions(projection, assumptions):
+    # Assumptions of projection: given, or kept by project_portfolio()
+    if assumptions is None:
+        assumptions = getattr(projection, "assumptions", None)
+    if assumptions is None:
+        raise ValueError("assumptions are needed for the tax and debt rates")
+    if isinstance(assumptions, list):
+        assumptions = pd.DataFrame(assumptions)
+    return assumptions
+
+
+def _periods_per_year(projection):
+    return projection.calendar.periods_per_year
+
+
+def depreciation_amortization(projection):
+    # Non-cash add-back between net income and cash flow from operations
+    return _item(projection, "cash_flow", "Cash Flow from Operations") - _item(
+        projection, "income_statement", "Net Income"
+    )
+
+
+def free_cash_flow(
+    projection, assumptions=None, method="cash_flow", base_assumptions=None
+):
+    # (scenarios x periods) free cash flow; see the module docstring
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}, not {method!r}")
+    # Capital Expenditures is reported as a negative cash flow
+    capex = -_item(projection, "cash_flow", "Capital Expenditures")
+    if method == "cash_flow":
+        return _item(projection, "cash_flow", "Cash Flow from Operations") - capex
+    assumptions = _assumptions(projection, assumptions)
+    tax_rate = _column(assumptions, "Tax Rate", len(projection), base_assumptions)
+    operating_income = _item(projection, "income_statement", "Operating Income")
+    return (
+        operating_income * (1 - tax_rate[:, None])
+        + depreciation_amortization(projection)
+        - capex
+    )
+
+
+def opening_net_debt(projection):
+    # Debt less cash at the start of the projection, per scenario
+    def opening(name):
+        return _item(projection, "debt_schedule", name)[:, 0]
+
+    cash = (
+        _item(projection, "cash_flow", "Ending Cash Position")[:, 0]
+        - _item(projection, "cash_flow", "Net Cash Flow")[:, 0]
+    )
+    return (
+        opening("Beginning Revolver Balance")
+        + opening("Term Loan Beginning Balance")
+        + opening("Unsecured Debt Beginning Balance")
+        - cash
+    )
+
+
+def wacc(
+    projection,
+    assumptions=None,
+    equity_risk_premium=EQUITY_RISK_PREMIUM,
+    base_assumptions=None,
+):
+    # Book-value WACC per scenario, anchored on LIBOR and the debt rates
+    assumptions = _assumptions(projection, assumptions)
+    n_scenarios = len(projection)
+
+    def get(key):
+        return _column(assumptions, key, n_scenarios, base_assumptions)
+
+    libor = get("LIBOR")
+    rates = (libor + get("Revolver"), libor + get("Term Loan"), get("Unsecured Debt"))
+    balances = [
+        np.maximum(_item(projection, "debt_schedule", name)[:, 0], 0.0)
+        for name in (
+            "Beginning Revolver Balance",
+            "Term Loan Beginning Balance",
+            "Unsecured Debt Beginning Balance",
+        )
+    ]
+    debt = sum(balances)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cost_of_debt = np.where(
+            debt > 0,
+            sum(rate * balance for rate, balance in zip(rates, balances)) / debt,
+            rates[1],
+        )
+    cost_of_equity = libor + equity_risk_premium
+
+    # Opening book equity: equity at the end of the first period less its
+    # net income
+    equity = np.maximum(
+        _item(projection, "balance_sheet", "Total Shareholders Equity")[:, 0]
+        - _item(projection, "income_statement", "Net Income")[:, 0],
+        0.0,
+    )
+    capital = debt + equity
+    with np.errstate(invalid="ignore", divide="ignore"):
+        debt_weight = np.where(capital > 0, debt / capital, 0.0)
+    return (
+        debt_weight * cost_of_debt * (1 - get("Tax Rate"))
+        + (1 - debt_weight) * cost_of_equity
+    )
+
+
+def discount_factors(rates, n_periods, periods_per_year=1):
+    # (... x periods) end-of-period discount factors at annual rates
+    times = np.arange(1, n_periods + 1) / periods_per_year
+    return (1 + np.asarray(rates, dtype=np.float64)[..., None]) ** -times
+
+
+def gordon_terminal_value(last_cash_flow, rate, growth):
+    # Value at the horizon of an annual cash flow growing at growth forever;
+    # NaN where rate <= growth
+    with np.errstate(invalid="ignore", divide="ignore"):
+        value = last_cash_flow * (1 + growth) / (rate - growth)
+    return np.where(rate > growth, value, np.nan)
+
+
+def exit_multiple_terminal_value(projection, multiple):
+    # Annualized last-period EBITDA (operating income + D&A) times multiple
+    ebitda = (
+        _item(projection, "income_statement", "Operating Income")[:, -1]
+        + depreciation_amortization(projection)[:, -1]
+    )
+    return ebitda * _periods_per_year(projection) * np.asarray(multiple)
+
+
+def irr(
+    cash_flows,
+    periods_per_year=1,
+    bounds=IRR_BOUNDS,
+    tolerance=IRR_TOLERANCE,
+    max_iterations=200,
+):
+    # Annual IRR of each row of (scenarios x times) cash flows, the first at
+    # time 0 and one per period after it, by bisection on bounds; NaN where
+    # the NPV does not change sign on bounds
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    times = np.arange(cash_flows.shape[1]) / periods_per_year
+
+    def npv_at(rate):
+        return (cash_flows * (1 + rate[:, None]) ** -times).sum(axis=1)
+
+    n_rows = cash_flows.shape[0]
+    low = np.full(n_rows, bounds[0])
+    high = np.full(n_rows, bounds[1])
+    f_low = npv_at(low)
+    bracketed = np.sign(f_low) * np.sign(npv_at(high)) <= 0
+    for _ in range(max_iterations):
+        middle = (low + high) / 2
+        f_middle = npv_at(middle)
+        keeps_low = np.sign(f_middle) == np.sign(f_low)
+        low = np.where(keeps_low, middle, low)
+        f_low = np.where(keeps_low, f_middle, f_low)
+        high = np.where(keeps_low, high, middle)
+        if (high - low).max() <= tolerance:
+            break
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+
+def valuation(
+    projection,
+    assumptions=None,
+    discount_rate=None,
+    terminal_growth=0.02,
+    exit_multiple=None,
+    price=None,
+    method="cash_flow",
+    equity_risk_premium=EQUITY_RISK_PREMIUM,
+    base_assumptions=None,
+):
+    # One row per scenario (or company): discount rate, present value of
+    # the projected free cash flow, Gordon growth and (with exit_multiple)
+    # exit-multiple terminal and enterprise values, opening net debt and
+    # equity values. With price (enterprise value paid today, scalar or per
+    # scenario), IRR of paying it and receiving the free cash flow plus the
+    # exit-multiple (else Gordon) terminal value.
+    # discount_rate, terminal_growth and exit_multiple take a scalar or one
+    # value per scenario; discount_rate defaults to the WACC. Assumptions
+    # missing from assumptions come from base_assumptions.
+    periods_per_year = _periods_per_year(projection)
+    if discount_rate is None:
+        discount_rate = wacc(
+            projection, assumptions, equity_risk_premium, base_assumptions
+        )
+    n_scenarios = len(projection)
+    rate = np.broadcast_to(np.asarray(discount_rate, dtype=np.float64), (n_scenarios,))
+    cash_flow = free_cash_flow(projection, assumptions, method, base_assumptions)
+    factors = discount_factors(rate, cash_flow.shape[1], periods_per_year)
+    present_value = (cash_flow * factors).sum(axis=1)
+    net_debt = opening_net_debt(projection)
+
+    last_cash_flow = cash_flow[:, -1] * periods_per_year
+    gordon = gordon_terminal_value(last_cash_flow, rate, terminal_growth)
+    columns = {
+        "Discount Rate": rate,
+        "PV of Free Cash Flow": present_value,
+        "Terminal Value (Gordon)": gordon,
+        "Enterprise Value (Gordon)": present_value + gordon * factors[:, -1],
+    }
+    terminal = gordon
+    if exit_multiple is not None:
+        terminal = exit_multiple_terminal_value(projection, exit_multiple)
+        columns["Terminal Value (Exit Multiple)"] = terminal
+        columns["Enterprise Value (Exit Multiple)"] = (
+            present_value + terminal * factors[:, -1]
+        )
+    columns["Net Debt"] = net_debt
+    columns["Equity Value (Gordon)"] = columns["Enterprise Value (Gordon)"] - net_debt
+    if exit_multiple is not None:
+        columns["Equity Value (Exit Multiple)"] = (
+            columns["Enterprise Value (Exit Multiple)"] - net_debt
+        )
+    if price is not None:
+        flows = np.zeros((n_scenarios, cash_flow.shape[1] + 1))
+        flows[:, 0] = -np.broadcast_to(price, (n_scenarios,))
+        flows[:, 1:] = cash_flow
+        flows[:, -1] += terminal
+        columns["IRR"] = irr(flows, periods_per_year)
+    return pd.DataFrame(columns, index=_labels(projection))
+
+
+class ValuationGrid:
+    # Enterprise values by Gordon growth over a grid of discount rates and
+    # terminal growth rates. enterprise_value[s, r, g] is scenario s at
+    # discount_rates[s, r] and growth_rates[g]; net_debt[s] turns it into an
+    # equity value.
+    def __init__(self, labels, discount_rates, growth_rates, enterprise_value, net_debt):
+        self.labels = labels
+        self.discount_rates = discount_rates
+        self.growth_rates = growth_rates
+        self.enterprise_value = enterprise_value
+        self.net_debt = net_debt
+
+    @property
+    def equity_value(self):
+        return self.enterprise_value - self.net_debt[:, None, None]
+
+    def to_frame(self, scenario=0, equity=False):
+        # Discount rate (rows) x terminal growth (columns) table of one
+        # scenario, by position
+        values = self.equity_value if equity else self.enterprise_value
+        return pd.DataFrame(
+            values[scenario],
+            index=pd.Index(self.discount_rates[scenario], name="Discount Rate"),
+            columns=pd.Index(self.growth_rates, name="Terminal Growth"),
+        )
+
+
+def valuation_grid(
+    projection,
+    discount_rates,
+    growth_rates,
+    assumptions=None,
+    anchored=False,
+    method="cash_flow",
+    equity_risk_premium=EQUITY_RISK_PREMIUM,
+    base_assumptions=None,
+):
+    # Gordon growth enterprise value of every scenario at every
+    # (discount rate, terminal growth) pair. discount_rates is one grid for
+    # all scenarios (rates,) or one per scenario (scenarios x rates). With
+    # anchored, discount_rates are spreads over each scenario's WACC instead
+    # of absolute rates. Assumptions missing from assumptions come from
+    # base_assumptions.
+    periods_per_year = _periods_per_year(projection)
+    n_scenarios = len(projection)
+    growth_rates = np.asarray(growth_rates, dtype=np.float64)
+    discount_rates = np.atleast_1d(np.asarray(discount_rates, dtype=np.float64))
+    if discount_rates.ndim > 2:
+        raise ValueError(
+            "discount_rates must be (rates,) or (scenarios x rates), "
+            f"not {discount_rates.shape}"
+        )
+    rates = np.broadcast_to(discount_rates, (n_scenarios, discount_rates.shape[-1]))
+    if anchored:
+        anchor = wacc(projection, assumptions, equity_risk_premium, base_assumptions)
+        rates = rates + anchor[:, None]
+
+    cash_flow = free_cash_flow(projection, assumptions, method, base_assumptions)
+    # (scenarios x rates x periods)
+    factors = discount_factors(rates, cash_flow.shape[1], periods_per_year)
+    present_value = np.einsum("st,srt->sr", cash_flow, factors)
+    terminal = gordon_terminal_value(
+        cash_flow[:, -1, None, None] * periods_per_year,
+        rates[:, :, None],
+        growth_rates[None, None, :],
+    )
+    enterprise_value = present_value[:, :, None] + terminal * factors[:, :, -1, None]
+    return ValuationGrid(
+        _labels(projection),
+        np.array(rates),
+        growth_rates,
+        enterprise_value,
+        opening_net_debt(projection),
+    )
+
+
+def _labels(projection):
+    companies = getattr(projection, "companies", None)
+    if companies is not None:
+        return companies
+    return pd.RangeIndex(len(projection), name="Scenario")
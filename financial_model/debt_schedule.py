@@ -0,0 +1,241 @@
+'''
+Debt schedule with circular interest. Interest is charged on average
+(beginning + ending) balances of the revolver, term loan and unsecured debt and
+earned on average cash; the revolver draws to cover cash shortfalls below the
+minimum cash balance and is paid down from surplus cash. Because interest feeds
+net income, which feeds cash and therefore the revolver balance, each period is
+solved by fixed-point iteration on interest.
+
+The solver works on (scenarios x periods) arrays: periods are walked in order
+and within a period the scenarios iterate together, each dropping out once its
+change in interest falls below the tolerance. A scenario's result is the same
+whatever batch it is solved in, and one slow scenario only keeps itself
+iterating.
+
+Rates are read from the assumptions as follows:
+    revolver        LIBOR + Revolver
+    term loan       LIBOR + Term Loan
+    unsecured debt  Unsecured Debt (fixed)
+    cash            Interest earned on cash
+'''
+
+import numpy as np
+
+
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 100
+
+# Assumptions with a default when missing from the assumptions
+OPTIONAL_ASSUMPTIONS = {"Minimum Cash": 0.0}
+
+
+class DebtScheduleSolution:
+    # Solved schedule. Every balance and flow is a (scenarios x periods)
+    # array; iterations[t] is the number of fixed-point passes period t
+    # needed by its slowest scenario, converged and max_residual are per scenario.
+    def __init__(self, **arrays):
+        self.__dict__.update(arrays)
+
+    @property
+    def total_iterations(self):
+        return int(self.iterations.sum())
+
+
+def opening_balances(historical_data):
+    # Balances at the end of the last historical year
+    last = historical_data.iloc[-1]
+    return {
+        "cash": float(last["Ending Cash Position"]),
+        "revolver": float(last["Ending Revolver Balance"]),
+        "term_loan": float(last["Term Loan Ending Balance"]),
+        "unsecured_debt": float(last["Unsecured Debt Ending Balance"]),
+    }
+
+
+def solve_debt_schedule(
+    assumptions,
+    opening,
+    calendar,
+    operating_income,
+    other_income_expense,
+    depreciation_amortization,
+    cash_flow_from_investing,
+    tolerance=TOLERANCE,
+    max_iterations=MAX_ITERATIONS,
+):
+    # assumptions: mapping of assumption values, scalars or (scenarios x 1)
+    # opening: last historical "cash", "revolver", "term_loan" and
+    #   "unsecured_debt" balances, scalars or (scenarios x 1)
+    # operating_income, cash_flow_from_investing: (scenarios x periods)
+    # other_income_expense, depreciation_amortization: per-period amounts,
+    #   scalars or (scenarios x 1)
+    def get(key):
+        return assumptions.get(key, OPTIONAL_ASSUMPTIONS.get(key))
+
+    per_period = calendar.per_period
+    shape = np.broadcast_shapes(
+        np.shape(operating_income), np.shape(cash_flow_from_investing)
+    )
+    n_scenarios, n_periods = shape
+
+    def rate(value):
+        # Per-scenario value as a (scenarios,) vector
+        return np.broadcast_to(np.reshape(value, -1), (n_scenarios,))
+
+    revolver_rate = rate(per_period(get("LIBOR") + get("Revolver")))
+    term_loan_rate = per_period(get("LIBOR") + get("Term Loan"))
+    unsecured_debt_rate = per_period(get("Unsecured Debt"))
+    cash_rate = rate(per_period(get("Interest earned on cash")))
+    tax_rate = rate(get("Tax Rate"))
+    minimum_cash = rate(get("Minimum Cash"))
+
+    # Mandatory amortization does not depend on interest: min(amortization,
+    # balance) each period, i.e. the balance runs down linearly to zero
+    elapsed = np.arange(1, n_periods + 1)
+    term_loan_ending = np.broadcast_to(
+        np.maximum(
+            opening["term_loan"] - per_period(get("Term Loan Amortization")) * elapsed,
+            0.0,
+        ),
+        shape,
+    )
+    unsecured_debt_ending = np.broadcast_to(
+        np.maximum(
+            opening["unsecured_debt"]
+            - per_period(get("Unsecured Debt Amortization")) * elapsed,
+            0.0,
+        ),
+        shape,
+    )
+    term_loan_beginning = _previous(term_loan_ending, opening["term_loan"])
+    unsecured_debt_beginning = _previous(
+        unsecured_debt_ending, opening["unsecured_debt"]
+    )
+    scheduled_interest = term_loan_rate * (
+        term_loan_beginning + term_loan_ending
+    ) / 2 + unsecured_debt_rate * (unsecured_debt_beginning + unsecured_debt_ending) / 2
+    scheduled_repayment = (term_loan_beginning - term_loan_ending) + (
+        unsecured_debt_beginning - unsecured_debt_ending
+    )
+    unlevered_cash_flow = np.broadcast_to(
+        depreciation_amortization + cash_flow_from_investing, shape
+    )
+    operating_income = np.broadcast_to(operating_income, shape)
+    other_income_expense = rate(other_income_expense)
+
+    # float64, or complex when differentiated by complex step (sensitivity.py)
+    dtype = np.result_type(
+        operating_income,
+        unlevered_cash_flow,
+        scheduled_interest,
+        revolver_rate,
+        cash_rate,
+        tax_rate,
+        minimum_cash,
+        other_income_expense,
+    )
+    cash_flow_before_revolver = np.empty(shape, dtype)
+    revolver_beginning = np.empty(shape, dtype)
+    revolver_drawdown = np.empty(shape, dtype)
+    revolver_ending = np.empty(shape, dtype)
+    interest_expense = np.empty(shape, dtype)
+    interest_income = np.empty(shape, dtype)
+    ending_cash = np.empty(shape, dtype)
+    iterations = np.zeros(n_periods, dtype=np.int64)
+    converged = np.ones(n_scenarios, dtype=bool)
+    max_residual = np.zeros(n_scenarios)
+
+    cash = rate(opening["cash"])
+    revolver = rate(opening["revolver"])
+    for t in range(n_periods):
+        # Start from interest on the beginning balances
+        expense = (revolver_rate * revolver + scheduled_interest[:, t]).astype(dtype)
+        income = (cash_rate * cash).astype(dtype)
+        shortfall = np.empty(n_scenarios, dtype)
+        drawdown = np.empty(n_scenarios, dtype)
+        revolver_end = np.empty(n_scenarios, dtype)
+        cash_end = np.empty(n_scenarios, dtype)
+        residual = np.zeros(n_scenarios)
+        # Scenarios still iterating (all of them, as a slice, until the first
+        # converges); the others keep the balances of the pass they converged
+        # on, so a scenario's result does not depend on which scenarios share
+        # its batch
+        active = slice(None)
+        for iteration in range(1, max_iterations + 1):
+            pretax_income = (
+                operating_income[active, t]
+                - expense[active]
+                + income[active]
+                + other_income_expense[active]
+            )
+            net_income = pretax_income - pretax_income * tax_rate[active]
+            available_cash = (
+                cash[active]
+                + net_income
+                + unlevered_cash_flow[active, t]
+                - scheduled_repayment[active, t]
+            )
+            shortfall[active] = available_cash - minimum_cash[active]
+            drawdown[active] = np.maximum(-shortfall[active], -revolver[active])
+            revolver_end[active] = revolver[active] + drawdown[active]
+            cash_end[active] = available_cash + drawdown[active]
+            new_expense = (
+                revolver_rate[active] * (revolver[active] + revolver_end[active]) / 2
+                + scheduled_interest[active, t]
+            )
+            new_income = cash_rate[active] * (cash[active] + cash_end[active]) / 2
+            residual[active] = np.maximum(
+                np.abs(new_expense - expense[active]), np.abs(new_income - income[active])
+            )
+            # Keep the interest the balances were computed with, so that net
+            # income and cash stay consistent with each other
+            moving = residual[active] > tolerance
+            if not moving.any() or iteration == max_iterations:
+                break
+            if not moving.all():
+                active = (
+                    np.flatnonzero(moving)
+                    if isinstance(active, slice)
+                    else active[moving]
+                )
+                new_expense, new_income = new_expense[moving], new_income[moving]
+            expense[active] = new_expense
+            income[active] = new_income
+        iterations[t] = iteration
+        converged &= residual <= tolerance
+        np.maximum(max_residual, residual, out=max_residual)
+
+        cash_flow_before_revolver[:, t] = shortfall
+        revolver_beginning[:, t] = revolver
+        revolver_drawdown[:, t] = drawdown
+        revolver_ending[:, t] = revolver_end
+        interest_expense[:, t] = expense
+        interest_income[:, t] = income
+        ending_cash[:, t] = cash_end
+        cash, revolver = cash_end, revolver_end
+
+    return DebtScheduleSolution(
+        cash_flow_before_revolver=cash_flow_before_revolver,
+        revolver_beginning=revolver_beginning,
+        revolver_drawdown=revolver_drawdown,
+        revolver_ending=revolver_ending,
+        term_loan_beginning=term_loan_beginning,
+        term_loan_ending=term_loan_ending,
+        unsecured_debt_beginning=unsecured_debt_beginning,
+        unsecured_debt_ending=unsecured_debt_ending,
+        interest_expense=interest_expense,
+        interest_income=interest_income,
+        ending_cash=ending_cash,
+        iterations=iterations,
+        converged=converged,
+        max_residual=max_residual,
+    )
+
+
+def _previous(ending, opening):
+    # Beginning balances: the opening balance (scalar or one per scenario),
+    # then the prior period's ending
+    beginning = np.empty(ending.shape, ending.dtype)
+    beginning[:, 0] = np.reshape(opening, -1)
+    beginning[:, 1:] = ending[:, :-1]
+    return beginning
@@ -0,0 +1,290 @@
+'''
+Bulk export of projected statements. Projections - one ScenarioProjection or
+PortfolioProjection, or an iterable of them such as stream_portfolio() - are
+written batch by batch as they arrive, so nothing is concatenated in memory
+first:
+
+    report = export_parquet(stream_portfolio("universe.csv", assumptions), "out")
+    export_excel(project_scenarios(assumption_sets, historical_data), "out.xlsx")
+    report.rows_per_second, report.megabytes_per_second, report.peak_memory
+
+export_parquet() writes one dataset per statement, out/<statement>/part-NNNNN
+.parquet, each batch a row group of the current part file; a new part starts
+after rows_per_file rows. pd.read_parquet("out/income_statement") reads a
+statement back. export_excel() writes a workbook with one sheet per statement,
+laid out like historical_data.csv (a row per period, a column per line item)
+with the company or scenario in the first column; a sheet that reaches Excel's
+row limit continues on "<sheet> 2", "<sheet> 3", ...
+
+Rows are built from the projection arrays directly, without DataFrames.
+Amounts of numeric="fixed" projections are written in currency units, like
+to_frame() returns them.
+Scenarios are numbered across batches. pyarrow (Parquet) and openpyxl (Excel)
+are optional dependencies, imported when an export starts:
+pip install "financial-model[export]".
+'''
+
+import importlib
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .portfolio import COMPANY_COLUMN
+from .scenario_engine import STATEMENT_ITEMS
+
+STATEMENTS = ("income_statement", "balance_sheet", "cash_flow")
+SHEET_NAMES = {
+    "income_statement": "Income Statement",
+    "balance_sheet": "Balance Sheet",
+    "cash_flow": "Cash Flow",
+}
+SCENARIO_COLUMN = "Scenario"
+ROWS_PER_FILE = 5_000_000
+COMPRESSION = "snappy"
+# Rows per Excel sheet, the header included
+EXCEL_MAX_ROWS = 1_048_576
+
+
+class ExportReport:
+    # Rows, batches and bytes written by one export. seconds is its
+    # wall-clock time, write_seconds the part spent writing (the rest went to
+    # producing the projections); the throughputs are per write second.
+    # peak_memory is the peak resident set size of the process in bytes
+    # (None where the resource module is missing); peak_batch_bytes is the
+    # largest batch held in memory at once.
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.batches = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+        self.write_seconds = 0.0
+        self.peak_batch_bytes = 0
+        self.peak_memory = None
+
+    def __repr__(self):
+        return (
+            f"<ExportReport {self.path}: {self.rows:,} rows in {self.batches} batches, "
+            f"{self.seconds:.2f} s ({self.write_seconds:.2f} s writing), "
+            f"{self.rows_per_second:,.0f} rows/s, "
+            f"{self.megabytes_per_second:.1f} MB/s>"
+        )
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.write_seconds if self.write_seconds else float("nan")
+
+    @property
+    def megabytes_per_second(self):
+        if not self.write_seconds:
+            return float("nan")
+        return self.bytes_written / 2**20 / self.write_seconds
+
+    def to_frame(self):
+        return pd.DataFrame(
+            {
+                "Rows": [self.rows],
+                "Batches": [self.batches],
+                "Seconds": [self.seconds],
+                "Write Seconds": [self.write_seconds],
+                "Rows/s": [self.rows_per_second],
+                "MB Written": [self.bytes_written / 2**20],
+                "MB/s": [self.megabytes_per_second],
+                "Peak Batch MB": [self.peak_batch_bytes / 2**20],
+                "Peak Memory MB": [
+                    None if self.peak_memory is None else self.peak_memory / 2**20
+                ],
+            }
+        )
+
+    def _batches(self, projections):
+        # _Batch of every projection (a single projection is one batch),
+        # timing everything but producing the projections
+        if hasattr(projections, "income_statement"):
+            projections = [projections]
+        first_scenario = 0
+        for projection in projections:
+            started = time.perf_counter()
+            batch = _Batch(projection, first_scenario)
+            first_scenario += projection.income_statement.shape[0]
+            yield batch
+            self.write_seconds += time.perf_counter() - started
+            self.batches += 1
+
+    def _finish(self, started, paths):
+        self.seconds = time.perf_counter() - started
+        self.bytes_written = sum(os.path.getsize(path) for path in paths)
+        self.peak_memory = _peak_memory()
+
+
+def export_parquet(
+    projections,
+    directory,
+    statements=STATEMENTS,
+    rows_per_file=ROWS_PER_FILE,
+    compression=COMPRESSION,
+):
+    # Write statements of projections to Parquet datasets under directory
+    pa, pq = _import("pyarrow", "pyarrow.parquet")
+    report = ExportReport(directory)
+    started = time.perf_counter()
+    writers = {}
+    # statement -> [part number, rows in the current part]
+    parts = {statement: [-1, rows_per_file] for statement in statements}
+    paths = []
+    try:
+        for batch in report._batches(projections):
+            for statement in statements:
+                table = pa.Table.from_arrays(
+                    [pa.array(column) for column in batch.columns(statement)],
+                    names=batch.names(statement),
+                )
+                part = parts[statement]
+                if part[1] >= rows_per_file:
+                    if statement in writers:
+                        writers.pop(statement).close()
+                    part[0] += 1
+                    part[1] = 0
+                    folder = os.path.join(directory, statement)
+                    os.makedirs(folder, exist_ok=True)
+                    paths.append(os.path.join(folder, f"part-{part[0]:05d}.parquet"))
+                    # Line items are nearly all distinct, so dictionary
+                    # encoding them only costs time; keys and periods repeat
+                    writers[statement] = pq.ParquetWriter(
+                        paths[-1],
+                        table.schema,
+                        compression=compression,
+                        use_dictionary=[batch.key_column, batch.label_column],
+                    )
+                writers[statement].write_table(table)
+                part[1] += table.num_rows
+                report.rows += table.num_rows
+                report.peak_batch_bytes = max(report.peak_batch_bytes, table.nbytes)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    report._finish(started, paths)
+    return report
+
+
+def export_excel(projections, path, statements=STATEMENTS):
+    # Write statements of projections to one workbook at path
+    (openpyxl,) = _import("openpyxl")
+    report = ExportReport(path)
+    started = time.perf_counter()
+    # Write-only mode streams rows to temporary files until save()
+    workbook = openpyxl.Workbook(write_only=True)
+    # statement -> [sheet, rows written, sheet number]
+    sheets = {}
+    for batch in report._batches(projections):
+        for statement in statements:
+            names = batch.names(statement)
+            if statement not in sheets:
+                sheet = workbook.create_sheet(SHEET_NAMES[statement])
+                sheet.append(names)
+                sheets[statement] = [sheet, 1, 1]
+            rows = batch.rows(statement)
+            start = 0
+            while start < len(rows):
+                sheet = sheets[statement]
+                if sheet[1] == EXCEL_MAX_ROWS:
+                    sheet[2] += 1
+                    sheet[0] = workbook.create_sheet(f"{SHEET_NAMES[statement]} {sheet[2]}")
+                    sheet[0].append(names)
+                    sheet[1] = 1
+                stop = min(len(rows), start + EXCEL_MAX_ROWS - sheet[1])
+                for row in rows[start:stop]:
+                    sheet[0].append(row)
+                sheet[1] += stop - start
+                start = stop
+            report.rows += len(rows)
+            report.peak_batch_bytes = max(
+                report.peak_batch_bytes, getattr(batch.projection, statement).nbytes
+            )
+    saving = time.perf_counter()
+    workbook.save(path)
+    report.write_seconds += time.perf_counter() - saving
+    report._finish(started, [path])
+    return report
+
+
+class _Batch:
+    # Row keys and line-item columns of one projection, in long format: one
+    # row per (company or scenario, period)
+    def __init__(self, projection, first_scenario):
+        self.projection = projection
+        n_rows, n_periods = projection.income_statement.shape[:2]
+        companies = getattr(projection, "companies", None)
+        if companies is not None:
+            self.key_column = COMPANY_COLUMN
+            self.keys = np.repeat(companies.to_numpy(), n_periods)
+            labels = {
+                year: _labels(projection.calendar.labels(int(year)))
+                for year in np.unique(projection.last_year)
+            }
+            self.periods = np.concatenate([labels[year] for year in projection.last_year])
+        else:
+            self.key_column = SCENARIO_COLUMN
+            self.keys = np.repeat(
+                np.arange(first_scenario, first_scenario + n_rows), n_periods
+            )
+            periods = projection.periods
+            if periods is None:
+                periods = np.arange(1, n_periods + 1)
+            self.periods = np.tile(_labels(periods), n_rows)
+        self.label_column = projection.label_column
+
+    def names(self, statement):
+        return [self.key_column, self.label_column, *STATEMENT_ITEMS[statement]]
+
+    def columns(self, statement):
+        # Key, period and one contiguous array per line item
+        values = self._values(statement)
+        values = np.ascontiguousarray(values.reshape(-1, values.shape[2]).T)
+        return [self.keys, self.periods, *values]
+
+    def rows(self, statement):
+        # Lists of [key, period, line items...] for row-wise writers
+        values = self._values(statement)
+        values = values.reshape(-1, values.shape[2]).tolist()
+        return [
+            [key, period, *row]
+            for key, period, row in zip(self.keys.tolist(), self.periods.tolist(), values)
+        ]
+
+    def _values(self, statement):
+        # Line items in currency units, also for numeric="fixed" projections
+        values = getattr(self.projection, statement)
+        if self.projection.scale:
+            values = values / self.projection.scale
+        return values
+
+
+def _labels(labels):
+    # Period labels as ints (annual) or strings such as "2024Q1"
+    if isinstance(labels, pd.PeriodIndex):
+        return labels.astype(str).to_numpy()
+    return np.asarray(labels)
+
+
+def _import(*names):
+    try:
+        return [importlib.import_module(name) for name in names]
+    except ImportError as error:
+        raise ImportError(
+            f"Exporting needs {error.name.split('.')[0]}: "
+            'pip install "financial-model[export]"'
+        ) from error
+
+
+def _peak_memory():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
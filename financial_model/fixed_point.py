@@ -0,0 +1,407 @@
+'''
+Fixed-point projections. project_inputs(..., numeric="fixed") - and
+project_scenarios() / project_portfolio() with numeric="fixed" - run the
+scenario engine's calculations on int64 arrays of amounts scaled by SCALE
+(cents), so subtotals and roll-forwards are exact integer arithmetic and no
+float residue such as 8.69704e-12 of cash can appear:
+
+    projection = project_scenarios(assumption_sets, historical_data, numeric="fixed")
+    projection.balance_sheet            # int64 cents
+    validate(projection, tolerance=0, relative_tolerance=0)
+
+Only the arithmetic is exact: the formulas are the float engine's, so the
+statements fail the same validation.KNOWN_FAILURES ("balance" and
+"depreciation") by the same amounts, in cents; every other check ties exactly.
+
+Every amount derived from a rate - a line item times a percentage, days over
+the day count, interest on average balances - is rounded to a whole cent once,
+by the rule ROUNDING gives its line item; everything built from those amounts
+is integer arithmetic. Revenue is compounded period by period on the rounded
+revenue before it. Interest is solved by the same fixed-point iteration as the
+float engine, in cents, until interest no longer changes by a single cent.
+
+Rates are read as the decimals they were written as: a scaled product within
+TIE_ULPS units in the last place of a half cent is rounded as the exact half
+cent it stands for (15 x 0.3 is 4.5, not 4.4999...).
+
+Scaled amounts must stay below 2**53 in magnitude (about 90 trillion at the
+default scale), where float64 intermediates still hold every cent exactly.
+to_frame() and to_long_frame() show amounts in currency units; to_float()
+turns a fixed-point projection into a float one.
+'''
+
+import copy
+
+import numpy as np
+
+from .debt_schedule import MAX_ITERATIONS, OPTIONAL_ASSUMPTIONS, _previous
+from .scenario_engine import STATEMENT_ITEMS, ScenarioProjection, _stack
+
+SCALE = 100
+ROUNDING_RULES = ("half_even", "half_up")
+# Rounding rule per line item; line items not listed round half to even
+ROUNDING = {
+    "Taxes": "half_up",
+}
+TIE_ULPS = 4
+LIMIT = 2.0**53
+
+# historical_inputs() balances, as opposed to flows rounded per period
+_BALANCES = (
+    "gross_ppe",
+    "accumulated_depreciation",
+    "goodwill",
+    "retained_earnings",
+    "beginning_cash",
+)
+
+
+def to_fixed(values, scale=SCALE, rule="half_even"):
+    # Amounts in currency units as int64 multiples of 1 / scale
+    return _round(np.multiply(values, scale), rule)
+
+
+def fixed_inputs(h, scale=SCALE):
+    # historical_inputs() / portfolio_inputs() values with the opening
+    # balances in int64 fixed point; flows stay in currency units
+    inputs = dict(h)
+    for key in _BALANCES:
+        inputs[key] = to_fixed(h[key], scale)
+    inputs["opening"] = {
+        key: to_fixed(value, scale) for key, value in h["opening"].items()
+    }
+    return inputs
+
+
+def to_float(projection):
+    # Copy of a fixed-point projection with float64 statements in currency
+    # units
+    if not projection.scale:
+        return projection
+    result = copy.copy(projection)
+    for statement in STATEMENT_ITEMS:
+        setattr(result, statement, getattr(projection, statement) / projection.scale)
+    result.scale = None
+    return result
+
+
+def project_fixed(
+    a, h, calendar, scale=SCALE, rounding=None, max_iterations=MAX_ITERATIONS
+):
+    # project_inputs() on int64 fixed-point amounts. rounding maps line
+    # items to rules, on top of ROUNDING.
+    rules = dict(ROUNDING, **(rounding or {}))
+    unknown = sorted(set(rules.values()) - set(ROUNDING_RULES))
+    if unknown:
+        raise ValueError(
+            f"Rounding rules must be one of {', '.join(ROUNDING_RULES)}, "
+            f"not {', '.join(map(repr, unknown))}"
+        )
+
+    def fixed(name, scaled):
+        return _round(scaled, rules.get(name, "half_even"))
+
+    def get(key):
+        return a.get(key, OPTIONAL_ASSUMPTIONS.get(key))
+
+    n_scenarios = a["Tax Rate"].shape[0]
+    shape = (n_scenarios, calendar.horizon)
+    per_period = calendar.per_period
+    opening = fixed_inputs(h, scale)
+
+    # Revenue compounds on the rounded revenue of the period before
+    growth_factor = _vector(calendar.growth_factor(a["Revenue Growth Rate"]), n_scenarios)
+    revenue = np.empty(shape, np.int64)
+    previous = _vector(fixed("Revenue", per_period(h["revenue"]) * scale), n_scenarios)
+    for t in range(calendar.horizon):
+        previous = revenue[:, t] = fixed("Revenue", previous * growth_factor)
+    cogs = fixed("Cost of Goods Sold (COGS)", revenue * a["COGS as % of Revenue"])
+    gross_profit = revenue - cogs
+    sga_expenses = fixed("SG&A Expenses", revenue * a["SG&A as % of Sales"])
+    operating_income = gross_profit - sga_expenses
+    other_income_expense = fixed(
+        "Other Income / (Expense)", per_period(h["other_income_expense"]) * scale
+    )
+    depreciation_amortization = fixed(
+        "Depreciation and Amortization",
+        per_period(h["depreciation_amortization"]) * scale,
+    )
+    capital_expenditures = fixed(
+        "Capital Expenditures", revenue * a["Capex as % of Sales"]
+    )
+    asset_disposition = fixed(
+        "Asset Disposition", per_period(a["Asset Disposition"]) * scale
+    )
+    cash_flow_from_investing = asset_disposition - capital_expenditures
+
+    # Debt schedule, as solve_debt_schedule() but in fixed point
+    elapsed = np.arange(1, calendar.horizon + 1)
+    term_loan_amortization = fixed(
+        "Term Loan Repayment", per_period(get("Term Loan Amortization")) * scale
+    )
+    unsecured_debt_amortization = fixed(
+        "Change in Unsecured Debt", per_period(get("Unsecured Debt Amortization")) * scale
+    )
+    term_loan_ending = np.broadcast_to(
+        np.maximum(opening["opening"]["term_loan"] - term_loan_amortization * elapsed, 0),
+        shape,
+    )
+    unsecured_debt_ending = np.broadcast_to(
+        np.maximum(
+            opening["opening"]["unsecured_debt"]
+            - unsecured_debt_amortization * elapsed,
+            0,
+        ),
+        shape,
+    )
+    term_loan_beginning = _previous(term_loan_ending, opening["opening"]["term_loan"])
+    unsecured_debt_beginning = _previous(
+        unsecured_debt_ending, opening["opening"]["unsecured_debt"]
+    )
+    # Each facility's interest is rounded, then the facilities are summed
+    scheduled_interest = fixed(
+        "Interest Expense",
+        per_period(get("LIBOR") + get("Term Loan"))
+        * (term_loan_beginning + term_loan_ending)
+        / 2,
+    ) + fixed(
+        "Interest Expense",
+        per_period(get("Unsecured Debt"))
+        * (unsecured_debt_beginning + unsecured_debt_ending)
+        / 2,
+    )
+    scheduled_repayment = (term_loan_beginning - term_loan_ending) + (
+        unsecured_debt_beginning - unsecured_debt_ending
+    )
+    unlevered_cash_flow = np.broadcast_to(
+        depreciation_amortization + cash_flow_from_investing, shape
+    )
+    revolver_rate = _vector(per_period(get("LIBOR") + get("Revolver")), n_scenarios)
+    cash_rate = _vector(per_period(get("Interest earned on cash")), n_scenarios)
+    tax_rate = _vector(get("Tax Rate"), n_scenarios)
+    minimum_cash = _vector(
+        fixed("Minimum Cash", get("Minimum Cash") * scale), n_scenarios
+    )
+    other_income = _vector(other_income_expense, n_scenarios)
+
+    cash_flow_before_revolver = np.empty(shape, np.int64)
+    revolver_beginning = np.empty(shape, np.int64)
+    revolver_drawdown = np.empty(shape, np.int64)
+    revolver_ending = np.empty(shape, np.int64)
+    interest_expense = np.empty(shape, np.int64)
+    interest_income = np.empty(shape, np.int64)
+    ending_cash = np.empty(shape, np.int64)
+    iterations = np.zeros(calendar.horizon, dtype=np.int64)
+    converged = np.ones(n_scenarios, dtype=bool)
+
+    cash = _vector(opening["opening"]["cash"], n_scenarios)
+    revolver = _vector(opening["opening"]["revolver"], n_scenarios)
+    for t in range(calendar.horizon):
+        # Start from interest on the beginning balances
+        expense = (
+            fixed("Interest Expense", revolver_rate * revolver) + scheduled_interest[:, t]
+        )
+        income = fixed("Interest Income", cash_rate * cash)
+        for iteration in range(1, max_iterations + 1):
+            pretax_income = operating_income[:, t] - expense + income + other_income
+            net_income = pretax_income - fixed("Taxes", pretax_income * tax_rate)
+            available_cash = (
+                cash + net_income + unlevered_cash_flow[:, t] - scheduled_repayment[:, t]
+            )
+            shortfall = available_cash - minimum_cash
+            drawdown = np.maximum(-shortfall, -revolver)
+            revolver_end = revolver + drawdown
+            cash_end = available_cash + drawdown
+            new_expense = (
+                fixed("Interest Expense", revolver_rate * (revolver + revolver_end) / 2)
+                + scheduled_interest[:, t]
+            )
+            new_income = fixed("Interest Income", cash_rate * (cash + cash_end) / 2)
+            # Converged once interest is unchanged to the cent
+            changed = (new_expense != expense) | (new_income != income)
+            if not changed.any():
+                break
+            expense, income = new_expense, new_income
+        iterations[t] = iteration
+        converged &= ~changed
+
+        cash_flow_before_revolver[:, t] = shortfall
+        revolver_beginning[:, t] = revolver
+        revolver_drawdown[:, t] = drawdown
+        revolver_ending[:, t] = revolver_end
+        interest_expense[:, t] = expense
+        interest_income[:, t] = income
+        ending_cash[:, t] = cash_end
+        cash, revolver = cash_end, revolver_end
+
+    debt_schedule = _stack(
+        shape,
+        cash_flow_before_revolver,
+        revolver_beginning,
+        revolver_drawdown,
+        revolver_ending,
+        term_loan_beginning,
+        term_loan_ending,
+        unsecured_debt_beginning,
+        unsecured_debt_ending,
+        interest_expense,
+        interest_income,
+        ending_cash,
+    )
+
+    # Taxes are rounded exactly as in the solve, so net income matches the
+    # net income the cash was rolled forward with
+    pretax_income = (
+        operating_income - interest_expense + interest_income + other_income_expense
+    )
+    net_income = pretax_income - fixed("Taxes", pretax_income * a["Tax Rate"])
+    income_statement = _stack(
+        shape,
+        revenue,
+        cogs,
+        gross_profit,
+        sga_expenses,
+        operating_income,
+        interest_expense,
+        interest_income,
+        net_income,
+    )
+
+    days = calendar.days_per_period
+    inventory = fixed("Inventory", (cogs / days) * a["Days Inventory"])
+    accounts_receivable = fixed(
+        "Accounts Receivable", (revenue / days) * a["Days Accounts Receivable"]
+    )
+    other_current_assets = fixed(
+        "Other Current Assets", a["Other Current Assets"] * scale
+    )
+    total_current_assets = (
+        ending_cash + inventory + accounts_receivable + other_current_assets
+    )
+    gross_ppe = opening["gross_ppe"] + np.cumsum(
+        capital_expenditures - asset_disposition, axis=1
+    )
+    depreciation = fixed(
+        "Depreciation", gross_ppe * per_period(a["Depreciation as % of Gross PP&E"])
+    )
+    accumulated_depreciation = opening["accumulated_depreciation"] + np.cumsum(
+        depreciation, axis=1
+    )
+    net_ppe = gross_ppe - accumulated_depreciation
+    goodwill = opening["goodwill"]
+    other_assets = fixed("Other Assets", a["Other Assets"] * scale)
+    total_assets = total_current_assets + net_ppe + goodwill + other_assets
+    accounts_payable = fixed("Accounts Payable", (cogs / days) * a["Days Payable"])
+    annual_cogs = calendar.annualized(cogs)
+    accrued_liabilities = fixed(
+        "Accrued Liabilities", annual_cogs * a["Accrued Liabilities as % of COGS"]
+    )
+    other_current_liabilities = fixed(
+        "Other Current Liabilities",
+        annual_cogs * a["Other Current Liabilities as % of COGS"],
+    )
+    total_current_liabilities = (
+        accounts_payable + accrued_liabilities + other_current_liabilities
+    )
+    total_liabilities = (
+        total_current_liabilities
+        + revolver_ending
+        + term_loan_ending
+        + unsecured_debt_ending
+        + fixed("Other Liabilities", a["Other Liabilities"] * scale)
+    )
+    retained_earnings = opening["retained_earnings"] + np.cumsum(net_income, axis=1)
+    common_stock = fixed("Common Stock", a["Common Stock"] * scale)
+    total_shareholders_equity = common_stock + retained_earnings
+    balance_sheet = _stack(
+        shape,
+        ending_cash,
+        inventory,
+        accounts_receivable,
+        other_current_assets,
+        total_current_assets,
+        gross_ppe,
+        accumulated_depreciation,
+        net_ppe,
+        goodwill,
+        other_assets,
+        total_assets,
+        accounts_payable,
+        accrued_liabilities,
+        other_current_liabilities,
+        total_current_liabilities,
+        revolver_ending,
+        term_loan_ending,
+        unsecured_debt_ending,
+        total_liabilities,
+        retained_earnings,
+        common_stock,
+        total_shareholders_equity,
+        total_liabilities + total_shareholders_equity,
+    )
+
+    cash_flow_from_operations = net_income + depreciation_amortization
+    change_in_unsecured_debt = unsecured_debt_ending - unsecured_debt_beginning
+    term_loan_repayment = term_loan_ending - term_loan_beginning
+    cash_flow_from_financing = (
+        change_in_unsecured_debt + term_loan_repayment + revolver_drawdown
+    )
+    net_cash_flow = (
+        cash_flow_from_operations + cash_flow_from_investing + cash_flow_from_financing
+    )
+    cash_flow = _stack(
+        shape,
+        cash_flow_from_operations,
+        -capital_expenditures,
+        asset_disposition,
+        cash_flow_from_investing,
+        change_in_unsecured_debt,
+        term_loan_repayment,
+        revolver_drawdown,
+        cash_flow_from_financing,
+        net_cash_flow,
+        opening["beginning_cash"] + np.cumsum(net_cash_flow, axis=1),
+    )
+
+    projection = ScenarioProjection(
+        None,
+        calendar.label_column,
+        income_statement,
+        balance_sheet,
+        cash_flow,
+        debt_schedule,
+        iterations,
+        converged,
+        calendar,
+    )
+    projection.scale = scale
+    return projection
+
+
+def _vector(value, n_scenarios):
+    # Scalar or (scenarios x 1) value as a (scenarios,) vector
+    return np.broadcast_to(np.reshape(value, -1), (n_scenarios,))
+
+
+def _round(scaled, rule):
+    # Scaled amounts rounded to int64 by rule. Within TIE_ULPS units in the
+    # last place of a half, a value counts as the exact half.
+    scaled = np.asarray(scaled, dtype=np.float64)
+    magnitude = np.abs(scaled)
+    if not magnitude.max(initial=0.0) < LIMIT:
+        raise ValueError(
+            "Fixed-point amounts must be finite and below 2**53 in magnitude once scaled"
+        )
+    rounded = np.rint(scaled, out=np.empty_like(scaled))
+    # Halves are rare, so only they are looked at again
+    magnitude *= TIE_ULPS * 2.0**-52
+    magnitude += np.abs(scaled - rounded)
+    halves = magnitude >= 0.5
+    if halves.any():
+        below = np.floor(scaled[halves])
+        if rule == "half_even":
+            rounded[halves] = below + (np.fmod(below, 2) != 0)
+        else:
+            # half_up rounds halves away from zero
+            rounded[halves] = below + (below >= 0)
+    return rounded.astype(np.int64)
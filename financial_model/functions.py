@@ -115,7 +115,7 @@ def calculate_changes_in_working_capital(ar_turnover_days, inventory_turnover_da
     changes_in_ar = [-(a / 360) * r for a, r in zip(ar_turnover_days, revenue)]
     changes_in_inventory = [-(i / 360) * r for i, r in zip(inventory_turnover_days, revenue)]
     changes_in_ap = [(p / 360) * c for p, c in zip(days_payable, cogs)]
-    changes_in_other_current_assets = [0] * num_years
+    changes_in_other_current_assets = [0] * len(revenue)
     changes_in_other_current_liabilities = [l * cogs[i] for i, l in enumerate(other_current_liabilities)]
     
     working_capital_changes = [a + i + ap + oca + occl for a, i, ap, oca, occl in zip(
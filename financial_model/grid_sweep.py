@@ -0,0 +1,273 @@
+'''
+Parallel sweep of a Cartesian grid of assumptions. Every combination of the
+given values is projected with the vectorized scenario engine, in chunks
+spread across worker processes, and selected line items are written straight
+into memory-mapped .npy files in the output directory - nothing but chunk
+bounds goes back to the parent:
+
+    result = sweep(
+        {"Revenue Growth Rate": np.linspace(0.0, 0.1, 100),
+         "Tax Rate": np.linspace(0.2, 0.4, 100),
+         "LIBOR": np.linspace(0.0, 0.05, 1000)},
+        base_assumptions, historical_data, "stress_sweep",
+    )
+    result.line_item("income_statement", "Net Income")  # (combinations x periods)
+    result.to_frame(slice(0, 10))    # assumptions and line items of rows 0-9
+    open_sweep("stress_sweep")       # the same result, later
+
+Combination i is the i-th of the product in C order (the last key changes
+fastest); its assumption values are derived from i, so the grid is never
+materialized. The directory holds:
+
+    sweep.json      grid, line items, calendar and input fingerprints
+    values.npy      (combinations x line items x periods)
+    converged.npy   debt schedule convergence per combination
+    completed.npy   one flag per chunk
+
+A chunk's flag is set by the parent after the worker has flushed its rows, so
+a sweep interrupted at any point and run again with the same arguments skips
+the completed chunks; a directory holding a different sweep raises ValueError
+instead (resume=False starts over). Memory is bounded by chunk_size rows per
+worker and 2 chunks in flight per worker, whatever the grid size.
+'''
+
+import json
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .monte_carlo import DEFAULT_METRICS
+from .periods import ProjectionCalendar
+from .result_cache import data_fingerprint
+from .scenario_engine import (
+    ASSUMPTION_KEYS,
+    assumption_table,
+    historical_inputs,
+    project_inputs,
+)
+
+CHUNK_SIZE = 25_000
+# Chunks submitted ahead per worker
+IN_FLIGHT = 2
+MANIFEST = "sweep.json"
+VALUES = "values.npy"
+CONVERGED = "converged.npy"
+COMPLETED = "completed.npy"
+# Bump when the layout of the directory changes
+FORMAT_VERSION = 1
+
+
+class SweepResult:
+    # Memory-mapped results of a sweep directory. values[i, m, t] is line item
+    # metrics[m], a (statement, name) pair, in period t of combination i.
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST)) as file:
+            manifest = json.load(file)
+        self.keys = manifest["keys"]
+        self.grid = {
+            key: np.array(values, dtype=np.float64)
+            for key, values in zip(manifest["keys"], manifest["values"])
+        }
+        self.metrics = [tuple(metric) for metric in manifest["metrics"]]
+        self.periods = manifest["periods"]
+        self.label_column = manifest["label_column"]
+        self.chunk_size = manifest["chunk_size"]
+        self.shape = tuple(len(values) for values in self.grid.values())
+        self.values = np.load(os.path.join(directory, VALUES), mmap_mode="r")
+        self.converged = np.load(os.path.join(directory, CONVERGED), mmap_mode="r")
+        self.completed = np.load(os.path.join(directory, COMPLETED), mmap_mode="r")
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    @property
+    def done(self):
+        return bool(self.completed.all())
+
+    def line_item(self, statement, name):
+        # (combinations x periods) view of one line item
+        if (statement, name) not in self.metrics:
+            raise KeyError(f"{name!r} of {statement!r} was not swept")
+        return self.values[:, self.metrics.index((statement, name))]
+
+    def assumptions(self, rows):
+        # Grid values of the combinations in rows (indices or a slice)
+        rows = np.arange(len(self))[rows] if isinstance(rows, slice) else np.asarray(rows)
+        return pd.DataFrame(_combinations(self.grid, rows))
+
+    def to_frame(self, rows):
+        # One row per (combination, period) of rows: the combination index,
+        # its grid values, the period label and the line items, named
+        # "statement: name" where a name is swept from more than one statement
+        rows = np.arange(len(self))[rows] if isinstance(rows, slice) else np.asarray(rows)
+        n_periods = len(self.periods)
+        frame = self.assumptions(rows).loc[np.repeat(np.arange(len(rows)), n_periods)]
+        frame.insert(0, "Combination", np.repeat(rows, n_periods))
+        frame[self.label_column] = np.tile(self.periods, len(rows))
+        values = self.values[rows]
+        names = [name for _, name in self.metrics]
+        for m, (statement, name) in enumerate(self.metrics):
+            column = f"{statement}: {name}" if names.count(name) > 1 else name
+            frame[column] = values[:, m].ravel()
+        return frame.reset_index(drop=True)
+
+
+def open_sweep(directory):
+    return SweepResult(directory)
+
+
+def sweep(
+    grid,
+    base_assumptions,
+    historical_data,
+    directory,
+    metrics=DEFAULT_METRICS,
+    chunk_size=CHUNK_SIZE,
+    max_workers=None,
+    resume=True,
+    horizon=5,
+    periodicity="annual",
+    day_count=365,
+    progress=None,
+):
+    # Project every combination of grid ({assumption key: values}; other
+    # keys from base_assumptions) into directory and return its SweepResult.
+    # Chunks of chunk_size combinations run on max_workers processes (1 runs
+    # in-process); progress(completed chunks, total chunks) is called after
+    # every chunk.
+    unknown = [key for key in grid if key not in ASSUMPTION_KEYS]
+    if unknown:
+        raise KeyError(f"Unknown assumptions: {', '.join(unknown)}")
+    grid = {key: np.asarray(values, dtype=np.float64).ravel() for key, values in grid.items()}
+    if not grid or any(len(values) == 0 for values in grid.values()):
+        raise ValueError("grid needs at least one value for at least one key")
+    base_assumptions = base_assumptions or {}
+    calendar = ProjectionCalendar(horizon, periodicity, day_count)
+    h = historical_inputs(historical_data)
+    n_combinations = math.prod(len(values) for values in grid.values())
+    n_chunks = math.ceil(n_combinations / chunk_size)
+    manifest = {
+        "version": FORMAT_VERSION,
+        "keys": list(grid),
+        "values": [values.tolist() for values in grid.values()],
+        "metrics": [list(metric) for metric in metrics],
+        "base_assumptions": {
+            key: base_assumptions[key] for key in sorted(base_assumptions) if key not in grid
+        },
+        "data": data_fingerprint(historical_data),
+        "calendar": [horizon, periodicity, day_count],
+        "chunk_size": chunk_size,
+        "periods": [
+            label if isinstance(label, int) else str(label)
+            for label in calendar.labels(h["last_year"]).tolist()
+        ],
+        "label_column": calendar.label_column,
+    }
+    _prepare(directory, manifest, n_combinations, n_chunks, len(metrics), resume)
+
+    completed = np.load(os.path.join(directory, COMPLETED), mmap_mode="r+")
+    chunks = (
+        (
+            directory,
+            chunk,
+            chunk * chunk_size,
+            min((chunk + 1) * chunk_size, n_combinations),
+            grid,
+            manifest["base_assumptions"],
+            h,
+            (horizon, periodicity, day_count),
+            metrics,
+        )
+        for chunk in np.flatnonzero(~completed)
+    )
+    n_done = int(completed.sum())
+
+    def finished(chunk):
+        nonlocal n_done
+        completed[chunk] = True
+        completed.flush()
+        n_done += 1
+        if progress is not None:
+            progress(n_done, n_chunks)
+
+    if max_workers == 1:
+        for chunk in chunks:
+            finished(_run_chunk(chunk))
+    else:
+        limit = IN_FLIGHT * (max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Submit lazily so at most IN_FLIGHT chunks per worker are queued
+            pending = set()
+            try:
+                for chunk in chunks:
+                    if len(pending) >= limit:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finished(future.result())
+                    pending.add(executor.submit(_run_chunk, chunk))
+                for future in wait(pending).done:
+                    finished(future.result())
+            except BaseException:
+                # Drop the queued chunks; they run again on resume
+                for future in pending:
+                    future.cancel()
+                raise
+    del completed
+    return SweepResult(directory)
+
+
+def _prepare(directory, manifest, n_combinations, n_chunks, n_metrics, resume):
+    # Reuse the files of the same sweep, or (re)create them
+    path = os.path.join(directory, MANIFEST)
+    if resume and os.path.exists(path):
+        with open(path) as file:
+            if json.load(file) == manifest:
+                return
+        raise ValueError(
+            f"{directory} holds a different sweep; use another directory or resume=False"
+        )
+    os.makedirs(directory, exist_ok=True)
+    # Written as sparse files; rows take disk space as chunks complete
+    shape = (n_combinations, n_metrics, len(manifest["periods"]))
+    for name, dtype, file_shape in (
+        (VALUES, np.float64, shape),
+        (CONVERGED, np.bool_, (n_combinations,)),
+        (COMPLETED, np.bool_, (n_chunks,)),
+    ):
+        array = np.lib.format.open_memmap(
+            os.path.join(directory, name), mode="w+", dtype=dtype, shape=file_shape
+        )
+        array.flush()
+        del array
+    # The manifest goes last: a directory without one is started over
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(manifest, file)
+    os.replace(temporary, path)
+
+
+def _combinations(grid, rows):
+    # {key: values} of the combinations numbered rows, in C order
+    indices = np.unravel_index(rows, tuple(len(values) for values in grid.values()))
+    return {key: values[index] for (key, values), index in zip(grid.items(), indices)}
+
+
+def _run_chunk(chunk):
+    # Project combinations start:stop and write them into the output files
+    directory, index, start, stop, grid, base_assumptions, h, calendar, metrics = chunk
+    table = assumption_table(_combinations(grid, np.arange(start, stop)), base_assumptions)
+    a = {key: values[:, None] for key, values in table.items()}
+    projection = project_inputs(a, h, ProjectionCalendar(*calendar))
+
+    values = np.load(os.path.join(directory, VALUES), mmap_mode="r+")
+    for m, (statement, name) in enumerate(metrics):
+        values[start:stop, m] = projection.line_item(statement, name)
+    values.flush()
+    converged = np.load(os.path.join(directory, CONVERGED), mmap_mode="r+")
+    converged[start:stop] = projection.converged
+    converged.flush()
+    return index
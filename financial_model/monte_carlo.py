@@ -0,0 +1,300 @@
+'''
+Monte Carlo simulation of the three-statement projection. Assumptions are drawn
+from user-specified distributions, projected in batches with the vectorized
+scenario engine and reduced on the fly to streaming summaries (mean, standard
+deviation, min / max and histogram-based percentiles), so memory stays flat no
+matter how many draws are run.
+
+Draws are split into shards, each seeded from its own child of one
+numpy SeedSequence, and shards can run across a ProcessPoolExecutor. Results
+depend only on the seed and the shard size, not on the number of workers.
+'''
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .scenario_engine import project_scenarios
+
+
+# Line items reduced by default: (statement, line item)
+DEFAULT_METRICS = (
+    ("income_statement", "Net Income"),
+    ("cash_flow", "Ending Cash Position"),
+    ("balance_sheet", "Total Assets"),
+)
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Historical column sampled by ("empirical",) when no column is given
+EMPIRICAL_COLUMNS = {
+    "Revenue Growth Rate": "% Growth",
+    "COGS as % of Revenue": "COGS as % of Revenue",
+    "SG&A as % of Sales": "SG&A as % of Revenue",
+    "Tax Rate": "Tax Rate",
+}
+
+PILOT_DRAWS = 10_000
+HISTOGRAM_BINS = 4096
+
+
+class StreamingSummary:
+    # Mergeable running statistics of one line item, per projected period.
+    # Percentiles come from a fixed-edge histogram: values between the edges
+    # resolve to (high - low) / bins, values outside them fall into two tail
+    # bins bounded by the running min / max.
+    def __init__(self, low, high, bins=HISTOGRAM_BINS):
+        self.low = np.asarray(low, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.bins = bins
+        n_periods = self.low.shape[0]
+        self.count = 0
+        self.mean = np.zeros(n_periods)
+        self.m2 = np.zeros(n_periods)
+        self.min = np.full(n_periods, np.inf)
+        self.max = np.full(n_periods, -np.inf)
+        self.histogram = np.zeros((n_periods, bins + 2), dtype=np.int64)
+
+    def update(self, values):
+        # Fold a (draws x periods) batch into the summary
+        n = values.shape[0]
+        if n == 0:
+            return
+        batch_mean = values.mean(axis=0)
+        batch_m2 = ((values - batch_mean) ** 2).sum(axis=0)
+        self._combine(n, batch_mean, batch_m2)
+        np.minimum(self.min, values.min(axis=0), out=self.min)
+        np.maximum(self.max, values.max(axis=0), out=self.max)
+
+        n_periods = values.shape[1]
+        width = (self.high - self.low) / self.bins
+        index = np.floor((values - self.low) / width).astype(np.int64) + 1
+        np.clip(index, 0, self.bins + 1, out=index)
+        index += np.arange(n_periods) * (self.bins + 2)
+        counts = np.bincount(index.ravel(), minlength=n_periods * (self.bins + 2))
+        self.histogram += counts.reshape(n_periods, self.bins + 2)
+
+    def merge(self, other):
+        # Fold another summary built on the same histogram edges into this one
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+            np.minimum(self.min, other.min, out=self.min)
+            np.maximum(self.max, other.max, out=self.max)
+            self.histogram += other.histogram
+        return self
+
+    def _combine(self, n, mean, m2):
+        # Chan et al. parallel update of the running mean and squared deviations
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta**2 * (self.count * n / total)
+        self.count = total
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return np.sqrt(self.m2 / (self.count - 1))
+
+    def percentile(self, q):
+        # Approximate q-th percentile (0-100) per period
+        result = np.full(self.low.shape[0], np.nan)
+        if self.count == 0:
+            return result
+        rank = q / 100 * self.count
+        width = (self.high - self.low) / self.bins
+        for period, counts in enumerate(self.histogram):
+            cumulative = np.cumsum(counts)
+            b = min(int(np.searchsorted(cumulative, rank)), self.bins + 1)
+            if b == 0:
+                left, right = self.min[period], self.low[period]
+            elif b == self.bins + 1:
+                left, right = self.high[period], self.max[period]
+            else:
+                left = self.low[period] + (b - 1) * width[period]
+                right = left + width[period]
+            below = cumulative[b] - counts[b]
+            fraction = (rank - below) / counts[b] if counts[b] else 0.0
+            value = left + fraction * (right - left)
+            result[period] = min(max(value, self.min[period]), self.max[period])
+        return result
+
+
+class SimulationResult:
+    # Streaming summaries of a simulation, keyed by (statement, line item),
+    # since names such as Ending Cash Position appear in several statements
+    def __init__(
+        self,
+        n_draws,
+        periods,
+        label_column,
+        summaries,
+        percentiles=DEFAULT_PERCENTILES,
+    ):
+        self.n_draws = n_draws
+        self.periods = periods
+        self.label_column = label_column
+        self.summaries = summaries
+        self.percentiles = percentiles
+
+    def to_frame(self):
+        # One row per (statement, line item, period) with mean, std, min,
+        # percentiles and max
+        frames = []
+        for (statement, name), summary in self.summaries.items():
+            frame = pd.DataFrame(
+                {
+                    "Statement": statement,
+                    "Line Item": name,
+                    self.label_column: self.periods,
+                    "Mean": summary.mean,
+                    "Std": summary.std,
+                    "Min": summary.min,
+                }
+            )
+            for q in self.percentiles:
+                frame[f"P{q:g}"] = summary.percentile(q)
+            frame["Max"] = summary.max
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+
+def sample_assumptions(distributions, n_draws, rng, historical_data=None):
+    # Draw n_draws values for every key in distributions. Supported specs:
+    #   ("normal", mean, std)
+    #   ("triangular", low, mode, high)
+    #   ("uniform", low, high)
+    #   ("empirical",) or ("empirical", column) - resample a historical column
+    samples = {}
+    for key, spec in distributions.items():
+        kind, *params = spec
+        if kind == "normal":
+            samples[key] = rng.normal(params[0], params[1], n_draws)
+        elif kind == "triangular":
+            samples[key] = rng.triangular(params[0], params[1], params[2], n_draws)
+        elif kind == "uniform":
+            samples[key] = rng.uniform(params[0], params[1], n_draws)
+        elif kind == "empirical":
+            if historical_data is None:
+                raise ValueError(f"{key}: empirical sampling needs historical_data")
+            column = params[0] if params else EMPIRICAL_COLUMNS[key]
+            observed = historical_data[column].dropna().to_numpy(dtype=np.float64)
+            samples[key] = rng.choice(observed, n_draws)
+        else:
+            raise ValueError(f"{key}: unknown distribution {kind!r}")
+    return pd.DataFrame(samples)
+
+
+def simulate(
+    distributions,
+    base_assumptions,
+    historical_data,
+    n_draws,
+    seed=0,
+    metrics=DEFAULT_METRICS,
+    percentiles=DEFAULT_PERCENTILES,
+    shard_size=1_000_000,
+    batch_size=100_000,
+    max_workers=None,
+    horizon=5,
+    periodicity="annual",
+    day_count=365,
+):
+    # Run n_draws projections and return their SimulationResult. Shards of
+    # shard_size draws run on max_workers processes (1 runs in-process);
+    # each shard projects batch_size draws at a time.
+    calendar = {"horizon": horizon, "periodicity": periodicity, "day_count": day_count}
+    n_shards = max(1, math.ceil(n_draws / shard_size))
+    pilot_seed, *shard_seeds = np.random.SeedSequence(seed).spawn(n_shards + 1)
+    periods, label_column, edges = _pilot(
+        distributions,
+        base_assumptions,
+        historical_data,
+        calendar,
+        metrics,
+        np.random.default_rng(pilot_seed),
+        min(n_draws, PILOT_DRAWS),
+    )
+    shards = [
+        (
+            shard_seed,
+            min(shard_size, n_draws - i * shard_size),
+            distributions,
+            base_assumptions,
+            historical_data,
+            calendar,
+            metrics,
+            edges,
+            batch_size,
+        )
+        for i, shard_seed in enumerate(shard_seeds)
+    ]
+
+    if max_workers == 1 or n_shards == 1:
+        results = map(_run_shard, shards)
+        summaries = _merge_shards(results)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            summaries = _merge_shards(executor.map(_run_shard, shards))
+
+    return SimulationResult(n_draws, periods, label_column, summaries, percentiles)
+
+
+def _pilot(
+    distributions, base_assumptions, historical_data, calendar, metrics, rng, n_draws
+):
+    # Project a pilot batch to get the projected periods and fix the histogram
+    # edges of every metric, padded by half the observed range on each side
+    samples = sample_assumptions(distributions, max(n_draws, 1), rng, historical_data)
+    projection = project_scenarios(
+        samples, historical_data, base_assumptions, **calendar
+    )
+    edges = {}
+    for statement, name in metrics:
+        values = projection.line_item(statement, name)
+        low, high = values.min(axis=0), values.max(axis=0)
+        pad = np.maximum((high - low) / 2, np.maximum(np.abs(high), 1.0) * 1e-6)
+        edges[statement, name] = (low - pad, high + pad)
+    return projection.periods, projection.label_column, edges
+
+
+def _run_shard(shard):
+    # Project one shard batch by batch, keeping only the running summaries
+    (
+        seed,
+        n_draws,
+        distributions,
+        base_assumptions,
+        historical_data,
+        calendar,
+        metrics,
+        edges,
+        batch_size,
+    ) = shard
+    rng = np.random.default_rng(seed)
+    summaries = {metric: StreamingSummary(*edges[metric]) for metric in metrics}
+    for start in range(0, n_draws, batch_size):
+        samples = sample_assumptions(
+            distributions, min(batch_size, n_draws - start), rng, historical_data
+        )
+        projection = project_scenarios(
+            samples, historical_data, base_assumptions, **calendar
+        )
+        for statement, name in metrics:
+            summaries[statement, name].update(projection.line_item(statement, name))
+    return summaries
+
+
+def _merge_shards(results):
+    # Merge shard summaries in shard order so the result is deterministic
+    merged = None
+    for summaries in results:
+        if merged is None:
+            merged = summaries
+        else:
+            for metric, summary in summaries.items():
+                merged[metric].merge(summary)
+    return merged
@@ -0,0 +1,79 @@
+'''
+Projection horizon and periodicity. A ProjectionCalendar fixes how many periods
+are projected, how many of them make up a year and which day-count basis the
+working-capital "days" assumptions use, and converts the annual assumptions and
+historical flows to per-period values.
+'''
+
+import numpy as np
+import pandas as pd
+
+
+PERIODS_PER_YEAR = {"annual": 1, "quarterly": 4, "monthly": 12}
+
+DAY_COUNTS = (365, 360)
+
+_PERIOD_FREQUENCIES = {"quarterly": "Q", "monthly": "M"}
+
+
+class ProjectionCalendar:
+    def __init__(self, horizon=5, periodicity="annual", day_count=365):
+        if periodicity not in PERIODS_PER_YEAR:
+            raise ValueError(
+                f"periodicity must be one of {', '.join(PERIODS_PER_YEAR)}, "
+                f"not {periodicity!r}"
+            )
+        if day_count not in DAY_COUNTS:
+            raise ValueError(f"day_count must be 365 or 360, not {day_count!r}")
+        if int(horizon) < 1:
+            raise ValueError(f"horizon must be at least one period, not {horizon!r}")
+        self.horizon = int(horizon)
+        self.periodicity = periodicity
+        self.day_count = day_count
+        self.periods_per_year = PERIODS_PER_YEAR[periodicity]
+
+    def __repr__(self):
+        return (
+            f"ProjectionCalendar(horizon={self.horizon}, "
+            f"periodicity={self.periodicity!r}, day_count={self.day_count})"
+        )
+
+    @property
+    def days_per_period(self):
+        # Day-count days in one period, e.g. 365 / 12 for monthly on 365
+        return self.day_count / self.periods_per_year
+
+    @property
+    def label_column(self):
+        # "Year" for annual projections, "Period" otherwise
+        return "Year" if self.periodicity == "annual" else "Period"
+
+    def labels(self, last_year):
+        # Labels of the projected periods following the last historical year
+        if self.periodicity == "annual":
+            return last_year + np.arange(1, self.horizon + 1)
+        return pd.period_range(
+            start=pd.Period(year=last_year + 1, month=1, freq="M").asfreq(
+                _PERIOD_FREQUENCIES[self.periodicity]
+            ),
+            periods=self.horizon,
+            freq=_PERIOD_FREQUENCIES[self.periodicity],
+        )
+
+    def growth_factor(self, annual_growth_rate):
+        # Per-period growth factor compounding to the annual rate
+        if self.periods_per_year == 1:
+            return 1 + annual_growth_rate
+        return (1 + annual_growth_rate) ** (1 / self.periods_per_year)
+
+    def per_period(self, annual_amount):
+        # Split an annual flow or rate evenly across the periods of a year
+        if self.periods_per_year == 1:
+            return annual_amount
+        return annual_amount / self.periods_per_year
+
+    def annualized(self, period_amount):
+        # Scale a per-period flow back up to a yearly run rate
+        if self.periods_per_year == 1:
+            return period_amount
+        return period_amount * self.periods_per_year
@@ -0,0 +1,276 @@
+'''
+Portfolio mode: projects every company of a coverage universe in one vectorized
+pass. Historical data comes as a long-format table with one row per
+(company, year) and the same columns as historical_data.csv; assumptions come
+as a table with one row per company. Each company is a row of the scenario
+engine, so the numbers match project_scenarios() run company by company.
+
+Companies can be split into shards and projected across a
+ProcessPoolExecutor; shards are concatenated back in company order.
+
+When new actuals land for some companies, PortfolioProjection.roll_forward()
+moves just those companies' projection window on by re-projecting their rows,
+so an update costs time in proportion to the companies that reported.
+'''
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .periods import ProjectionCalendar
+from .scenario_engine import STATEMENT_ITEMS, assumption_table, project_inputs
+
+COMPANY_COLUMN = "Company"
+
+# historical_inputs() keys and the historical column each one is read from
+_HISTORICAL_COLUMNS = {
+    "revenue": "Revenue",
+    "other_income_expense": "Other Income / (Expense)",
+    "gross_ppe": "Gross PP&E",
+    "accumulated_depreciation": "Accumulated Depreciation",
+    "goodwill": "Goodwill",
+    "retained_earnings": "Retained Earnings",
+    "depreciation_amortization": "Depreciation and Amortization",
+    "beginning_cash": "Ending Cash Position",
+}
+
+_OPENING_COLUMNS = {
+    "cash": "Ending Cash Position",
+    "revolver": "Ending Revolver Balance",
+    "term_loan": "Term Loan Ending Balance",
+    "unsecured_debt": "Unsecured Debt Ending Balance",
+}
+
+
+class PortfolioProjection:
+    # Projected statements of every company. income_statement, balance_sheet,
+    # cash_flow and debt_schedule are (companies x periods x line items)
+    # arrays ordered like companies; last_year holds each company's last
+    # historical year, from which its period labels follow. assumptions and
+    # inputs are the (companies x 1) engine columns the projection was run
+    # from, kept for roll_forward(). scale is set for numeric="fixed"
+    # projections (int64 multiples of 1 / scale), None for float64 ones.
+    scale = None
+
+    def __init__(
+        self,
+        companies,
+        last_year,
+        calendar,
+        income_statement,
+        balance_sheet,
+        cash_flow,
+        debt_schedule,
+        iterations,
+        converged,
+        assumptions=None,
+        inputs=None,
+    ):
+        self.companies = companies
+        self.last_year = last_year
+        self.calendar = calendar
+        self.label_column = calendar.label_column
+        self.income_statement = income_statement
+        self.balance_sheet = balance_sheet
+        self.cash_flow = cash_flow
+        self.debt_schedule = debt_schedule
+        self.iterations = iterations
+        self.converged = converged
+        self.assumptions = assumptions
+        self.inputs = inputs
+
+    def __len__(self):
+        return len(self.companies)
+
+    def roll_forward(self, actuals, company_column=COMPANY_COLUMN):
+        # Take new actuals - long-format rows like the history, for any
+        # subset of companies - as their last historical period and
+        # re-project only those companies, in place. A company's window
+        # moves on to follow its new last year; the latest row per company
+        # counts. Returns the positions of the companies re-projected.
+        if self.inputs is None:
+            raise ValueError("Projection was not made by project_portfolio()")
+        reported, new_inputs = portfolio_inputs(actuals, company_column)
+        rows = self.companies.get_indexer(reported)
+        if (rows < 0).any():
+            unknown = reported[rows < 0]
+            raise KeyError(f"Not in the portfolio: {', '.join(map(str, unknown[:5]))}")
+        new_last_year = new_inputs.pop("last_year")
+        stale = new_last_year < self.last_year[rows]
+        if stale.any():
+            raise ValueError(
+                f"Actuals older than the history of "
+                f"{', '.join(map(str, reported[stale][:5]))}"
+            )
+        self.last_year[rows] = new_last_year
+        _put_rows(self.inputs, rows, new_inputs)
+
+        projection = project_inputs(
+            take_rows(self.assumptions, rows),
+            take_rows(self.inputs, rows),
+            self.calendar,
+            "fixed" if self.scale else "float",
+        )
+        for statement in STATEMENT_ITEMS:
+            getattr(self, statement)[rows] = getattr(projection, statement)
+        self.iterations = np.maximum(self.iterations, projection.iterations)
+        self.converged[rows] = projection.converged
+        return rows
+
+    def line_item(self, statement, name):
+        # (companies x periods) array of one line item
+        items = STATEMENT_ITEMS[statement]
+        return getattr(self, statement)[:, :, items.index(name)]
+
+    def to_frame(self, statement, company):
+        # One company's statement, laid out like calculate_all_line_items(),
+        # in currency units
+        index = self.companies.get_loc(company)
+        values = getattr(self, statement)[index]
+        if self.scale:
+            values = values / self.scale
+        frame = pd.DataFrame(values, columns=STATEMENT_ITEMS[statement])
+        frame.insert(
+            0, self.label_column, self.calendar.labels(int(self.last_year[index]))
+        )
+        return frame
+
+    def to_long_frame(self, statement):
+        # All companies in long format: one row per (company, period)
+        n_companies, n_periods, _ = getattr(self, statement).shape
+        labels = {
+            year: self.calendar.labels(int(year)) for year in np.unique(self.last_year)
+        }
+        values = getattr(self, statement).reshape(n_companies * n_periods, -1)
+        if self.scale:
+            values = values / self.scale
+        frame = pd.DataFrame(values, columns=STATEMENT_ITEMS[statement])
+        frame.insert(0, COMPANY_COLUMN, np.repeat(self.companies, n_periods))
+        frame.insert(
+            1,
+            self.label_column,
+            np.concatenate([labels[year] for year in self.last_year]),
+        )
+        return frame
+
+
+def portfolio_inputs(history, company_column=COMPANY_COLUMN):
+    # Last historical row of every company as (companies x 1) columns, keyed
+    # like scenario_engine.historical_inputs(); returns (companies, inputs)
+    last = history.sort_values(
+        [company_column, "Year"], kind="stable"
+    ).drop_duplicates(company_column, keep="last")
+
+    # Copies, so roll_forward() can write to them
+    def column(name):
+        return last[name].to_numpy(dtype=np.float64, copy=True)[:, None]
+
+    inputs = {key: column(name) for key, name in _HISTORICAL_COLUMNS.items()}
+    inputs["last_year"] = last["Year"].to_numpy(dtype=np.int64, copy=True)
+    inputs["opening"] = {key: column(name) for key, name in _OPENING_COLUMNS.items()}
+    return pd.Index(last[company_column]), inputs
+
+
+def project_portfolio(
+    history,
+    assumptions,
+    base_assumptions=None,
+    company_column=COMPANY_COLUMN,
+    shard_size=None,
+    max_workers=None,
+    horizon=5,
+    periodicity="annual",
+    day_count=365,
+    numeric="float",
+):
+    # Project every company of the long-format history table. assumptions
+    # has one row per company (company_column plus assumption columns);
+    # missing columns fall back to base_assumptions. With shard_size set,
+    # companies are projected shard_size at a time on max_workers processes
+    # (1 runs in-process). numeric="fixed" projects in int64 cents.
+    calendar = ProjectionCalendar(horizon, periodicity, day_count)
+    companies, inputs = portfolio_inputs(history, company_column)
+    assumptions = assumptions.set_index(company_column)
+    missing = companies.difference(assumptions.index)
+    if len(missing):
+        raise KeyError(
+            f"No assumptions for {len(missing)} companies: "
+            f"{', '.join(map(str, missing[:5]))}"
+        )
+    a = {
+        key: values[:, None]
+        for key, values in assumption_table(
+            assumptions.loc[companies], base_assumptions
+        ).items()
+    }
+    last_year = inputs.pop("last_year")
+
+    n_companies = len(companies)
+    shard_size = shard_size or n_companies
+    n_shards = max(1, math.ceil(n_companies / shard_size))
+    shards = [
+        (
+            _slice(a, i * shard_size, (i + 1) * shard_size),
+            _slice(inputs, i * shard_size, (i + 1) * shard_size),
+            (horizon, periodicity, day_count),
+            numeric,
+        )
+        for i in range(n_shards)
+    ]
+    if max_workers == 1 or n_shards == 1:
+        results = list(map(_run_shard, shards))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_run_shard, shards))
+
+    projection = PortfolioProjection(
+        companies,
+        last_year,
+        calendar,
+        *(
+            np.concatenate([getattr(result, statement) for result in results])
+            for statement in STATEMENT_ITEMS
+        ),
+        # Fixed-point passes per period of the slowest shard
+        np.max([result.iterations for result in results], axis=0),
+        np.concatenate([result.converged for result in results]),
+        a,
+        inputs,
+    )
+    projection.scale = results[0].scale
+    return projection
+
+
+def _slice(columns, start, stop):
+    # Rows start:stop of every (companies x 1) column, nested dicts included
+    return {
+        key: _slice(value, start, stop) if isinstance(value, dict) else value[start:stop]
+        for key, value in columns.items()
+    }
+
+
+def take_rows(columns, rows):
+    # Rows of every (companies x 1) column, nested dicts included; scalars
+    # are shared by every row
+    return {
+        key: take_rows(value, rows)
+        if isinstance(value, dict)
+        else value[rows] if np.ndim(value) else value
+        for key, value in columns.items()
+    }
+
+
+def _put_rows(columns, rows, values):
+    # Overwrite rows of every (companies x 1) column with values' rows
+    for key, column in columns.items():
+        if isinstance(column, dict):
+            _put_rows(column, rows, values[key])
+        else:
+            column[rows] = values[key]
+
+
+def _run_shard(shard):
+    a, inputs, calendar, numeric = shard
+    return project_inputs(a, inputs, ProjectionCalendar(*calendar), numeric)
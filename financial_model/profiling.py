@@ -0,0 +1,152 @@
+'''
+Opt-in instrumentation of the statement classes. Inside
+
+    with profile_model() as report:
+        cash_flow.calculate_all_line_items()
+
+every line-item method records its calls, how many of them computed the line
+item (the rest were cache hits), cumulative and self time, and the pandas
+DataFrames and Series it allocated itself. Outside the block the only cost is
+one attribute check per line-item call.
+
+Only the thread that entered the block is recorded; line items run and
+DataFrames built by other threads meanwhile (e.g. the server's executor) are
+left out. One thread profiles at a time: a block entered on another thread
+waits for the running one to finish.
+'''
+
+import contextlib
+import threading
+import time
+
+# Report being recorded into, None when profiling is off
+active = None
+# Held while a block runs: NDFrame.__init__ is patched process-wide. Blocks
+# may nest on the same thread.
+_lock = threading.RLock()
+
+
+class LineItemStats:
+    # Counters of one line-item method. self_time excludes the line items it
+    # called; dataframes and series count only its own allocations.
+    def __init__(self):
+        self.calls = 0
+        self.computed = 0
+        self.cumulative_time = 0.0
+        self.self_time = 0.0
+        self.dataframes = 0
+        self.series = 0
+
+
+class ProfileReport:
+    def __init__(self):
+        self.line_items = {}
+        self.dataframes = 0
+        self.series = 0
+        # Identifier of the recorded thread
+        self.thread = threading.get_ident()
+        # [stats, child time] of the line items currently running
+        self._stack = []
+
+    def call(self, key, cache, compute):
+        # Run compute() for line item key, recording its counters
+        if threading.get_ident() != self.thread:
+            return compute()
+        stats = self.line_items.get(key)
+        if stats is None:
+            stats = self.line_items[key] = LineItemStats()
+        stats.calls += 1
+        if key not in cache:
+            stats.computed += 1
+        frame = [stats, 0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return compute()
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            stats.cumulative_time += elapsed
+            stats.self_time += elapsed - frame[1]
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def allocated(self, obj):
+        # Count a DataFrame or Series against the running line item
+        if threading.get_ident() != self.thread:
+            return
+        stats = self._stack[-1][0] if self._stack else None
+        if obj.ndim == 2:
+            self.dataframes += 1
+            if stats is not None:
+                stats.dataframes += 1
+        else:
+            self.series += 1
+            if stats is not None:
+                stats.series += 1
+
+    def to_dict(self):
+        # JSON-serializable report, e.g. for structured logs
+        return {
+            "dataframes": self.dataframes,
+            "series": self.series,
+            "line_items": {
+                ".".join(key): dict(vars(stats)) for key, stats in self.line_items.items()
+            },
+        }
+
+    def to_frame(self):
+        # One row per line-item method, slowest (cumulative) first
+        import pandas as pd
+
+        frame = pd.DataFrame(
+            [
+                {
+                    "Line Item": ".".join(key),
+                    "Calls": stats.calls,
+                    "Computed": stats.computed,
+                    "Cumulative (s)": stats.cumulative_time,
+                    "Self (s)": stats.self_time,
+                    "DataFrames": stats.dataframes,
+                    "Series": stats.series,
+                }
+                for key, stats in self.line_items.items()
+            ],
+            columns=[
+                "Line Item",
+                "Calls",
+                "Computed",
+                "Cumulative (s)",
+                "Self (s)",
+                "DataFrames",
+                "Series",
+            ],
+        )
+        return frame.sort_values("Cumulative (s)", ascending=False, ignore_index=True)
+
+
+@contextlib.contextmanager
+def profile_model():
+    # Record a ProfileReport of every line-item call made inside the block.
+    # Blocks may nest; the inner one records on its own.
+    global active
+    from pandas.core.generic import NDFrame
+
+    with _lock:
+        report = ProfileReport()
+        previous = active
+        init = NDFrame.__init__
+
+        # Every DataFrame / Series, including those pandas builds internally,
+        # goes through NDFrame.__init__
+        def counting_init(obj, *args, **kwargs):
+            init(obj, *args, **kwargs)
+            report.allocated(obj)
+
+        NDFrame.__init__ = counting_init
+        active = report
+        try:
+            yield report
+        finally:
+            NDFrame.__init__ = init
+            active = previous
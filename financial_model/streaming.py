@@ -0,0 +1,165 @@
+'''
+Streaming ingestion of large long-format histories (one row per company and
+period). The CSV is read in chunks and only a bounded window of each company's
+most recent rows is kept, so memory grows with the number of companies, not
+with the file size; the projection only needs the last row of each company.
+
+The stages are generators and can be used on their own:
+
+    chunks = read_chunks("universe.csv", chunksize=100_000)
+    windows = trailing_windows(chunks, window=1)
+    for projection in project_batches(windows, assumptions, batch_size=10_000):
+        ...
+
+or all at once through stream_portfolio(). When the file is sorted by company,
+sorted_by_company=True emits each company as soon as its rows end, so only the
+open company's rows are carried between chunks and memory stays bounded by the
+chunk and batch sizes instead.
+'''
+
+import pandas as pd
+
+from .portfolio import COMPANY_COLUMN, project_portfolio
+from .scenario_engine import HISTORICAL_COLUMNS
+
+
+def read_chunks(
+    path, chunksize=100_000, columns=HISTORICAL_COLUMNS, company_column=COMPANY_COLUMN
+):
+    # DataFrames of up to chunksize rows holding company_column and columns
+    usecols = [company_column, *columns]
+    yield from pd.read_csv(path, usecols=usecols, chunksize=chunksize)
+
+
+def trailing_windows(
+    chunks, window=1, company_column=COMPANY_COLUMN, sorted_by_company=False
+):
+    # Keep the last window rows (by Year) of every company across chunks and
+    # yield them as long-format frames of complete companies: once at the end,
+    # or, with sorted_by_company, after every chunk for the companies whose
+    # rows have ended.
+    if sorted_by_company:
+        yield from _sorted_windows(chunks, window, company_column)
+        return
+    # Each chunk is cut to its own trailing windows first; the cut chunks are
+    # merged into the state only once they outgrow it, so every row is
+    # re-sorted a bounded number of times rather than once per chunk.
+    state = None
+    pending = []
+    pending_rows = 0
+    for chunk in chunks:
+        pending.append(_tail(chunk, window, company_column))
+        pending_rows += len(pending[-1])
+        if pending_rows > (0 if state is None else len(state)):
+            state = _tail(_concat(state, pending), window, company_column)
+            pending, pending_rows = [], 0
+    if pending:
+        state = _tail(_concat(state, pending), window, company_column)
+    if state is not None and len(state):
+        yield state
+
+
+def _sorted_windows(chunks, window, company_column):
+    # Only the rows of the company still open at the end of the last chunk are
+    # carried over, so memory stays bounded by the chunk. Contiguity is checked
+    # within each chunk and against the last finished company.
+    state = None
+    last_finished = None
+    for chunk in chunks:
+        companies = chunk[company_column]
+        runs = int((companies != companies.shift()).sum())
+        if runs != companies.nunique() or (
+            last_finished is not None and companies.iloc[0] == last_finished
+        ):
+            raise ValueError(
+                "Rows of a company are not contiguous; pass sorted_by_company=False"
+            )
+        state = _tail(_concat(state, [chunk]), window, company_column)
+        # Every company but the chunk's last one is complete
+        open_company = companies.iloc[-1]
+        done = state[company_column] != open_company
+        if done.any():
+            last_finished = state.loc[done, company_column].iloc[-1]
+            yield state[done].reset_index(drop=True)
+            state = state[~done].reset_index(drop=True)
+    if state is not None and len(state):
+        yield state
+
+
+def _concat(state, frames):
+    return pd.concat(frames if state is None else [state, *frames], ignore_index=True)
+
+
+def _tail(rows, window, company_column):
+    # The last window rows by Year of every company, ordered by company
+    return (
+        rows.sort_values([company_column, "Year"], kind="stable")
+        .groupby(company_column, sort=False)
+        .tail(window)
+        .reset_index(drop=True)
+    )
+
+
+def batches(frames, batch_size=10_000, company_column=COMPANY_COLUMN):
+    # Regroup long-format frames into frames of batch_size companies each
+    pending = []
+    pending_companies = 0
+    for frame in frames:
+        codes, companies = pd.factorize(frame[company_column], sort=False)
+        start = 0
+        while start < len(companies):
+            take = min(batch_size - pending_companies, len(companies) - start)
+            pending.append(frame[(codes >= start) & (codes < start + take)])
+            pending_companies += take
+            start += take
+            if pending_companies == batch_size:
+                yield pd.concat(pending, ignore_index=True)
+                pending, pending_companies = [], 0
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def project_batches(
+    frames,
+    assumptions,
+    base_assumptions=None,
+    batch_size=10_000,
+    company_column=COMPANY_COLUMN,
+    **projection_options,
+):
+    # Project every batch of companies; yields one PortfolioProjection each.
+    # projection_options are passed on to project_portfolio().
+    indexed = assumptions.set_index(company_column)
+    for batch in batches(frames, batch_size, company_column):
+        companies = batch[company_column].unique()
+        yield project_portfolio(
+            batch,
+            indexed.loc[indexed.index.intersection(companies)].reset_index(),
+            base_assumptions,
+            company_column,
+            **projection_options,
+        )
+
+
+def stream_portfolio(
+    path,
+    assumptions,
+    base_assumptions=None,
+    chunksize=100_000,
+    batch_size=10_000,
+    window=1,
+    sorted_by_company=False,
+    company_column=COMPANY_COLUMN,
+    **projection_options,
+):
+    # read_chunks -> trailing_windows -> project_batches over the CSV at path
+    chunks = read_chunks(path, chunksize, company_column=company_column)
+    windows = trailing_windows(chunks, window, company_column, sorted_by_company)
+    yield from project_batches(
+        windows,
+        assumptions,
+        base_assumptions,
+        batch_size,
+        company_column,
+        **projection_options,
+    )
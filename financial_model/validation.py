@@ -0,0 +1,355 @@
+'''
+Integrity checks of projected statements. Every check is an identity between
+line items - the balance sheet balances, the cash flow's ending cash ties to
+the balance sheet, retained earnings, PP&E, cash and debt roll forward with
+net income, capex, depreciation and financing flows - evaluated for all
+scenarios and periods at once on the (scenarios x periods x line items)
+arrays of a ScenarioProjection or PortfolioProjection, or on the statement
+blocks of a FinancialModel. No DataFrames are built, so the checks are cheap
+enough to leave on in batch runs.
+
+    report = validate(project_scenarios(assumption_sets, historical_data))
+    report.failed()             # names of the checks that failed
+    report.scenarios("balance") # indices of the scenarios failing one check
+    validate(model, fail_fast=True)   # raises IntegrityError on the first failure
+
+Roll-forwards compare each period with the one before it; the first period is
+compared with the opening balances: those given (historical_inputs() or
+portfolio_inputs() values), those a FinancialModel or PortfolioProjection was
+built from, or none, in which case it is left out and counted as skipped. A difference passes when it
+is within tolerance + relative_tolerance * the larger magnitude of the sides.
+
+Fixed-point projections (numeric="fixed") are compared in their integer units,
+so tolerance=0, relative_tolerance=0 asks for exact ties to the cent.
+
+The model itself does not pass KNOWN_FAILURES: cash flow from operations
+adds back the last historical D&A rather than the depreciation booked to
+accumulated depreciation, and the working-capital balances never enter cash,
+so "balance" and "depreciation" fail on any input, in float and fixed point
+alike. report.unexpected() lists the failures outside them.
+'''
+
+import numpy as np
+import pandas as pd
+
+from .fixed_point import fixed_inputs
+from .scenario_engine import STATEMENT_ITEMS, historical_inputs
+from .statements import FinancialModel
+
+TOLERANCE = 1e-6
+RELATIVE_TOLERANCE = 1e-9
+# Checks the projection formulas cannot pass (see the module docstring)
+KNOWN_FAILURES = ("balance", "depreciation")
+
+
+class IntegrityError(ValueError):
+    # Raised by validate(fail_fast=True); report holds the checks run so far
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+
+class _LineItems:
+    # (scenarios x periods) views of line items, by statement and name
+    def __init__(self, statements):
+        self._statements = statements
+
+    def __call__(self, statement, name):
+        return self._statements[statement][:, :, STATEMENT_ITEMS[statement].index(name)]
+
+
+def _change(values, opening):
+    # Period-on-period change; the first period against the opening balance,
+    # or NaN (not checked) when there is none
+    previous = np.empty_like(values)
+    previous[:, 1:] = values[:, :-1]
+    previous[:, :1] = np.nan if opening is None else opening
+    return values - previous
+
+
+def _opening(opening, key):
+    if opening is None:
+        return None
+    value = opening["opening"][key] if key in opening["opening"] else opening[key]
+    return np.reshape(value, (-1, 1))
+
+
+def _sum(items, statement, *names):
+    total = items(statement, names[0]).copy()
+    for name in names[1:]:
+        total += items(statement, name)
+    return total
+
+
+# name -> function(items, opening) returning the (actual, expected) arrays
+CHECKS = {
+    "balance": lambda items, opening: (
+        items("balance_sheet", "Total Assets"),
+        items("balance_sheet", "Total Liabilities and Equity"),
+    ),
+    "cash": lambda items, opening: (
+        items("balance_sheet", "Cash"),
+        items("cash_flow", "Ending Cash Position"),
+    ),
+    "cash_roll_forward": lambda items, opening: (
+        _change(
+            items("cash_flow", "Ending Cash Position"), _opening(opening, "beginning_cash")
+        ),
+        items("cash_flow", "Net Cash Flow"),
+    ),
+    "net_cash_flow": lambda items, opening: (
+        items("cash_flow", "Net Cash Flow"),
+        _sum(
+            items,
+            "cash_flow",
+            "Cash Flow from Operations",
+            "Cash Flow from Investing",
+            "Cash Flow from Financing",
+        ),
+    ),
+    "retained_earnings": lambda items, opening: (
+        _change(
+            items("balance_sheet", "Retained Earnings"),
+            _opening(opening, "retained_earnings"),
+        ),
+        items("income_statement", "Net Income"),
+    ),
+    # Gross PP&E grows by capex less dispositions, i.e. -(cash from investing)
+    "gross_ppe": lambda items, opening: (
+        _change(items("balance_sheet", "Gross PP&E"), _opening(opening, "gross_ppe")),
+        -items("cash_flow", "Cash Flow from Investing"),
+    ),
+    # Depreciation charged on the balance sheet is the non-cash add-back
+    # between net income and cash flow from operations
+    "depreciation": lambda items, opening: (
+        _change(
+            items("balance_sheet", "Accumulated Depreciation"),
+            _opening(opening, "accumulated_depreciation"),
+        ),
+        items("cash_flow", "Cash Flow from Operations")
+        - items("income_statement", "Net Income"),
+    ),
+    "net_ppe": lambda items, opening: (
+        items("balance_sheet", "Net PP&E"),
+        items("balance_sheet", "Gross PP&E")
+        - items("balance_sheet", "Accumulated Depreciation"),
+    ),
+    "revolver": lambda items, opening: (
+        _change(
+            items("balance_sheet", "Revolving Credit Facility"),
+            _opening(opening, "revolver"),
+        ),
+        items("cash_flow", "Revolver (Paydown) / Drawdown"),
+    ),
+    "term_loan": lambda items, opening: (
+        _change(items("balance_sheet", "Term Loan"), _opening(opening, "term_loan")),
+        items("cash_flow", "Term Loan Repayment"),
+    ),
+    "unsecured_debt": lambda items, opening: (
+        _change(
+            items("balance_sheet", "Unsecured Debt"), _opening(opening, "unsecured_debt")
+        ),
+        items("cash_flow", "Change in Unsecured Debt"),
+    ),
+    "gross_profit": lambda items, opening: (
+        items("income_statement", "Gross Profit"),
+        items("income_statement", "Revenue")
+        - items("income_statement", "Cost of Goods Sold (COGS)"),
+    ),
+    "operating_income": lambda items, opening: (
+        items("income_statement", "Operating Income"),
+        items("income_statement", "Gross Profit")
+        - items("income_statement", "SG&A Expenses"),
+    ),
+    "total_current_assets": lambda items, opening: (
+        items("balance_sheet", "Total Current Assets"),
+        _sum(
+            items,
+            "balance_sheet",
+            "Cash",
+            "Inventory",
+            "Accounts Receivable",
+            "Other Current Assets",
+        ),
+    ),
+    "total_assets": lambda items, opening: (
+        items("balance_sheet", "Total Assets"),
+        _sum(
+            items,
+            "balance_sheet",
+            "Total Current Assets",
+            "Net PP&E",
+            "Goodwill",
+            "Other Assets",
+        ),
+    ),
+    "total_current_liabilities": lambda items, opening: (
+        items("balance_sheet", "Total Current Liabilities"),
+        _sum(
+            items,
+            "balance_sheet",
+            "Accounts Payable",
+            "Accrued Liabilities",
+            "Other Current Liabilities",
+        ),
+    ),
+    "shareholders_equity": lambda items, opening: (
+        items("balance_sheet", "Total Shareholders Equity"),
+        _sum(items, "balance_sheet", "Common Stock", "Retained Earnings"),
+    ),
+    "total_liabilities_and_equity": lambda items, opening: (
+        items("balance_sheet", "Total Liabilities and Equity"),
+        _sum(
+            items, "balance_sheet", "Total Liabilities", "Total Shareholders Equity"
+        ),
+    ),
+}
+
+
+class ValidationReport:
+    # Outcome of validate(). For every check run: the number of failing
+    # (scenario, period) cells, the number left unchecked for want of an
+    # opening balance, the largest absolute difference and the indices of the
+    # failing scenarios.
+    def __init__(self, n_scenarios, tolerance, relative_tolerance):
+        self.n_scenarios = n_scenarios
+        self.tolerance = tolerance
+        self.relative_tolerance = relative_tolerance
+        self.failures = {}
+        self.skipped = {}
+        self.max_errors = {}
+        self._scenarios = {}
+
+    def __repr__(self):
+        failed = self.failed()
+        skipped = sum(self.skipped.values())
+        return (
+            f"<ValidationReport: {len(self.failures) - len(failed)} of "
+            f"{len(self.failures)} checks passed"
+            + (f", failed: {', '.join(failed)}" if failed else "")
+            + (f", {skipped} cells unchecked (no opening balances)" if skipped else "")
+            + ">"
+        )
+
+    @property
+    def ok(self):
+        return not self.failed()
+
+    def failed(self):
+        return [name for name, failures in self.failures.items() if failures]
+
+    def unexpected(self):
+        # Failed checks other than KNOWN_FAILURES
+        return [name for name in self.failed() if name not in KNOWN_FAILURES]
+
+    def scenarios(self, check=None):
+        # Indices of the scenarios failing check (any check if None)
+        if check is not None:
+            return self._scenarios[check]
+        failing = [self._scenarios[name] for name in self.failed()]
+        if not failing:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate(failing))
+
+    def to_frame(self):
+        # One row per check
+        return pd.DataFrame(
+            {
+                "Check": list(self.failures),
+                "Failed Cells": list(self.failures.values()),
+                "Failed Scenarios": [len(self._scenarios[name]) for name in self.failures],
+                "Skipped Cells": [self.skipped.get(name, 0) for name in self.failures],
+                "Max Difference": list(self.max_errors.values()),
+            }
+        )
+
+    def _compare(self, name, actual, expected):
+        error = np.abs(actual - expected)
+        limit = self.tolerance + self.relative_tolerance * np.maximum(
+            np.abs(actual), np.abs(expected)
+        )
+        # NaN differences (periods without an opening balance) are not checked
+        checked = ~np.isnan(error)
+        self.skipped[name] = int(error.size - np.count_nonzero(checked))
+        self._record(
+            name, error > limit, float(error[checked].max()) if checked.any() else 0.0
+        )
+
+    def _record(self, name, bad, max_error):
+        # bad: (scenarios x periods) mask of failing cells
+        self.failures[name] = int(np.count_nonzero(bad))
+        self.max_errors[name] = max_error
+        self._scenarios[name] = np.flatnonzero(bad.any(axis=1))
+
+
+def validate(
+    projection,
+    opening=None,
+    checks=None,
+    tolerance=TOLERANCE,
+    relative_tolerance=RELATIVE_TOLERANCE,
+    fail_fast=False,
+):
+    # Run checks (names from CHECKS, default all) on projection: a
+    # ScenarioProjection, PortfolioProjection or FinancialModel. opening
+    # holds the last historical balances (historical_inputs() /
+    # portfolio_inputs() values); a FinancialModel or PortfolioProjection
+    # supplies its own. Without them the first period of the roll-forwards
+    # is counted in report.skipped instead of checked. Besides
+    # the identities, every line item must be finite ("finite"). With
+    # fail_fast, raise IntegrityError at the first failing check.
+    if checks is None:
+        checks = list(CHECKS)
+    unknown = [name for name in checks if name not in CHECKS]
+    if unknown:
+        raise KeyError(f"Unknown checks: {', '.join(unknown)}")
+    statements, model_opening = _statements(projection)
+    if opening is None:
+        opening = model_opening
+    scale = getattr(projection, "scale", None)
+    if scale:
+        # float64 holds fixed-point amounts exactly, and has NaN for the
+        # periods without an opening balance
+        statements = {
+            name: values.astype(np.float64) for name, values in statements.items()
+        }
+        if opening is not None:
+            opening = fixed_inputs(opening, scale)
+    items = _LineItems(statements)
+    n_scenarios = statements["income_statement"].shape[0]
+    report = ValidationReport(n_scenarios, tolerance, relative_tolerance)
+
+    # Non-finite values would pass every comparison, so they are a check too
+    bad = np.zeros(statements["income_statement"].shape[:2], dtype=bool)
+    for values in statements.values():
+        bad |= ~np.isfinite(values).all(axis=2)
+    report._record("finite", bad, 0.0)
+    for name in ["finite", *checks]:
+        if name != "finite":
+            report._compare(name, *CHECKS[name](items, opening))
+        if fail_fast and report.failures[name]:
+            scenarios = report.scenarios(name)
+            raise IntegrityError(
+                f"Integrity check {name!r} failed for {len(scenarios)} of "
+                f"{n_scenarios} scenarios (first: "
+                f"{', '.join(map(str, scenarios[:5]))}); "
+                f"max difference {report.max_errors[name]:.6g}",
+                report,
+            )
+    return report
+
+
+def _statements(projection):
+    # {statement: (scenarios x periods x line items)} and opening balances
+    names = ("income_statement", "balance_sheet", "cash_flow")
+    if not isinstance(projection, FinancialModel):
+        statements = {name: getattr(projection, name) for name in names}
+        return statements, getattr(projection, "inputs", None)
+    # One scenario, read from the statement blocks
+    statements = {}
+    for name in names:
+        statement = getattr(projection, name)
+        for line_item in statement.LINE_ITEMS:
+            statement.values(line_item)
+        statements[name] = statement.block.T[None]
+    return statements, historical_inputs(projection.historical_data)
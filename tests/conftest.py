@@ -0,0 +1,18 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def assumptions():
+    with open(os.path.join(ROOT, "Asumptions.json")) as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def historical_data():
+    return pd.read_csv(os.path.join(ROOT, "historical_data.csv"))
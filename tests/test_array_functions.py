@@ -0,0 +1,105 @@
+import inspect
+
+import numpy as np
+import pytest
+
+from financial_model import array_functions, functions
+
+# Arguments of every helper for n years of values x
+ARGUMENTS = {
+    "calculate_revenue": lambda n, x: (100.0, 0.05, n),
+    "calculate_cogs": lambda n, x: (x, 0.4),
+    "calculate_depreciation": lambda n, x: (x, 0.02),
+    "calculate_gross_profit": lambda n, x: (x, x[::-1]),
+    "calculate_sga": lambda n, x: (x, 0.3),
+    "calculate_other_income_expenses": lambda n, x: (n,),
+    "calculate_tax_expense": lambda n, x: (x, 0.4),
+    "calculate_net_income": lambda n, x: (x, x[::-1], x),
+    "calculate_ar_turnover_days": lambda n, x: (30, x),
+    "calculate_inventory_turnover_days": lambda n, x: (45, x),
+    "calculate_days_payable": lambda n, x: (50, n),
+    "calculate_other_current_assets": lambda n, x: (1.0, n),
+    "calculate_gross_ppe": lambda n, x: (x, [v / 3 for v in x]),
+    "calculate_accumulated_depreciation": lambda n, x: (x,),
+    "calculate_other_current_liabilities": lambda n, x: (x, 0.02),
+    "calculate_long_term_debt": lambda n, x: (x,),
+    "calculate_retained_earnings": lambda n, x: (x, x[::-1]),
+    "calculate_cash_from_operations": lambda n, x: (x, x[::-1], x),
+    "calculate_capex": lambda n, x: ([0.1] * len(x), x),
+    "calculate_changes_in_working_capital": lambda n, x: (x, x[::-1], x, x, x[::-1], x, x),
+    "calculate_cash_from_investing": lambda n, x: (x, x[::-1]),
+    "calculate_cash_from_financing": lambda n, x: (x, x[::-1]),
+    "calculate_change_in_cash": lambda n, x: (x, x[::-1], x),
+    "calculate_beginning_cash": lambda n, x: (x,),
+    "calculate_ending_cash": lambda n, x: (x, x[::-1]),
+}
+HELPERS = sorted(name for name, _ in inspect.getmembers(functions, inspect.isfunction))
+# Helpers whose result depends only on scalars and the number of years
+SCALAR_ONLY = {
+    "calculate_revenue",
+    "calculate_other_income_expenses",
+    "calculate_days_payable",
+    "calculate_other_current_assets",
+}
+# The list version reads gross_ppe[0] before its loop and fails on no years;
+# the array version returns no years
+LIST_ONLY_ERRORS = {("calculate_depreciation", 0), ("calculate_depreciation", -1)}
+
+
+def values(n, offset=0.0):
+    return [100.0 + offset + 3.5 * i - 0.25 * i * i for i in range(max(n, 0))]
+
+
+def test_every_helper_has_an_array_version():
+    assert set(ARGUMENTS) == set(HELPERS)
+    for name in HELPERS:
+        assert inspect.signature(getattr(array_functions, name)) == inspect.signature(
+            getattr(functions, name)
+        )
+
+
+@pytest.mark.parametrize("n", [-1, 0, 1, 2, 7, 100])
+@pytest.mark.parametrize("name", HELPERS)
+def test_matches_list_version(name, n):
+    arguments = ARGUMENTS[name](n, values(n))
+    try:
+        expected = getattr(functions, name)(*arguments)
+    except IndexError:
+        if (name, n) in LIST_ONLY_ERRORS:
+            assert getattr(array_functions, name)(*arguments).shape == (0,)
+            return
+        with pytest.raises(IndexError):
+            getattr(array_functions, name)(*arguments)
+        return
+    result = getattr(array_functions, name)(*arguments)
+    assert result.dtype == np.float64
+    assert result.shape == np.shape(expected)
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("n", [0, 1, 7])
+@pytest.mark.parametrize("name", sorted(set(HELPERS) - SCALAR_ONLY))
+def test_batch_matches_list_version_row_by_row(name, n):
+    rows = [ARGUMENTS[name](n, values(n, 10.0 * row)) for row in range(4)]
+    batch = [
+        np.array(column) if isinstance(column[0], list) else column[0]
+        for column in zip(*rows)
+    ]
+    if n == 0 and name in ("calculate_depreciation", "calculate_retained_earnings"):
+        return
+    expected = [getattr(functions, name)(*arguments) for arguments in rows]
+    result = getattr(array_functions, name)(*batch)
+    assert result.shape == np.shape(expected)
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=0)
+
+
+def test_revenue_batch_of_scenario_columns():
+    initial = np.array([[100.0], [120.0]])
+    growth = np.array([[0.05], [0.1]])
+    expected = [
+        functions.calculate_revenue(100.0, 0.05, 6),
+        functions.calculate_revenue(120.0, 0.1, 6),
+    ]
+    np.testing.assert_allclose(
+        array_functions.calculate_revenue(initial, growth, 6), expected, rtol=1e-15
+    )
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from financial_model.calibration import DERIVATIONS, LIMITS, METHODS, calibrate
+
+WORKING_CAPITAL = [
+    "Days Inventory",
+    "Days Accounts Receivable",
+    "Days Payable",
+    "Accrued Liabilities as % of COGS",
+    "Other Current Liabilities as % of COGS",
+]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_sample_data_calibrates_to_sane_values(assumptions, historical_data, method):
+    calibrated = calibrate(historical_data, method, base_assumptions=assumptions)
+    values = calibrated.assumptions(base_assumptions=assumptions)
+    for key, (low, high) in LIMITS.items():
+        assert low <= values[key] <= high
+    assert 0.3 <= values["COGS as % of Revenue"] <= 0.5
+    assert 0.0 <= values["Revenue Growth Rate"] <= 0.1
+    assert values["Term Loan Amortization"] == pytest.approx(20.0)
+    # The history holds changes of the working-capital balances, so those
+    # assumptions are not calibrated and keep their base values
+    for key in WORKING_CAPITAL:
+        assert key not in DERIVATIONS
+        assert values[key] == assumptions[key]
+        assert values[key] > 0
+
+
+def test_non_physical_estimate_falls_back_to_base(assumptions, historical_data):
+    history = historical_data.assign(Taxes=-historical_data["Taxes"])
+    calibrated = calibrate(history, base_assumptions=assumptions)
+    k = calibrated.keys.index("Tax Rate")
+    assert calibrated.estimate[0, k] == assumptions["Tax Rate"]
+    assert np.isnan(calibrated.lower[0, k]) and np.isnan(calibrated.upper[0, k])
+    assert "Tax Rate" not in calibrate(history).assumptions()
+
+
+def test_bounds_are_clipped_to_limits(assumptions, historical_data):
+    calibrated = calibrate(historical_data, interval="prediction")
+    low, _ = LIMITS["Other Liabilities"]
+    k = calibrated.keys.index("Other Liabilities")
+    assert calibrated.lower[0, k] == low
+
+
+def test_missing_year_is_not_paired_with_the_year_before(historical_data):
+    gap = historical_data[historical_data["Year"] != 2014]
+    observed = calibrate(gap).to_frame().set_index("Assumption")["Observations"]
+    # Growth needs the year before: 2013 and 2016 only, not 2015 over 2013
+    assert observed["Revenue Growth Rate"] == 2
+    assert observed["Term Loan Amortization"] == 2
+    growth = calibrate(gap).assumptions()["Revenue Growth Rate"]
+    assert growth == pytest.approx((170 / 160 + 200 / 190) / 2 - 1)
+
+
+def test_duplicate_years_are_rejected(historical_data):
+    with pytest.raises(ValueError, match="more than one row"):
+        calibrate(historical_data.iloc[[0, 1, 1, 2]])
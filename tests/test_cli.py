@@ -0,0 +1,16 @@
+import pytest
+
+from financial_model import cli, server
+
+
+@pytest.mark.parametrize("build_parser", [cli.build_parser, server.build_parser])
+@pytest.mark.parametrize("horizon", ["0", "-3", "five"])
+def test_horizon_below_one_is_a_usage_error(build_parser, horizon, capsys):
+    with pytest.raises(SystemExit) as exit:
+        build_parser().parse_args(["--horizon", horizon])
+    assert exit.value.code == 2
+    assert "--horizon" in capsys.readouterr().err
+
+
+def test_horizon_of_one_is_accepted():
+    assert cli.build_parser().parse_args(["--horizon", "1"]).horizon == 1
@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+import pytest
+
+from financial_model import column_cache
+from financial_model.column_cache import RACY_NS, load_history
+
+
+def test_read_csv_options_are_part_of_the_key(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a;b\n1;2\n3;4\n")
+    cache = tmp_path / "cache"
+    comma = load_history(path, columns=None, cache_dir=cache)
+    semicolon = load_history(path, columns=None, cache_dir=cache, sep=";")
+    assert list(comma.columns) == ["a;b"]
+    assert list(semicolon.columns) == ["a", "b"]
+    assert list(load_history(path, columns=None, cache_dir=cache).columns) == ["a;b"]
+
+
+def test_same_file_name_in_two_directories(tmp_path):
+    cache = tmp_path / "cache"
+    paths = []
+    for name, value in (("one", 1), ("two", 2)):
+        (tmp_path / name).mkdir()
+        paths.append(tmp_path / name / "data.csv")
+        pd.DataFrame({"x": [value]}).to_csv(paths[-1], index=False)
+    for path in paths:
+        load_history(path, columns=None, cache_dir=cache)
+    assert len([entry for entry in cache.iterdir() if entry.is_dir()]) == 2
+    assert load_history(paths[0], columns=None, cache_dir=cache)["x"].tolist() == [1]
+
+
+def test_edited_csv_replaces_its_entry(tmp_path):
+    path = tmp_path / "data.csv"
+    cache = tmp_path / "cache"
+    pd.DataFrame({"x": [1]}).to_csv(path, index=False)
+    load_history(path, columns=None, cache_dir=cache)
+    pd.DataFrame({"x": [5, 6]}).to_csv(path, index=False)
+    assert load_history(path, columns=None, cache_dir=cache)["x"].tolist() == [5, 6]
+    assert len([entry for entry in cache.iterdir() if entry.is_dir()]) == 1
+
+
+def test_unchanged_csv_is_not_hashed_again(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    cache = tmp_path / "cache"
+    pd.DataFrame({"x": [1, 2]}).to_csv(path, index=False)
+    modified = os.stat(path).st_mtime_ns - 2 * RACY_NS
+    os.utime(path, ns=(modified, modified))
+    load_history(path, columns=None, cache_dir=cache)
+
+    def no_hash(path):
+        raise AssertionError("hashed an unchanged CSV")
+
+    hash_file = column_cache.file_hash
+    monkeypatch.setattr(column_cache, "file_hash", no_hash)
+    assert load_history(path, columns=None, cache_dir=cache)["x"].tolist() == [1, 2]
+
+    # Same size, new mtime: hashed again and rebuilt
+    pd.DataFrame({"x": [3, 4]}).to_csv(path, index=False)
+    os.utime(path, ns=(modified + 1, modified + 1))
+    with pytest.raises(AssertionError):
+        load_history(path, columns=None, cache_dir=cache)
+    monkeypatch.setattr(column_cache, "file_hash", hash_file)
+    assert load_history(path, columns=None, cache_dir=cache)["x"].tolist() == [3, 4]
+
+
+def test_recently_modified_csv_is_always_hashed(tmp_path):
+    path = tmp_path / "data.csv"
+    cache = tmp_path / "cache"
+    pd.DataFrame({"x": [1]}).to_csv(path, index=False)
+    load_history(path, columns=None, cache_dir=cache)
+    # A same-size edit within the timestamp resolution keeps the mtime
+    modified = os.stat(path).st_mtime_ns
+    pd.DataFrame({"x": [7]}).to_csv(path, index=False)
+    os.utime(path, ns=(modified, modified))
+    assert load_history(path, columns=None, cache_dir=cache)["x"].tolist() == [7]
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from financial_model.dcf import valuation, valuation_grid
+from financial_model.scenario_engine import project_scenarios
+
+
+@pytest.fixture
+def projection(assumptions, historical_data):
+    sets = [dict(assumptions, **{"Revenue Growth Rate": g}) for g in (0.02, 0.05, 0.08)]
+    return project_scenarios(sets, historical_data)
+
+
+def test_per_scenario_rate_grid_matches_shared_grids(projection, assumptions):
+    rates = np.array([[0.06, 0.08], [0.07, 0.09], [0.1, 0.12]])
+    growth = np.array([0.0, 0.02])
+    grid = valuation_grid(projection, rates, growth, assumptions)
+    assert grid.enterprise_value.shape == (3, 2, 2)
+    for scenario in range(3):
+        shared = valuation_grid(projection, rates[scenario], growth, assumptions)
+        np.testing.assert_allclose(
+            grid.enterprise_value[scenario], shared.enterprise_value[scenario]
+        )
+
+
+def test_scalar_rate(projection, assumptions):
+    grid = valuation_grid(projection, 0.08, [0.01], assumptions)
+    assert grid.enterprise_value.shape == (3, 1, 1)
+
+
+def test_partial_table_falls_back_to_base_assumptions(assumptions, historical_data):
+    table = pd.DataFrame({"Revenue Growth Rate": [0.02, 0.05, 0.08]})
+    projection = project_scenarios(table, historical_data, assumptions)
+    full = project_scenarios(
+        [dict(assumptions, **row) for row in table.to_dict("records")], historical_data
+    )
+    with pytest.raises(KeyError, match="Missing assumptions"):
+        valuation(projection, table, method="ebit")
+    expected = valuation(full, [assumptions] * 3, method="ebit")
+    result = valuation(projection, table, method="ebit", base_assumptions=assumptions)
+    pd.testing.assert_frame_equal(result, expected)
+    grid = valuation_grid(
+        projection, [0.0], [0.02], table, anchored=True, base_assumptions=assumptions
+    )
+    np.testing.assert_allclose(
+        grid.discount_rates[:, 0], expected["Discount Rate"].to_numpy()
+    )
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from financial_model.portfolio import COMPANY_COLUMN, project_portfolio
+from financial_model.scenario_engine import project_scenarios
+
+
+def scenarios(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "Revenue Growth Rate": rng.uniform(-0.2, 0.3, n),
+            "Tax Rate": rng.uniform(0.2, 0.4, n),
+            "Capex as % of Sales": rng.uniform(0.0, 0.6, n),
+        }
+    )
+
+
+def test_scenario_result_does_not_depend_on_its_batch(assumptions, historical_data):
+    sets = scenarios(200)
+    batch = project_scenarios(sets, historical_data, base_assumptions=assumptions)
+    for row in (0, 17, 199):
+        alone = project_scenarios(
+            sets.iloc[[row]], historical_data, base_assumptions=assumptions
+        )
+        for statement in ("income_statement", "balance_sheet", "cash_flow"):
+            np.testing.assert_array_equal(
+                getattr(alone, statement)[0], getattr(batch, statement)[row]
+            )
+
+
+def test_slow_scenario_does_not_change_the_others(assumptions, historical_data):
+    sets = scenarios(50)
+    base = project_scenarios(sets, historical_data, base_assumptions=assumptions)
+    # A large revolver drawn at a high rate keeps one scenario iterating
+    slow = sets.assign(
+        Revolver=assumptions["Revolver"],
+        **{"Minimum Cash": assumptions.get("Minimum Cash", 0.0)},
+    )
+    slow.loc[0, ["Revolver", "Minimum Cash"]] = 2.5, 1e4
+    mixed = project_scenarios(slow, historical_data, base_assumptions=assumptions)
+    assert mixed.iterations.max() > base.iterations.max()
+    np.testing.assert_array_equal(mixed.balance_sheet[1:], base.balance_sheet[1:])
+
+
+def test_portfolio_shards_match_one_pass(assumptions, historical_data):
+    n_companies = 30
+    companies = [f"C{i:03d}" for i in range(n_companies)]
+    history = pd.concat(
+        [historical_data.assign(**{COMPANY_COLUMN: company}) for company in companies],
+        ignore_index=True,
+    )
+    company_assumptions = scenarios(n_companies).assign(**{COMPANY_COLUMN: companies})
+    whole = project_portfolio(history, company_assumptions, assumptions)
+    sharded = project_portfolio(
+        history, company_assumptions, assumptions, shard_size=7, max_workers=1
+    )
+    np.testing.assert_array_equal(sharded.cash_flow, whole.cash_flow)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from financial_model.export import export_excel, export_parquet
+from financial_model.scenario_engine import project_scenarios
+
+
+@pytest.fixture
+def projections(assumptions, historical_data):
+    scenarios = [dict(assumptions, **{"Revenue Growth Rate": g}) for g in (0.02, 0.05)]
+    return {
+        numeric: project_scenarios(scenarios, historical_data, numeric=numeric)
+        for numeric in ("float", "fixed")
+    }
+
+
+def test_parquet_writes_fixed_point_in_currency_units(projections, tmp_path):
+    pytest.importorskip("pyarrow")
+    frames = {}
+    for numeric, projection in projections.items():
+        export_parquet(projection, tmp_path / numeric, statements=("income_statement",))
+        frames[numeric] = pd.read_parquet(tmp_path / numeric / "income_statement")
+    revenue = projections["float"].income_statement[..., 0].ravel()
+    np.testing.assert_allclose(frames["float"]["Revenue"], revenue)
+    np.testing.assert_allclose(frames["fixed"]["Revenue"], revenue, atol=0.01)
+
+
+def test_excel_writes_fixed_point_in_currency_units(projections, tmp_path):
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "fixed.xlsx"
+    export_excel(projections["fixed"], path, statements=("income_statement",))
+    frame = pd.read_excel(path, sheet_name="Income Statement")
+    revenue = projections["float"].income_statement[..., 0].ravel()
+    np.testing.assert_allclose(frame["Revenue"], revenue, atol=0.01)
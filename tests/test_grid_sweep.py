@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pytest
+
+from financial_model.grid_sweep import VALUES, open_sweep, sweep
+from financial_model.scenario_engine import project_scenarios
+
+METRICS = [
+    ("income_statement", "Net Income"),
+    ("cash_flow", "Ending Cash Position"),
+    ("debt_schedule", "Ending Cash Position"),
+]
+
+
+def test_same_name_from_two_statements(assumptions, historical_data, tmp_path):
+    grid = {"Revenue Growth Rate": [0.0, 0.05], "Minimum Cash": [0.0, 25.0]}
+    result = sweep(
+        grid, assumptions, historical_data, tmp_path, metrics=METRICS, max_workers=1
+    )
+    expected = project_scenarios(
+        result.assumptions(slice(None)), historical_data, assumptions
+    )
+    for statement, name in METRICS:
+        np.testing.assert_allclose(
+            result.line_item(statement, name), expected.line_item(statement, name)
+        )
+    with pytest.raises(KeyError):
+        result.line_item("balance_sheet", "Cash")
+
+    # Both statements report the same ending cash; mark the debt schedule's
+    # to tell them apart
+    values = np.load(os.path.join(tmp_path, VALUES), mmap_mode="r+")
+    values[:, 2] += 1.0
+    values.flush()
+    del values
+    result = open_sweep(tmp_path)
+    cash = expected.line_item("cash_flow", "Ending Cash Position")
+    np.testing.assert_allclose(result.line_item("cash_flow", "Ending Cash Position"), cash)
+    np.testing.assert_allclose(
+        result.line_item("debt_schedule", "Ending Cash Position"), cash + 1.0
+    )
+    frame = result.to_frame(slice(None))
+    assert "Net Income" in frame.columns
+    np.testing.assert_allclose(frame["cash_flow: Ending Cash Position"], cash.ravel())
+    np.testing.assert_allclose(
+        frame["debt_schedule: Ending Cash Position"], cash.ravel() + 1.0
+    )
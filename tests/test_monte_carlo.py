@@ -0,0 +1,24 @@
+from financial_model.monte_carlo import simulate
+
+
+def test_same_line_item_in_two_statements(assumptions, historical_data):
+    metrics = (
+        ("cash_flow", "Ending Cash Position"),
+        ("debt_schedule", "Ending Cash Position"),
+        ("income_statement", "Net Income"),
+    )
+    result = simulate(
+        {"Tax Rate": ("uniform", 0.3, 0.4)},
+        assumptions,
+        historical_data,
+        n_draws=500,
+        metrics=metrics,
+        shard_size=200,
+        batch_size=100,
+        max_workers=1,
+    )
+    assert list(result.summaries) == list(metrics)
+    assert all(summary.count == 500 for summary in result.summaries.values())
+    frame = result.to_frame()
+    assert set(frame["Statement"]) == {statement for statement, _ in metrics}
+    assert len(frame) == len(metrics) * len(result.periods)
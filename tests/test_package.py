@@ -0,0 +1,27 @@
+import importlib
+
+import financial_model
+
+
+def test_exports_resolve_to_their_definitions():
+    for name, module in financial_model._EXPORTS.items():
+        value = getattr(financial_model, name)
+        assert value is getattr(
+            importlib.import_module(f"financial_model.{module}"), name
+        )
+
+
+def test_goal_seek_through_package(assumptions, historical_data):
+    from financial_model import goal_seek
+
+    assert callable(goal_seek)
+    result = goal_seek(
+        [assumptions],
+        historical_data,
+        50.0,
+        "Revenue Growth Rate",
+        (0.0, 0.5),
+        base_assumptions=assumptions,
+    )
+    assert result["Converged"].all()
+    assert abs(result["Residual"].iloc[0]) <= 1e-6
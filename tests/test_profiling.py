@@ -0,0 +1,57 @@
+import threading
+
+import pandas as pd
+
+from financial_model.profiling import profile_model
+from financial_model.statements import IncomeStatement
+
+
+def run(assumptions, historical_data):
+    IncomeStatement(assumptions, historical_data).calculate_all_line_items()
+
+
+def test_other_threads_are_not_recorded(assumptions, historical_data):
+    with profile_model() as alone:
+        run(assumptions, historical_data)
+
+    started = threading.Event()
+    stop = threading.Event()
+
+    def busy():
+        started.set()
+        while not stop.is_set():
+            pd.DataFrame({"a": [1.0]})
+            run(assumptions, historical_data)
+
+    with profile_model() as report:
+        worker = threading.Thread(target=busy)
+        worker.start()
+        started.wait()
+        run(assumptions, historical_data)
+        stop.set()
+        worker.join()
+
+    assert report.dataframes == alone.dataframes
+    assert report.series == alone.series
+    assert {key: stats.calls for key, stats in report.line_items.items()} == {
+        key: stats.calls for key, stats in alone.line_items.items()
+    }
+
+
+def test_blocks_on_two_threads_take_turns():
+    order = []
+    inside = threading.Event()
+
+    def other():
+        inside.wait()
+        with profile_model():
+            order.append("other")
+
+    worker = threading.Thread(target=other)
+    worker.start()
+    with profile_model():
+        inside.set()
+        worker.join(timeout=0.1)
+        order.append("main")
+    worker.join()
+    assert order == ["main", "other"]
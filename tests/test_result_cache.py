@@ -0,0 +1,65 @@
+import os
+import pickle
+
+import pytest
+
+from financial_model import result_cache
+from financial_model.result_cache import ResultCache
+
+
+def test_callers_get_their_own_copies(tmp_path, assumptions, historical_data):
+    cache = ResultCache(tmp_path)
+    first = cache.project(assumptions, historical_data)
+    expected = first[0].copy()
+    first[0].iloc[:, :] = 0.0
+    for _ in range(2):
+        served = cache.project(assumptions, historical_data)
+        assert served[0].equals(expected)
+        served[0].iloc[:, :] = 0.0
+    assert cache.stats()["hits"] == 2
+
+
+def test_entry_evicted_after_reading_is_still_a_hit(
+    tmp_path, monkeypatch, assumptions, historical_data
+):
+    cache = ResultCache(tmp_path)
+    cache.project(assumptions, historical_data)
+    reader = ResultCache(tmp_path)
+
+    def evicted(path):
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(result_cache.os, "utime", evicted)
+    statements = reader.project(assumptions, historical_data)
+    assert reader.stats()["hits"] == 1
+    assert reader.stats()["misses"] == 0
+    assert statements[2].equals(cache.project(assumptions, historical_data)[2])
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda content: content[: len(content) // 2],
+        lambda content: content[:2] + bytes(reversed(content[2:])),
+        # A stale entry whose class no longer exists
+        lambda content: pickle.dumps(None).replace(
+            b"N", b"cfinancial_model\nMissing\n"
+        ),
+    ],
+)
+def test_corrupt_entry_is_a_miss_and_removed(
+    tmp_path, assumptions, historical_data, damage
+):
+    cache = ResultCache(tmp_path)
+    expected = cache.project(assumptions, historical_data)
+    (path,) = tmp_path.glob("*" + result_cache.SUFFIX)
+    path.write_bytes(damage(path.read_bytes()))
+
+    reader = ResultCache(tmp_path)
+    key = path.name[: -len(result_cache.SUFFIX)]
+    assert reader.get(key) is None
+    assert not path.exists()
+    assert reader.stats()["misses"] == 1
+    statements = reader.project(assumptions, historical_data)
+    assert statements[0].equals(expected[0])
@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+from financial_model.server import ProjectionService, _route
+
+
+def project(service, *assumption_sets):
+    async def run():
+        return await asyncio.gather(*map(service.project, assumption_sets))
+
+    return asyncio.run(run())
+
+
+def test_diverging_projection_is_valid_json(assumptions, historical_data):
+    service = ProjectionService({"default": historical_data})
+    diverging = dict(assumptions, **{"Revolver": 50.0, "Minimum Cash": 1e6})
+    good, bad = project(service, assumptions, diverging)
+    assert good["converged"] and not bad["converged"]
+    assert None in bad["cash_flow"]["Ending Cash Position"]
+    assert None not in good["cash_flow"]["Ending Cash Position"]
+    for response in (good, bad):
+        json.loads(json.dumps(response, allow_nan=False))
+
+
+def test_batches_in_flight_are_held_until_done(assumptions, historical_data):
+    service = ProjectionService({"default": historical_data})
+
+    async def run():
+        request = asyncio.ensure_future(service.project(assumptions))
+        while not service._tasks:
+            await asyncio.sleep(0)
+        response = await request
+        await asyncio.sleep(0)
+        return response
+
+    assert asyncio.run(run())["converged"]
+    assert not service._tasks
+
+
+def test_engine_failure_is_a_500(assumptions, historical_data):
+    service = ProjectionService({"default": historical_data})
+
+    def fail(batch):
+        raise RuntimeError("engine down")
+
+    service._run = fail
+    body = json.dumps({"assumptions": assumptions}).encode()
+    status, payload = asyncio.run(_route(service, "POST", "/project", body))
+    assert status == 500
+    assert "engine down" in payload["error"]
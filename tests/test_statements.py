@@ -0,0 +1,23 @@
+import pytest
+
+from financial_model.statements import FinancialModel
+
+
+@pytest.mark.parametrize("offset", [0, -1])
+def test_roll_forward_needs_a_later_year(assumptions, historical_data, offset):
+    model = FinancialModel(assumptions, historical_data)
+    actuals = historical_data.iloc[[-1]].copy()
+    actuals["Year"] += offset
+    with pytest.raises(ValueError, match="do not follow the history"):
+        model.roll_forward(actuals)
+    assert len(model.historical_data) == len(historical_data)
+
+
+def test_roll_forward_appends_the_next_year(assumptions, historical_data):
+    model = FinancialModel(assumptions, historical_data)
+    actuals = historical_data.iloc[[-1]].copy()
+    actuals["Year"] += 1
+    model.roll_forward(actuals)
+    assert model.historical_data["Year"].tolist()[-2:] == [2016, 2017]
+    income_statement = model.statements()[0]
+    assert income_statement["Year"].iloc[0] == 2018
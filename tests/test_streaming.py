@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from financial_model.portfolio import COMPANY_COLUMN
+from financial_model.streaming import trailing_windows
+
+
+def history(n_companies, n_years, rng):
+    companies = np.repeat([f"C{i:03d}" for i in range(n_companies)], n_years)
+    years = np.tile(np.arange(2010, 2010 + n_years), n_companies)
+    return pd.DataFrame(
+        {COMPANY_COLUMN: companies, "Year": years, "Revenue": rng.random(len(years))}
+    )
+
+
+def chunked(frame, size):
+    return (frame.iloc[start : start + size] for start in range(0, len(frame), size))
+
+
+def expected(frame, window):
+    return (
+        frame.sort_values([COMPANY_COLUMN, "Year"])
+        .groupby(COMPANY_COLUMN)
+        .tail(window)
+        .reset_index(drop=True)
+    )
+
+
+@pytest.mark.parametrize("window", [1, 2])
+@pytest.mark.parametrize("size", [1, 4, 7, 1_000])
+def test_unsorted_windows_match_full_tail(window, size):
+    frame = history(23, 5, np.random.default_rng(0)).sample(frac=1, random_state=0)
+    result = pd.concat(trailing_windows(chunked(frame, size), window), ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected(frame, window))
+
+
+@pytest.mark.parametrize("window", [1, 2])
+@pytest.mark.parametrize("size", [1, 4, 7, 1_000])
+def test_sorted_windows_match_full_tail(window, size):
+    frame = history(23, 5, np.random.default_rng(0))
+    frames = trailing_windows(chunked(frame, size), window, sorted_by_company=True)
+    result = pd.concat(frames, ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected(frame, window))
+
+
+def test_sorted_windows_reject_interleaved_companies():
+    frame = history(3, 2, np.random.default_rng(0))
+    interleaved = frame.iloc[[0, 2, 1, 3, 4, 5]]
+    with pytest.raises(ValueError, match="not contiguous"):
+        list(trailing_windows(chunked(interleaved, 2), sorted_by_company=True))
+    with pytest.raises(ValueError, match="not contiguous"):
+        list(trailing_windows(chunked(interleaved, 4), sorted_by_company=True))
@@ -0,0 +1,113 @@
+import json
+
+import pandas as pd
+import pytest
+
+from financial_model.portfolio import COMPANY_COLUMN, project_portfolio
+from financial_model.scenario_engine import historical_inputs, project_scenarios
+from financial_model.cli import main
+from financial_model.validation import KNOWN_FAILURES, validate
+
+ROLL_FORWARDS = [
+    "cash_roll_forward",
+    "retained_earnings",
+    "gross_ppe",
+    "revolver",
+    "term_loan",
+    "unsecured_debt",
+]
+
+
+@pytest.fixture
+def portfolio(assumptions, historical_data):
+    companies = ["A", "B", "C"]
+    history = pd.concat(
+        [historical_data.assign(**{COMPANY_COLUMN: company}) for company in companies],
+        ignore_index=True,
+    )
+    company_assumptions = pd.DataFrame(
+        {COMPANY_COLUMN: companies, "Tax Rate": [0.25, 0.3, 0.35]}
+    )
+    return project_portfolio(history, company_assumptions, assumptions)
+
+
+@pytest.mark.parametrize("numeric", ["float", "fixed"])
+def test_portfolio_checks_first_period_against_its_inputs(
+    assumptions, historical_data, numeric
+):
+    companies = ["A", "B"]
+    history = pd.concat(
+        [historical_data.assign(**{COMPANY_COLUMN: company}) for company in companies],
+        ignore_index=True,
+    )
+    projection = project_portfolio(
+        history,
+        pd.DataFrame({COMPANY_COLUMN: companies}),
+        assumptions,
+        numeric=numeric,
+    )
+    report = validate(projection, checks=ROLL_FORWARDS)
+    assert report.ok
+    assert sum(report.skipped.values()) == 0
+
+
+def test_first_period_against_wrong_opening_fails(portfolio):
+    portfolio.inputs["retained_earnings"] = portfolio.inputs["retained_earnings"] + 1.0
+    report = validate(portfolio, checks=ROLL_FORWARDS)
+    assert report.failed() == ["retained_earnings"]
+    assert list(report.scenarios("retained_earnings")) == [0, 1, 2]
+
+
+def test_scenarios_without_opening_report_skipped_cells(assumptions, historical_data):
+    projection = project_scenarios([assumptions] * 2, historical_data)
+    report = validate(projection, checks=ROLL_FORWARDS)
+    assert report.ok
+    assert report.skipped["retained_earnings"] == 2
+    assert report.to_frame()["Skipped Cells"].sum() == sum(report.skipped.values())
+    assert "unchecked" in repr(report)
+    checked = validate(
+        projection, opening=historical_inputs(historical_data), checks=ROLL_FORWARDS
+    )
+    assert checked.ok
+    assert sum(checked.skipped.values()) == 0
+
+
+def test_model_fails_only_known_checks(assumptions, historical_data):
+    projection = project_scenarios([assumptions], historical_data)
+    report = validate(projection, opening=historical_inputs(historical_data))
+    assert report.failed() == list(KNOWN_FAILURES)
+    assert report.unexpected() == []
+
+
+def test_cli_validate_passes_on_sample_data(
+    assumptions, historical_data, tmp_path, capsys
+):
+    (tmp_path / "assumptions.json").write_text(json.dumps(assumptions))
+    historical_data.to_csv(tmp_path / "historical.csv", index=False)
+    argv = [
+        "--assumptions",
+        str(tmp_path / "assumptions.json"),
+        "--historical",
+        str(tmp_path / "historical.csv"),
+        "--validate",
+    ]
+    assert main(argv) == 0
+    assert "Known failures" in capsys.readouterr().out
+
+
+def test_fixed_point_ties_exactly_but_for_known_failures(assumptions, historical_data):
+    assumption_sets = [assumptions, dict(assumptions, **{"Tax Rate": 0.3})]
+    opening = historical_inputs(historical_data)
+    fixed = project_scenarios(assumption_sets, historical_data, numeric="fixed")
+    report = validate(fixed, opening=opening, tolerance=0, relative_tolerance=0)
+    assert report.failed() == list(KNOWN_FAILURES)
+    assert report.unexpected() == []
+    assert all(
+        report.max_errors[name] == 0 for name in report.failures if name not in KNOWN_FAILURES
+    )
+    # The known failures are the float model's, in cents
+    floating = validate(
+        project_scenarios(assumption_sets, historical_data), opening=opening
+    )
+    for name in KNOWN_FAILURES:
+        assert abs(report.max_errors[name] / fixed.scale - floating.max_errors[name]) < 0.02